@@ -0,0 +1,82 @@
+"""History scans for badge backfills.
+
+These run in a child process started as ``python badge_scan.py <db> <metric>``,
+which prints the result as JSON. Nothing here imports main.py: no bot,
+no web server and no Storage (which would create the schema on the live
+database). It only reads the database, through its own connection.
+"""
+import json
+import re
+import sqlite3
+import sys
+from datetime import datetime
+from typing import Dict, List
+
+from storage_codecs import decode
+
+WORK_SESSION_MINUTES_RE = re.compile(r"(\d+) minutes")
+
+
+def longest_run(dates: List[str]) -> int:
+    """Most consecutive days among ISO ``dates``."""
+    days = sorted({datetime.strptime(date, "%Y-%m-%d").date()
+                   for date in dates if re.fullmatch(r"\d{4}-\d{2}-\d{2}", date)})
+    best = run = 0
+    for previous, day in zip([None] + days, days):
+        run = run + 1 if previous and (day - previous).days == 1 else 1
+        best = max(best, run)
+    return best
+
+
+def scan_badge_metric(path: str, metric: str) -> Dict[str, int]:
+    """User id -> best value of ``metric`` over all stored history.
+
+    Reads only the table the metric needs: log dates (no entries decoded)
+    for streaks, tasks for completions, and the score ledger for points
+    and for work sessions, each of which left a ``work_*`` award whose
+    description records its length.
+    """
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    values: Dict[str, int] = {}
+    try:
+        if metric == "streak":
+            dates: Dict[str, List[str]] = {}
+            for user_id, date in conn.execute("SELECT user_id, date FROM logs"):
+                dates.setdefault(user_id, []).append(date)
+            values = {user_id: longest_run(days)
+                      for user_id, days in dates.items()}
+        elif metric == "tasks_completed":
+            for user_id, data in conn.execute(
+                    "SELECT user_id, data FROM tasks"):
+                if decode(data).get("status") == "Completed":
+                    values[user_id] = values.get(user_id, 0) + 1
+        else:
+            for (data, ) in conn.execute("SELECT data FROM score_ledger"):
+                txn = decode(data)
+                user_id = txn["user_id"]
+                if metric == "points":
+                    values[user_id] = values.get(user_id, 0) + txn["delta"]
+                    continue
+                if (txn["kind"] != "award"
+                        or not txn["award_key"].startswith("work_")):
+                    continue
+                if metric == "sessions":
+                    values[user_id] = values.get(user_id, 0) + 1
+                else:
+                    match = WORK_SESSION_MINUTES_RE.search(
+                        txn.get("description") or "")
+                    if match:
+                        values[user_id] = max(values.get(user_id, 0),
+                                              int(match.group(1)))
+            if metric == "sessions":
+                for user_id, data in conn.execute(
+                        "SELECT user_id, data FROM badge_counters"):
+                    values[user_id] = max(values.get(user_id, 0),
+                                          decode(data).get("sessions", 0))
+    finally:
+        conn.close()
+    return values
+
+
+if __name__ == "__main__":
+    json.dump(scan_badge_metric(sys.argv[1], sys.argv[2]), sys.stdout)
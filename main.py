@@ -1,23 +1,40 @@
 import ast
 import inspect
 from functools import wraps
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from enum import Enum, IntEnum
 import random
+import bisect
+import hashlib
+import heapq
 import dateutil.parser as dateparser
 from dateutil import parser
 import zipfile
+import csv
+import gzip
+import io
 import json
+import math
 import os
+import re
+import sys
+import sqlite3
+import tempfile
 import pytz
 import discord
-from discord.ext import commands, tasks
+from discord.ext import commands
 from datetime import datetime, time, timedelta
 from dotenv import load_dotenv
 import asyncio
-from typing import Dict, List, Set, Any, Optional
+from time import monotonic, perf_counter, sleep as sleep_time
+from typing import Dict, List, Set, FrozenSet, Any, Optional, Tuple, Callable
 from discord.ui import View, Button
 from flask import Flask
 import threading
 import shlex
+import badge_scan
+from storage_codecs import CODECS, CODEC_MAGIC, PrettyJsonCodec, decode
 # saldfkjlsdkfjlskdjflksjdf
 app = Flask('')
 
@@ -49,6 +66,11 @@ ADMIN_ID = {
 TASK_CHANNEL_ID = 1376362923567612015  # Replace with your task channel ID
 REMINDER_DAYS = [7, 5, 3, 2, 1]
 MAX_LIVES = 3
+LEADERBOARD_CHANNEL_ID = 1376588983059873933  # Replace with your leaderboard channel ID
+# Score changes within this many seconds share one leaderboard edit
+LEADERBOARD_DEBOUNCE_SECONDS = float(os.getenv("LEADERBOARD_DEBOUNCE_SECONDS", "10"))
+# Re-send an unchanged overdue digest after this many hours
+OVERDUE_RENAG_HOURS = float(os.getenv("OVERDUE_RENAG_HOURS", "24"))
 
 EST = pytz.timezone('US/Eastern')
 # Color Palette
@@ -79,16 +101,20 @@ class TaskBot(commands.Bot):
         super().__init__(*args, case_insensitive=case_insensitive, **kwargs)
         self._ready_called = False
         self.daily_responders: Set[int] = set()
-        self.user_scores: Dict[int, int] = {}
-        self.user_tasks_created: Dict[int, List[Dict]] = {}
-        self.task_counter = 0
-        self.task_assignments: Dict[int, Dict[int, Dict]] = {}
         self.user_lives: Dict[int, int] = {}  # New: Track user lives
         self.help_command = None
         # Add to your bot class
         self.user_levels = {}  # user_id: level
         self.user_xp = {}      # user_id: xp
 
+    async def setup_hook(self):
+        persistence.start()
+
+    async def close(self):
+        await super().close()
+        # Make sure every queued write is on disk before the process exits
+        await asyncio.to_thread(persistence.stop)
+
 async def award_xp(self, user_id, amount):
     self.user_xp[user_id] = self.user_xp.get(user_id, 0) + amount
     xp_needed = 100 * (self.user_levels.get(user_id, 0) + 1)
@@ -97,14 +123,385 @@ async def award_xp(self, user_id, amount):
         await self.notify_level_up(user_id)
 
 async def notify_level_up(self, user_id):
-    user = await self.fetch_user(user_id)
     channel = self.get_channel(CHANNEL_ID)
-    await channel.send(f"🎉 {user.mention} leveled up to level {self.user_levels[user_id]}!")
+    outbox.send(channel,
+                f"🎉 <@{user_id}> leveled up to level {self.user_levels[user_id]}!",
+                lane=Lane.INTERACTIVE)
 
 
 
 bot = TaskBot(command_prefix="!", intents=intents, case_insensitive=True)
-bot.task_message_refs = {}  # user_id -> message object
+
+
+class MemberDirectory:
+    """User lookups by id, served from the gateway cache where possible.
+
+    ``get`` never touches the network: it checks guild members (so
+    nicknames win), then the client's user cache, then users fetched
+    earlier over REST that are still within ``ttl``. ``resolve_many``
+    fills the gaps for a whole batch: one gateway member query per 100
+    ids, then REST ``fetch_user`` for whoever is left, at most
+    ``concurrency`` requests at a time. Accounts Discord reports as gone
+    are remembered as None for the same ``ttl``.
+
+    Member update/leave events drop the REST entries they concern.
+    """
+
+    QUERY_CHUNK = 100  # gateway limit for query_members(user_ids=...)
+
+    def __init__(self, client: commands.Bot, ttl: float = 3600,
+                 concurrency: int = 4):
+        self.client = client
+        self.ttl = ttl
+        self.concurrency = concurrency
+        self.fetched: Dict[int, Tuple[float, Optional[discord.abc.User]]] = {}
+        self.inflight: Dict[int, asyncio.Task] = {}
+        self.semaphore: Optional[asyncio.Semaphore] = None
+
+    def _cached(self, user_id: int):
+        """(found, user) from memory only."""
+        for guild in self.client.guilds:
+            member = guild.get_member(user_id)
+            if member:
+                return True, member
+        user = self.client.get_user(user_id)
+        if user:
+            return True, user
+        entry = self.fetched.get(user_id)
+        if entry and monotonic() - entry[0] < self.ttl:
+            return True, entry[1]
+        return False, None
+
+    def get(self, user_id) -> Optional[discord.abc.User]:
+        return self._cached(int(user_id))[1]
+
+    def display_name(self, user_id, default: str = None) -> str:
+        user = self.get(user_id)
+        if user:
+            return user.display_name
+        return default or f"User ID {user_id}"
+
+    def invalidate(self, user_id):
+        self.fetched.pop(int(user_id), None)
+
+    async def resolve(self, user_id) -> Optional[discord.abc.User]:
+        return (await self.resolve_many([user_id])).get(int(user_id))
+
+    async def resolve_many(self, user_ids) -> Dict[int, Optional[discord.abc.User]]:
+        """Look up a batch of ids.
+
+        Maps each id to its user, or to None if Discord says the account
+        does not exist. Ids that could not be looked up right now (HTTP
+        errors, timeouts) are left out.
+        """
+        result, missing = {}, []
+        for user_id in dict.fromkeys(int(u) for u in user_ids):
+            found, user = self._cached(user_id)
+            if found:
+                result[user_id] = user
+            else:
+                missing.append(user_id)
+
+        for guild in self.client.guilds:
+            if not missing:
+                break
+            for start in range(0, len(missing), self.QUERY_CHUNK):
+                chunk = missing[start:start + self.QUERY_CHUNK]
+                try:
+                    members = await guild.query_members(user_ids=chunk,
+                                                        cache=True)
+                except (asyncio.TimeoutError, discord.ClientException) as e:
+                    print(f"Member query failed in {guild}: {e}")
+                    break
+                for member in members:
+                    result[member.id] = member
+            missing = [user_id for user_id in missing if user_id not in result]
+
+        if missing:
+            if self.semaphore is None:
+                self.semaphore = asyncio.Semaphore(self.concurrency)
+            for user_id in missing:
+                if user_id not in self.inflight:
+                    self.inflight[user_id] = asyncio.create_task(
+                        self._fetch(user_id))
+            fetched = await asyncio.gather(
+                *(self.inflight[user_id] for user_id in missing))
+            for user_id, (ok, user) in zip(missing, fetched):
+                if ok:
+                    result[user_id] = user
+        return result
+
+    async def _fetch(self, user_id: int):
+        try:
+            async with self.semaphore:
+                user = await self.client.fetch_user(user_id)
+        except discord.NotFound:
+            user = None
+        except discord.HTTPException as e:
+            print(f"Could not fetch user {user_id}: {e}")
+            return False, None
+        finally:
+            self.inflight.pop(user_id, None)
+        self.fetched[user_id] = (monotonic(), user)
+        return True, user
+
+
+member_directory = MemberDirectory(bot)
+
+
+# ========== Outbound Queue ==========
+class Lane(IntEnum):
+    """Outbound priority; lower lanes are always dispatched first."""
+
+    INTERACTIVE = 0  # follow-ups to something a user just did
+    NORMAL = 1  # channel upkeep: task messages, leaderboard
+    BULK = 2  # reminders, digests, summaries
+
+
+class RouteBucket:
+    """Token bucket for one route, plus any block a 429 imposed on it."""
+
+    __slots__ = ("capacity", "per", "tokens", "updated", "blocked_until")
+
+    def __init__(self, capacity: int, per: float):
+        self.capacity = capacity
+        self.per = per
+        self.tokens = float(capacity)
+        self.updated = monotonic()
+        self.blocked_until = 0.0
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens +
+                          (now - self.updated) * self.capacity / self.per)
+        self.updated = now
+
+    def ready_at(self, now: float) -> float:
+        self._refill(now)
+        ready = now if self.tokens >= 1 else now + (
+            1 - self.tokens) * self.per / self.capacity
+        return max(ready, self.blocked_until)
+
+    def take(self, now: float):
+        self._refill(now)
+        self.tokens -= 1
+
+    def block(self, seconds: float):
+        self.blocked_until = max(self.blocked_until, monotonic() + seconds)
+
+
+class OutboundJob:
+    __slots__ = ("route", "lane", "seq", "call", "args", "kwargs", "future",
+                 "description", "key", "attempts")
+
+    def __init__(self, route, lane, seq, call, args, kwargs, description,
+                 key=None):
+        self.route = route
+        self.lane = lane
+        self.seq = seq
+        self.call = call
+        self.args = args
+        self.kwargs = kwargs
+        self.future = asyncio.get_running_loop().create_future()
+        self.future.add_done_callback(_consume_exception)
+        self.description = description
+        self.key = key
+        self.attempts = 0
+
+    def __lt__(self, other: "OutboundJob") -> bool:
+        return (self.lane, self.seq) < (other.lane, other.seq)
+
+
+def _consume_exception(future: asyncio.Future):
+    # Failures are reported by the queue itself; callers that await the
+    # future still get the exception.
+    if not future.cancelled():
+        future.exception()
+
+
+def _retry_after(error: discord.HTTPException) -> float:
+    retry_after = getattr(error, "retry_after", None)
+    if retry_after is None and getattr(error, "response", None) is not None:
+        try:
+            retry_after = float(error.response.headers.get("Retry-After", 1))
+        except (TypeError, ValueError):
+            retry_after = None
+    return float(retry_after or 1)
+
+
+class OutboundQueue:
+    """Dispatches sends, edits and deletes by lane and per-route budget.
+
+    Every request names a route: the channel it targets, or the user for a
+    DM. Each route has a token bucket (Discord allows roughly five
+    messages per five seconds per channel) and at most one request in
+    flight, so requests to one route keep their order. Workers always take
+    the best-lane request among routes that have budget, so a burst of
+    BULK DMs never delays a reply to a command.
+
+    A 429 blocks the route for its Retry-After and requeues the request;
+    5xx errors are retried with backoff. Other failures resolve the
+    request's future with the exception, are printed and kept in
+    ``failures`` for ``!outbox``. An edit to a message that still has an
+    edit queued is merged into it (later fields win).
+    """
+
+    ROUTE_CAPACITY = 5
+    ROUTE_PER = 5.0
+    MAX_ATTEMPTS = 3
+
+    def __init__(self, workers: int = 4):
+        self.workers = workers
+        self.routes: Dict[tuple, List[OutboundJob]] = {}  # route -> heap
+        self.buckets: Dict[tuple, RouteBucket] = {}
+        self.busy: Set[tuple] = set()
+        self.pending: Dict[tuple, OutboundJob] = {}  # coalesce key -> job
+        self.failures: deque = deque(maxlen=25)
+        self.sent = 0
+        self.coalesced = 0
+        self.seq = 0
+        self.wakeup: Optional[asyncio.Event] = None
+        self.runners: List[asyncio.Task] = []
+
+    # Submitting
+    @staticmethod
+    def route_for(target) -> tuple:
+        if isinstance(target, (discord.User, discord.Member)):
+            return ("dm", target.id)
+        # Messages and contexts route to the channel they belong to
+        return ("channel", getattr(target, "channel", target).id)
+
+    def submit(self, route: tuple, call: Callable, *args,
+               lane: Lane = Lane.NORMAL, description: str = "",
+               key: Optional[tuple] = None, **kwargs) -> asyncio.Future:
+        """Queue ``call(*args, **kwargs)``; the future holds its result."""
+        job = self.pending.get(key) if key is not None else None
+        if job is not None:
+            job.kwargs.update(kwargs)
+            self.coalesced += 1
+            if lane < job.lane:
+                job.lane = lane
+                heapq.heapify(self.routes[job.route])
+            return job.future
+
+        self.seq += 1
+        job = OutboundJob(route, lane, self.seq, call, args, kwargs,
+                          description or getattr(call, "__qualname__", "request"),
+                          key)
+        self._push(job)
+        return job.future
+
+    def send(self, target, *args, lane: Lane = Lane.NORMAL,
+             **kwargs) -> asyncio.Future:
+        route = self.route_for(target)
+        return self.submit(route, target.send, *args, lane=lane,
+                           description=f"send to {route[0]} {route[1]}",
+                           **kwargs)
+
+    def edit(self, message, lane: Lane = Lane.NORMAL,
+             **kwargs) -> asyncio.Future:
+        return self.submit(self.route_for(message), message.edit, lane=lane,
+                           description=f"edit message {message.id}",
+                           key=("edit", message.id), **kwargs)
+
+    def delete(self, message, lane: Lane = Lane.NORMAL) -> asyncio.Future:
+        return self.submit(self.route_for(message), message.delete, lane=lane,
+                           description=f"delete message {message.id}",
+                           key=("delete", message.id))
+
+    def _push(self, job: OutboundJob):
+        if job.key is not None:
+            self.pending.setdefault(job.key, job)
+        heapq.heappush(self.routes.setdefault(job.route, []), job)
+        if job.route not in self.buckets:
+            self.buckets[job.route] = RouteBucket(self.ROUTE_CAPACITY,
+                                                  self.ROUTE_PER)
+        if self.wakeup is not None:
+            self.wakeup.set()
+
+    # Dispatching
+    def start(self):
+        self.runners = [runner for runner in self.runners if not runner.done()]
+        if self.wakeup is None:
+            self.wakeup = asyncio.Event()
+        while len(self.runners) < self.workers:
+            self.runners.append(asyncio.create_task(self._run()))
+
+    def _next(self) -> Tuple[Optional[OutboundJob], Optional[float]]:
+        """The best ready job, else None and how long until one is ready."""
+        now = monotonic()
+        best, wait = None, None
+        for route, queue in self.routes.items():
+            if not queue or route in self.busy:
+                continue
+            ready = self.buckets[route].ready_at(now)
+            if ready > now:
+                wait = ready - now if wait is None else min(wait, ready - now)
+            elif best is None or queue[0] < best:
+                best = queue[0]
+        if best is None:
+            return None, wait
+        heapq.heappop(self.routes[best.route])
+        if not self.routes[best.route]:
+            del self.routes[best.route]
+        if best.key is not None and self.pending.get(best.key) is best:
+            del self.pending[best.key]
+        self.buckets[best.route].take(now)
+        self.busy.add(best.route)
+        return best, None
+
+    async def _run(self):
+        while True:
+            job, wait = self._next()
+            if job is None:
+                self.wakeup.clear()
+                try:
+                    await asyncio.wait_for(self.wakeup.wait(), wait)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            try:
+                await self._dispatch(job)
+            finally:
+                self.busy.discard(job.route)
+                self.wakeup.set()
+
+    async def _dispatch(self, job: OutboundJob):
+        job.attempts += 1
+        try:
+            result = await job.call(*job.args, **job.kwargs)
+        except discord.HTTPException as e:
+            if job.attempts < self.MAX_ATTEMPTS:
+                if e.status == 429:
+                    self.buckets[job.route].block(_retry_after(e))
+                    self._push(job)
+                    return
+                if e.status >= 500:
+                    self.buckets[job.route].block(2**job.attempts)
+                    self._push(job)
+                    return
+            self._fail(job, e)
+        except Exception as e:
+            self._fail(job, e)
+        else:
+            self.sent += 1
+            if not job.future.done():
+                job.future.set_result(result)
+
+    def _fail(self, job: OutboundJob, error: Exception):
+        self.failures.append((datetime.now(EST), job.description, error))
+        print(f"⚠️ Outbound {job.description} failed: {error}")
+        if not job.future.done():
+            job.future.set_exception(error)
+
+    def depth(self) -> Dict[Lane, int]:
+        counts = {lane: 0 for lane in Lane}
+        for queue in self.routes.values():
+            for job in queue:
+                counts[job.lane] += 1
+        return counts
+
+
+outbox = OutboundQueue()
 
 
 def is_admin():
@@ -122,7 +519,763 @@ COMMENTS_FILE = "comments.json"
 # Add these constants near the top with other constants
 BADGES_FILE = "badges.json"
 WORK_SESSIONS_FILE = "work_sessions.json"
- 
+SCORES_FILE = "scores.json"
+USER_BADGES_FILE = "user_badges.json"
+LIVES_FILE = "lives.json"
+DB_FILE = "taskbot.db"
+# Value encoding for new rows: "json", "zlib" or "msgpack" (needs msgpack)
+STORAGE_CODEC = os.getenv("STORAGE_CODEC", "json")
+
+
+def benchmark_codecs(values: List[Any],
+                     repeat: int = 3) -> List[Tuple[str, int, float, float]]:
+    """Compare codecs on ``values``, encoded one value per row.
+
+    Returns (codec, total bytes, encode MB/s, decode MB/s), best of
+    ``repeat`` runs. Throughput is measured against the compact JSON size
+    so the rows are comparable. The pretty-printed JSON the bot used to
+    write is included as the baseline.
+    """
+    candidates = [("json indent=4", PrettyJsonCodec())] + list(CODECS.items())
+    reference = sum(len(CODECS["json"].encode(value)) for value in values)
+    megabytes = reference / (1024 * 1024)
+
+    results = []
+    for name, codec in candidates:
+        encode_time = decode_time = float("inf")
+        for _ in range(repeat):
+            start = perf_counter()
+            encoded = [codec.encode(value) for value in values]
+            encode_time = min(encode_time, perf_counter() - start)
+            start = perf_counter()
+            for payload in encoded:
+                codec.decode(payload)
+            decode_time = min(decode_time, perf_counter() - start)
+        results.append((name, sum(map(len, encoded)),
+                        megabytes / max(encode_time, 1e-9),
+                        megabytes / max(decode_time, 1e-9)))
+    return results
+
+
+class Storage:
+    """SQLite store that sits behind the load_*/save_* helpers.
+
+    Every collection gets its own table keyed the same way the old JSON
+    files were nested (``logs`` is user -> date -> entries, ``badges`` is
+    badge id -> badge, ...). Values are encoded with the configured codec
+    so callers keep working with plain dicts and lists, but a single change
+    only rewrites the row it concerns instead of the whole file.
+
+    Writes are single-row puts and deletes. Once a PersistenceWriter is
+    running they are queued for its I/O thread, and reads look at the
+    queued rows first so callers always see their own writes.
+    """
+
+    TABLES = {
+        "logs": ("user_id", "date"),
+        "tasks": ("user_id", "task_id"),
+        "scores": ("user_id", "award_key"),
+        "comments": ("task_id", ),
+        "badges": ("badge_id", ),
+        "user_badges": ("user_id", ),
+        "lives": ("user_id", ),
+        "work_sessions": ("user_id", ),
+        "score_ledger": ("seq", ),
+        "task_messages": ("user_id", ),
+        "overdue_digests": ("user_id", ),
+        "progress": ("user_id", ),
+        "schedule": ("job", ),
+        "rollups": ("user_id", "date"),
+        "badge_counters": ("user_id", ),
+        "meta": ("key", ),
+    }
+    INDEXES = {
+        "idx_logs_date": ("logs", "date"),
+        "idx_tasks_task_id": ("tasks", "task_id"),
+    }
+
+    def __init__(self, path: str = DB_FILE, codec: str = STORAGE_CODEC):
+        if codec not in CODECS:
+            raise ValueError(f"Unknown storage codec {codec!r}; "
+                             f"available: {', '.join(CODECS)}")
+        self.path = path
+        self.codec = CODECS[codec]
+        self.lock = threading.RLock()
+        self.writer: Optional["PersistenceWriter"] = None
+        self.conn = self.connect()
+        self._create_schema()
+
+    def connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path,
+                               check_same_thread=False,
+                               isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _create_schema(self):
+        with self.lock:
+            for table, keys in self.TABLES.items():
+                columns = ", ".join(f"{key} TEXT NOT NULL" for key in keys)
+                self.conn.execute(
+                    f"CREATE TABLE IF NOT EXISTS {table} ({columns}, "
+                    f"data TEXT NOT NULL, PRIMARY KEY ({', '.join(keys)}))")
+            for name, (table, column) in self.INDEXES.items():
+                self.conn.execute(
+                    f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({column})")
+
+    @property
+    def deferred(self) -> bool:
+        return self.writer is not None and self.writer.running
+
+    @contextmanager
+    def transaction(self):
+        """Group writes so they are committed together.
+
+        With the writer running this keeps the queued rows in one batch;
+        otherwise it is a plain SQLite transaction. Nested calls join the
+        outer one.
+        """
+        if self.deferred:
+            with self.writer.batch():
+                yield
+            return
+        with self.lock:
+            if self.conn.in_transaction:
+                yield
+                return
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield
+            except BaseException:
+                self.conn.execute("ROLLBACK")
+                raise
+            self.conn.execute("COMMIT")
+
+    def encode(self, value: Any) -> bytes:
+        """Encode a value with the configured codec behind a format header."""
+        return CODEC_MAGIC + self.codec.tag + self.codec.encode(value)
+
+    decode = staticmethod(decode)
+
+    def _where(self, table: str, columns) -> str:
+        return " AND ".join(f"{column} = ?" for column in columns)
+
+    def _rows(self, table: str, where: Dict[str, str] = None) -> Dict[tuple, Any]:
+        """Current encoded rows matching ``where``, queued writes included."""
+        keys = self.TABLES[table]
+        where = {column: str(value) for column, value in (where or {}).items()}
+        sql = f"SELECT {', '.join(keys)}, data FROM {table}"
+        if where:
+            sql += f" WHERE {self._where(table, where)}"
+        with self.lock:
+            rows = self.conn.execute(sql + " ORDER BY rowid",
+                                     tuple(where.values())).fetchall()
+        result = {tuple(row[:-1]): row[-1] for row in rows}
+        if self.writer is not None:
+            for key, data in self.writer.overlay(table).items():
+                if any(key[keys.index(column)] != value
+                       for column, value in where.items()):
+                    continue
+                if data is None:
+                    result.pop(key, None)
+                else:
+                    result[key] = data
+        return result
+
+    def _write(self, table: str, key: tuple, data: Optional[bytes]):
+        """Put (or delete, when ``data`` is None) one row."""
+        if self.deferred:
+            self.writer.submit((table, key), data)
+            return
+        with self.transaction():
+            self.apply(self.conn, table, key, data)
+
+    def apply(self, conn: sqlite3.Connection, table: str, key: tuple,
+              data: Optional[bytes]):
+        keys = self.TABLES[table]
+        if data is None:
+            conn.execute(f"DELETE FROM {table} WHERE {self._where(table, keys)}",
+                         key)
+            return
+        placeholders = ", ".join("?" * (len(keys) + 1))
+        conn.execute(
+            f"INSERT INTO {table} ({', '.join(keys)}, data) "
+            f"VALUES ({placeholders}) ON CONFLICT ({', '.join(keys)}) "
+            f"DO UPDATE SET data = excluded.data", (*key, data))
+
+    def load(self, table: str) -> Dict[str, Any]:
+        """Load a whole table back into the nested dict shape of the JSON file."""
+        keys = self.TABLES[table]
+        result = {}
+        for key, data in self._rows(table).items():
+            if len(keys) == 1:
+                result[key[0]] = self.decode(data)
+            else:
+                result.setdefault(key[0], {})[key[1]] = self.decode(data)
+        return result
+
+    def load_partition(self, table: str, outer_key: str) -> Dict[str, Any]:
+        """Load the inner dict for one outer key of a two-level table."""
+        keys = self.TABLES[table]
+        rows = self._rows(table, {keys[0]: outer_key})
+        return {key[1]: self.decode(data) for key, data in rows.items()}
+
+    def keys(self, table: str, where: Dict[str, str] = None) -> List[tuple]:
+        """Keys of the rows matching ``where`` without decoding any values."""
+        return list(self._rows(table, where))
+
+    def latest_inner_keys(self, table: str) -> Dict[str, str]:
+        """Largest inner key per outer key of a two-level table.
+
+        For ``logs`` this is each user's most recent log date, read from
+        the primary key index without touching the stored entries.
+        """
+        outer, inner = self.TABLES[table]
+        with self.lock:
+            result = dict(
+                self.conn.execute(f"SELECT {outer}, MAX({inner}) FROM {table} "
+                                  f"GROUP BY {outer}").fetchall())
+        if self.writer is not None:
+            for outer_key in {key[0] for key in self.writer.overlay(table)}:
+                inner_keys = [
+                    key[1] for key in self.keys(table, {outer: outer_key})
+                ]
+                if inner_keys:
+                    result[outer_key] = max(inner_keys)
+                else:
+                    result.pop(outer_key, None)
+        return result
+
+    def get(self, table: str, key: tuple, default: Any = None) -> Any:
+        key = tuple(str(k) for k in key)
+        if self.writer is not None:
+            found, data = self.writer.lookup((table, key))
+            if found:
+                return default if data is None else self.decode(data)
+        with self.lock:
+            row = self.conn.execute(
+                f"SELECT data FROM {table} WHERE "
+                f"{self._where(table, self.TABLES[table])}", key).fetchone()
+        return self.decode(row[0]) if row else default
+
+    def put(self, table: str, key: tuple, value: Any):
+        self._write(table, tuple(str(k) for k in key), self.encode(value))
+
+    def add(self, table: str, key: tuple, value: Any) -> bool:
+        """Insert a row only if the key is new. Returns True if it was inserted."""
+        with self.transaction():
+            if self.get(table, key) is not None:
+                return False
+            self.put(table, key, value)
+        return True
+
+    def delete(self, table: str, key: tuple) -> int:
+        """Delete the row for ``key``, or every row under a key prefix."""
+        columns = self.TABLES[table][:len(key)]
+        return self.delete_matching(table, dict(zip(columns, key)))
+
+    def delete_where(self, table: str, column: str, value: str) -> int:
+        return self.delete_matching(table, {column: value})
+
+    def delete_matching(self, table: str, where: Dict[str, str]) -> int:
+        with self.transaction():
+            rows = self._rows(table, where)
+            for key in rows:
+                self._write(table, key, None)
+        return len(rows)
+
+    def replace(self, table: str, data: Dict[str, Any]) -> int:
+        """Make a table match ``data``, writing only the rows that changed.
+
+        Returns the number of rows written or deleted.
+        """
+        keys = self.TABLES[table]
+        rows = {}
+        for outer, value in data.items():
+            if len(keys) == 1:
+                rows[(str(outer), )] = self.encode(value)
+            else:
+                for inner, inner_value in value.items():
+                    rows[(str(outer), str(inner))] = self.encode(inner_value)
+
+        with self.transaction():
+            existing = self._rows(table)
+            changed = [(key, value) for key, value in rows.items()
+                       if existing.get(key) != value]
+            removed = [key for key in existing if key not in rows]
+            for key, value in changed:
+                self._write(table, key, value)
+            for key in removed:
+                self._write(table, key, None)
+        return len(changed) + len(removed)
+
+    def get_meta(self, key: str, default: Optional[str] = None):
+        return self.get("meta", (key, ), default)
+
+    def set_meta(self, key: str, value: str):
+        self.put("meta", (key, ), str(value))
+
+    def backup(self, path: str):
+        """Write a consistent snapshot of the database to ``path``."""
+        if self.writer is not None:
+            self.writer.flush()
+        target = sqlite3.connect(path)
+        try:
+            with self.lock:
+                self.conn.backup(target)
+        finally:
+            target.close()
+
+
+def write_file_atomic(path: str, data: str):
+    """Replace ``path`` with ``data`` via a temp file and rename."""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory,
+                                    prefix=".tmp_",
+                                    suffix=os.path.basename(path))
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+class PersistenceWriter:
+    """Applies storage writes on a dedicated I/O thread.
+
+    Writes are keyed by the row (or file) they replace. Saving the same
+    row again before it has been written just swaps the queued value, so a
+    burst of saves turns into one write. The thread waits ``window``
+    seconds after the first queued write, then commits everything queued
+    in a single transaction.
+
+    Writes made inside ``batch`` are staged and only queued when the
+    outermost batch exits normally; if it raises they are thrown away,
+    like a rolled-back transaction.
+    """
+
+    FILE = "__file__"
+
+    def __init__(self, store: Storage, window: float = 0.5):
+        self.store = store
+        self.window = window
+        self.cond = threading.Condition(threading.RLock())
+        self.pending: Dict[tuple, Optional[Any]] = {}
+        self.inflight: Dict[tuple, Optional[Any]] = {}
+        self.staged: Optional[Dict[tuple, Optional[Any]]] = None
+        self.submitted = 0
+        self.completed = 0
+        self.flush_requested = False
+        self.stopping = False
+        self.thread: Optional[threading.Thread] = None
+        store.writer = self
+
+    @property
+    def running(self) -> bool:
+        return self.thread is not None and self.thread.is_alive()
+
+    def start(self):
+        if self.running:
+            return
+        self.stopping = False
+        self.thread = threading.Thread(target=self._run,
+                                       name="persistence-writer",
+                                       daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """Write everything still queued, then stop the I/O thread."""
+        if not self.running:
+            return
+        with self.cond:
+            self.stopping = True
+            self.cond.notify_all()
+        self.thread.join()
+
+    @contextmanager
+    def batch(self):
+        """Hold the queue so writes made inside land in the same commit.
+
+        Nested batches join the outermost one.
+        """
+        with self.cond:
+            if self.staged is not None:
+                yield
+                return
+            self.staged = {}
+            try:
+                yield
+            except BaseException:
+                self.staged = None
+                raise
+            staged, self.staged = self.staged, None
+            for key, data in staged.items():
+                self._queue(key, data)
+            self.cond.notify_all()
+
+    def submit(self, key: tuple, data: Optional[Any]):
+        with self.cond:
+            if self.staged is not None:
+                self.staged.pop(key, None)
+                self.staged[key] = data
+                return
+            self._queue(key, data)
+            self.cond.notify_all()
+
+    def _queue(self, key: tuple, data: Optional[Any]):
+        self.pending.pop(key, None)
+        self.pending[key] = data
+        self.submitted += 1
+
+    def write_file(self, path: str, data: str):
+        """Queue an atomic replace of a file on disk."""
+        if not self.running:
+            write_file_atomic(path, data)
+            return
+        self.submit((self.FILE, path), data)
+
+    def lookup(self, key: tuple):
+        """Return (found, data) for a row that is queued or being written."""
+        with self.cond:
+            for queue in (self.staged or {}, self.pending, self.inflight):
+                if key in queue:
+                    return True, queue[key]
+        return False, None
+
+    def overlay(self, table: str) -> Dict[tuple, Optional[Any]]:
+        with self.cond:
+            rows = {
+                key: data
+                for (name, key), data in self.inflight.items()
+                if name == table
+            }
+            for queue in (self.pending, self.staged or {}):
+                rows.update({
+                    key: data
+                    for (name, key), data in queue.items()
+                    if name == table
+                })
+        return rows
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Block until everything queued so far is on disk."""
+        if not self.running:
+            return True
+        with self.cond:
+            target = self.submitted
+            self.flush_requested = True
+            self.cond.notify_all()
+            return self.cond.wait_for(lambda: self.completed >= target,
+                                      timeout)
+
+    def _run(self):
+        conn = self.store.connect()
+        try:
+            while True:
+                with self.cond:
+                    self.cond.wait_for(lambda: self.pending or self.stopping)
+                    if not self.pending:
+                        break
+                    deadline = monotonic() + self.window
+                    while not (self.flush_requested or self.stopping):
+                        remaining = deadline - monotonic()
+                        if remaining <= 0:
+                            break
+                        self.cond.wait(remaining)
+                    self.inflight, self.pending = self.pending, {}
+                    target = self.submitted
+                    self.flush_requested = False
+
+                try:
+                    self._apply(conn, self.inflight)
+                except Exception as e:
+                    if self._transient(e):
+                        print(f"❌ Failed to persist {len(self.inflight)} "
+                              f"writes, retrying: {e}")
+                        with self.cond:
+                            for key, data in self.inflight.items():
+                                self.pending.setdefault(key, data)
+                            self.inflight = {}
+                        sleep_time(1)
+                        continue
+                    # Retrying cannot help; save every row that still can
+                    self._apply_each(conn, self.inflight)
+
+                with self.cond:
+                    self.inflight = {}
+                    self.completed = target
+                    self.cond.notify_all()
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _transient(error: Exception) -> bool:
+        """Whether a failed commit may succeed if retried (a locked DB)."""
+        message = str(error).lower()
+        return isinstance(error, sqlite3.OperationalError) and (
+            "locked" in message or "busy" in message)
+
+    def _apply_each(self, conn: sqlite3.Connection,
+                    batch: Dict[tuple, Optional[Any]]):
+        for key, data in batch.items():
+            try:
+                self._apply(conn, {key: data})
+            except Exception as e:
+                print(f"❌ Dropping write {key}: {e}")
+
+    def _apply(self, conn: sqlite3.Connection, batch: Dict[tuple, Optional[Any]]):
+        files = {}
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for (table, key), data in batch.items():
+                if table == self.FILE:
+                    files[key] = data
+                else:
+                    self.store.apply(conn, table, key, data)
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+        for path, data in files.items():
+            write_file_atomic(path, data)
+
+
+storage = Storage()
+persistence = PersistenceWriter(storage)
+
+# ========== Schema Migrations ==========
+# Legacy JSON files and the table each one is imported into
+LEGACY_JSON_FILES = {
+    "logs": LOG_FILE,
+    "tasks": TASKS_FILE,
+    "scores": SCORES_FILE,
+    "comments": COMMENTS_FILE,
+    "badges": BADGES_FILE,
+    "user_badges": USER_BADGES_FILE,
+    "lives": LIVES_FILE,
+    "work_sessions": WORK_SESSIONS_FILE,
+}
+
+
+# Each migration upgrades the store from the previous schema version. It
+# runs exactly once (the version it reaches is stamped in the meta table in
+# the same transaction) and is safe to re-run, so reads can assume
+# canonical data.
+SCHEMA_VERSION_KEY = "schema_version"
+MIGRATIONS: List[Tuple[int, str, Callable[[Storage], int]]] = []
+
+
+def migration(version: int, description: str):
+    """Register a migration step that returns the number of rows rewritten."""
+
+    def decorator(func):
+        MIGRATIONS.append((version, description, func))
+        MIGRATIONS.sort(key=lambda step: step[0])
+        return func
+
+    return decorator
+
+
+def schema_version(store: Storage = None) -> int:
+    return int((store or storage).get_meta(SCHEMA_VERSION_KEY) or 0)
+
+
+def run_migrations(store: Storage = None) -> List[Tuple[int, str, int]]:
+    """Run every migration newer than the stored schema version, in order.
+
+    Returns (version, description, rows rewritten) for each step that ran.
+    """
+    store = store or storage
+    report = []
+    current = schema_version(store)
+    for version, description, step in MIGRATIONS:
+        if version <= current:
+            continue
+        with store.transaction():
+            rewritten = step(store)
+            store.set_meta(SCHEMA_VERSION_KEY, version)
+        report.append((version, description, rewritten))
+        current = version
+    return report
+
+
+@migration(1, "Import legacy JSON files")
+def _import_json_stores(store: Storage) -> int:
+    # Databases created before versioning already hold the import
+    if store.get_meta("json_imported"):
+        return 0
+    rewritten = 0
+    for table, path in LEGACY_JSON_FILES.items():
+        try:
+            with open(path, "r") as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            continue
+        rewritten += store.replace(table, data)
+    store.set_meta("json_imported", datetime.now(EST).isoformat())
+    return rewritten
+
+
+def _canonical_log_entry(entry: Any) -> List[Dict[str, str]]:
+    """Turn one stored entry into canonical {"timestamp", "log"} dicts.
+
+    Entries already in that shape are kept verbatim, and so is the text
+    of plain strings, which are only wrapped. The one legacy shape that
+    passes as canonical is from old ``migrate_logs`` runs: a whole day
+    stringified into the ``log`` field of an entry stamped "converted",
+    with stray quotes around each item's text. That shape is unpacked.
+    """
+    if not isinstance(entry, dict):
+        return [{"timestamp": "converted", "log": str(entry)}]
+    timestamp = entry.get("timestamp", "converted")
+    text = entry.get("log", "")
+    if not (isinstance(timestamp, str) and isinstance(text, str)):
+        return [{"timestamp": str(timestamp), "log": str(text)}]
+    if timestamp == "converted" and text.startswith("[") and text.endswith("]"):
+        try:
+            nested = ast.literal_eval(text)
+        except (ValueError, SyntaxError):
+            nested = None
+        if isinstance(nested, list) and all(
+                isinstance(item, (dict, str)) for item in nested):
+            return [{
+                "timestamp": str(item.get("timestamp", "converted")),
+                "log": str(item.get("log", "")).strip('"')
+            } if isinstance(item, dict) else {
+                "timestamp": "converted",
+                "log": item.strip('"')
+            } for item in nested]
+    if set(entry) == {"timestamp", "log"}:
+        return [entry]
+    return [{"timestamp": timestamp, "log": text}]
+
+
+def canonical_log_entries(value: Any) -> List[Dict[str, str]]:
+    """Canonical entry list for a stored (user, date) log value."""
+    if not isinstance(value, list):
+        value = [value]
+    entries = []
+    for entry in value:
+        entries.extend(_canonical_log_entry(entry))
+    return entries
+
+
+@migration(2, "Canonicalise daily log entries")
+def _canonicalise_logs(store: Storage) -> int:
+    rewritten = 0
+    for user_id, days in store.load("logs").items():
+        for date, value in days.items():
+            entries = canonical_log_entries(value)
+            if entries != value:
+                store.put("logs", (user_id, date), entries)
+                rewritten += 1
+    return rewritten
+
+
+def _canonical_id(value: Any) -> Any:
+    """``"#07"`` / ``" 7"`` -> ``7``; anything else is returned as is."""
+    try:
+        return int(str(value).strip().lstrip("#"))
+    except ValueError:
+        return value
+
+
+@migration(3, "Normalise task ids to integers")
+def _normalise_task_ids(store: Storage) -> int:
+    rewritten = 0
+    for user_id, tasks in store.load("tasks").items():
+        for task_id, task in tasks.items():
+            canonical = str(_canonical_id(task_id))
+            if canonical != task_id:
+                store.delete("tasks", (user_id, task_id))
+                store.put("tasks", (user_id, canonical), task)
+                rewritten += 1
+    for task_id, comments in store.load("comments").items():
+        canonical = str(_canonical_id(task_id))
+        if canonical != task_id:
+            merged = store.get("comments", (canonical, ), []) + comments
+            store.delete("comments", (task_id, ))
+            store.put("comments", (canonical, ), merged)
+            rewritten += 1
+    return rewritten
+
+
+@migration(4, "Seed log streaks from existing logs")
+def _seed_streaks(store: Storage) -> int:
+    seeded = 0
+    for user_id, days in store.load("logs").items():
+        if store.get("progress", (user_id, )) is None and days:
+            store.put("progress", (user_id, ),
+                      ProgressTracker.seed(sorted(days)))
+            seeded += 1
+    return seeded
+
+
+@migration(5, "Build daily rollups from existing history")
+def _build_rollups(store: Storage) -> int:
+    rows: Dict[tuple, Dict[str, int]] = {}
+
+    def add(user_id, date: str, counter: str, amount: int):
+        row = rows.setdefault((str(user_id), date), DailyRollups.blank())
+        row[counter] += amount
+
+    for user_id, days in store.load("logs").items():
+        for date, entries in days.items():
+            add(user_id, date, "entries", len(entries))
+            add(user_id, date, "chars",
+                sum(len(entry.get("log", "")) for entry in entries))
+    for txn in store.load("score_ledger").values():
+        day = ScoreLedger._day(txn)
+        if day is not None:  # undated legacy awards have no day to go in
+            add(txn["user_id"], day.isoformat(), "points", txn["delta"])
+    for user_id, tasks in store.load("tasks").items():
+        for data in tasks.values():
+            if data.get("status") == "Completed" and data.get("completed_at"):
+                day = datetime.fromisoformat(
+                    data["completed_at"]).astimezone(EST).date()
+                add(user_id, day.isoformat(), "tasks", 1)
+    for key, row in rows.items():
+        store.put("rollups", key, row)
+    return len(rows)
+
+
+# Badges that end_work used to award by name before badges had criteria
+LEGACY_BADGE_CRITERIA = {
+    "marathon": {"metric": "session_minutes", "at_least": 120},
+    "dedicated": {"metric": "sessions", "at_least": 5},
+}
+
+
+@migration(6, "Seed badge counters and criteria for legacy badges")
+def _seed_badge_rules(store: Storage) -> int:
+    rewritten = 0
+    for badge_id, badge in store.load("badges").items():
+        if badge.get("criteria"):
+            continue
+        for word, criteria in LEGACY_BADGE_CRITERIA.items():
+            if word in badge.get("name", "").lower():
+                store.put("badges", (badge_id, ), {**badge,
+                                                   "criteria": criteria})
+                rewritten += 1
+                break
+    for user_id, tasks in store.load("tasks").items():
+        completed = sum(1 for data in tasks.values()
+                        if data.get("status") == "Completed")
+        counters = store.get("badge_counters", (user_id, ),
+                             BadgeEngine.blank())
+        if completed and counters["tasks_completed"] != completed:
+            store.put("badge_counters", (user_id, ),
+                      {**counters, "tasks_completed": completed})
+            rewritten += 1
+    return rewritten
+
+
 def with_parsed_date(param_name: str):
     """Decorator to parse a date parameter flexibly."""
 
@@ -217,206 +1370,1694 @@ def parse_flexible_date(date_str: str, default_to_today: bool = False) -> str:
 
 
 async def cleanup_task_assignments():
-    merged_assignments = {}
+    """Drop assignments held by accounts that no longer exist."""
+    users = await member_directory.resolve_many(task_registry.user_ids())
+    for user_id, user in users.items():
+        if user is None:
+            task_registry.remove_user(user_id)
+
+
+class RankIndex:
+    """Leaderboard order kept as a sorted list of (-total, user_id).
+
+    Lookups are binary searches: a user's rank is one more than the number
+    of users with a strictly higher total, so tied users share a rank and
+    the next rank skips past them (1, 1, 3), the same ranking the
+    leaderboard channel has always shown.
+    """
+
+    def __init__(self):
+        self.entries: List[tuple] = []
+        self.totals: Dict[int, int] = {}
+
+    def __len__(self):
+        return len(self.entries)
+
+    def update(self, user_id, total: int):
+        user_id = int(user_id)
+        self.remove(user_id)
+        self.totals[user_id] = total
+        bisect.insort(self.entries, (-total, user_id))
+
+    def remove(self, user_id):
+        user_id = int(user_id)
+        if user_id not in self.totals:
+            return
+        entry = (-self.totals.pop(user_id), user_id)
+        index = bisect.bisect_left(self.entries, entry)
+        del self.entries[index]
+
+    def rank_of_total(self, total: int) -> int:
+        return bisect.bisect_left(self.entries, (-total, )) + 1
+
+    def rank(self, user_id) -> Optional[int]:
+        total = self.totals.get(int(user_id))
+        return None if total is None else self.rank_of_total(total)
+
+    def page(self, start: int, size: int) -> List[tuple]:
+        """(rank, user_id, total) for ``size`` users starting at ``start``."""
+        return [(self.rank_of_total(-neg_total), user_id, -neg_total)
+                for neg_total, user_id in self.entries[start:start + size]]
+
+    def top(self, n: int) -> List[tuple]:
+        return self.page(0, n)
+
+    def leaders(self) -> List[int]:
+        """Every user sharing rank 1."""
+        if not self.entries:
+            return []
+        end = bisect.bisect_right(self.entries, (self.entries[0][0], float("inf")))
+        return [user_id for _, user_id in self.entries[:end]]
+
+
+class PointWindow:
+    """Per-user point totals over the EST days from ``start(today)`` to today.
+
+    ``start`` maps a day to the first day of the window containing it, so
+    the same class covers calendar windows (this week, this month) and
+    rolling ones (last 7 days). When the window start moves forward the
+    days that fell out are subtracted; nothing older is rescanned.
+    """
+
+    def __init__(self, label: str, start: Callable):
+        self.label = label
+        self.start = start
+        self.first = None  # first day currently inside the window
+        self.totals: Dict[str, int] = {}
+        self.ranking = RankIndex()
+
+    def add(self, user_id: str, delta: int):
+        total = self.totals.get(user_id, 0) + delta
+        if total:
+            self.totals[user_id] = total
+            self.ranking.update(user_id, total)
+        else:
+            self.totals.pop(user_id, None)
+            self.ranking.remove(user_id)
+
+    def roll(self, today, days: Dict[Any, Dict[str, int]]):
+        first = self.start(today)
+        if first == self.first:
+            return
+        if self.first is None or first < self.first or (
+                first - self.first).days > len(days):
+            # First use, or a jump longer than the history: start over
+            self.totals, self.ranking = {}, RankIndex()
+            for day, points in days.items():
+                if first <= day <= today:
+                    for user_id, delta in points.items():
+                        self.add(user_id, delta)
+        else:
+            day = self.first
+            while day < first:
+                for user_id, delta in days.get(day, {}).items():
+                    self.add(user_id, -delta)
+                day += timedelta(days=1)
+        self.first = first
+
+
+POINT_WINDOWS = {
+    "week": ("This Week", lambda day: day - timedelta(days=day.weekday())),
+    "month": ("This Month", lambda day: day.replace(day=1)),
+    "7d": ("Last 7 Days", lambda day: day - timedelta(days=6)),
+    "30d": ("Last 30 Days", lambda day: day - timedelta(days=29)),
+}
+
+
+class ScoreLedger:
+    """Running point totals backed by an append-only transaction log.
+
+    Every award or adjustment is stored as one ``score_ledger`` row and
+    applied to the in-memory state: a total per user, the itemised awards
+    per user (the shape scores.json used to have) and the set of award
+    keys used for duplicate checks. Startup replays the ledger once; after
+    that a user's total or score breakdown is a dict lookup.
+
+    Each transaction is also bucketed by the EST day of its timestamp
+    (``days``: date -> user id -> points), which feeds the POINT_WINDOWS
+    leaderboards. Transactions without a timestamp count towards totals
+    only.
+    """
+
+    def __init__(self, store: Storage):
+        self.store = store
+        self.loaded = False
+        self.totals: Dict[str, int] = {}
+        self.awards: Dict[str, Dict[str, Dict]] = {}
+        self.award_keys: Set[tuple] = set()
+        self.ranking = RankIndex()
+        self.days: Dict[Any, Dict[str, int]] = {}
+        self.windows: Dict[str, PointWindow] = {}
+        self.seq = 0
+        self.rollups: Optional["DailyRollups"] = None
+        self.badges: Optional["BadgeEngine"] = None
+
+    def load(self):
+        self.totals, self.awards, self.award_keys = {}, {}, set()
+        self.ranking = RankIndex()
+        self.days = {}
+        self.windows = {
+            name: PointWindow(label, start)
+            for name, (label, start) in POINT_WINDOWS.items()
+        }
+        self.loaded = True
+        transactions = self.store.load("score_ledger")
+        if not transactions:
+            self._seed_from_scores()
+            return
+        for seq, txn in transactions.items():
+            self.seq = max(self.seq, int(seq))
+            self._apply(txn)
+
+    # Award keys that carry the day they were earned:
+    # daily_log_2025-05-25, challenge_<name>_2025-05-19, work_20250525_101500
+    AWARD_KEY_DATE_RE = re.compile(
+        r"_(\d{4})-?(\d{2})-?(\d{2})(?:_(\d{2})(\d{2})(\d{2}))?$")
+
+    @classmethod
+    def _seed_timestamp(cls, award_key: str) -> Optional[str]:
+        """When a legacy award was earned, if its key says; otherwise None."""
+        match = cls.AWARD_KEY_DATE_RE.search(award_key)
+        if match is None:
+            return None
+        try:
+            earned = datetime(*(int(part or 0) for part in match.groups()))
+        except ValueError:
+            return None
+        return EST.localize(earned).isoformat()
+
+    def _seed_from_scores(self):
+        """Open the ledger with one transaction per award already in scores.
+
+        Legacy awards were never timestamped, so only those whose key
+        holds a date are placed on a day; the rest count towards totals
+        but no period.
+        """
+        with self.store.transaction():
+            for user_id, awards in self.store.load("scores").items():
+                for award_key, award in awards.items():
+                    self._record({
+                        "kind": "award",
+                        "user_id": user_id,
+                        "award_key": award_key,
+                        "delta": award.get("points", 0),
+                        "description": award.get("description", ""),
+                        "notes": award.get("notes", []),
+                        "timestamp": self._seed_timestamp(award_key)
+                    })
+
+    def _loaded(self):
+        if not self.loaded:
+            self.load()
+
+    def _apply(self, txn: Dict):
+        user_id, award_key = txn["user_id"], txn["award_key"]
+        user_awards = self.awards.setdefault(user_id, {})
+        award = user_awards.setdefault(award_key, {
+            "points": 0,
+            "description": txn.get("description", "")
+        })
+        award["points"] += txn["delta"]
+        if txn.get("description"):
+            award["description"] = txn["description"]
+        if txn.get("notes"):
+            award.setdefault("notes", []).extend(txn["notes"])
+        self.totals[user_id] = self.totals.get(user_id, 0) + txn["delta"]
+        self.award_keys.add((user_id, award_key))
+
+        # Adjustments that bring an award down to zero remove it
+        if txn["kind"] == "adjust" and award["points"] <= 0:
+            del user_awards[award_key]
+            self.award_keys.discard((user_id, award_key))
+            if not user_awards:
+                del self.awards[user_id]
+
+        if user_id in self.awards:
+            self.ranking.update(user_id, self.totals[user_id])
+        else:
+            self.ranking.remove(user_id)
+
+        day = self._day(txn)
+        if day is None:
+            return
+        points = self.days.setdefault(day, {})
+        points[user_id] = points.get(user_id, 0) + txn["delta"]
+        for window in self.windows.values():
+            if window.first is not None and window.first <= day:
+                window.add(user_id, txn["delta"])
+
+    @staticmethod
+    def _day(txn: Dict):
+        """EST day of a transaction, or None if it carries no timestamp."""
+        try:
+            return datetime.fromisoformat(txn["timestamp"]).astimezone(EST).date()
+        except (KeyError, TypeError, ValueError):
+            return None
+
+    def _record(self, txn: Dict):
+        self.seq += 1
+        self.store.put("score_ledger", (f"{self.seq:012d}", ), txn)
+        self._apply(txn)
+        day = self._day(txn)
+        if self.rollups is not None and day is not None:
+            self.rollups.add(txn["user_id"], day.isoformat(),
+                             points=txn["delta"])
+        if self.badges is not None and txn["delta"] > 0:
+            self.badges.event("points", txn["user_id"])
+
+    def award(self, user_id, award_key: str, points: int,
+              description: str) -> bool:
+        """Award points once per key. Returns False for a duplicate award."""
+        self._loaded()
+        user_id, award_key = str(user_id), str(award_key)
+        if (user_id, award_key) in self.award_keys:
+            return False
+        self._record({
+            "kind": "award",
+            "user_id": user_id,
+            "award_key": award_key,
+            "delta": points,
+            "description": description,
+            "timestamp": datetime.now(EST).isoformat()
+        })
+        return True
+
+    def adjust(self, user_id, award_key: str, delta: int,
+               description: Optional[str] = None,
+               note: Optional[str] = None) -> int:
+        """Move an award's points by ``delta`` and return its new value."""
+        self._loaded()
+        user_id, award_key = str(user_id), str(award_key)
+        self._record({
+            "kind": "adjust",
+            "user_id": user_id,
+            "award_key": award_key,
+            "delta": delta,
+            "description": description,
+            "notes": [note] if note else [],
+            "timestamp": datetime.now(EST).isoformat()
+        })
+        return self.awards.get(user_id, {}).get(award_key,
+                                                {}).get("points", 0)
+
+    def total(self, user_id) -> int:
+        self._loaded()
+        return self.totals.get(str(user_id), 0)
+
+    def items(self, user_id) -> Dict[str, Dict]:
+        self._loaded()
+        return self.awards.get(str(user_id), {})
+
+    def leaderboard(self, window: str = "all") -> RankIndex:
+        """All-time ranking, or the ranking for one of POINT_WINDOWS."""
+        self._loaded()
+        if window == "all":
+            return self.ranking
+        return self.window(window).ranking
+
+    def window(self, name: str) -> PointWindow:
+        self._loaded()
+        window = self.windows[name]
+        window.roll(datetime.now(EST).date(), self.days)
+        return window
+
+    def daily(self, user_id, first, last) -> List[Tuple[Any, int]]:
+        """(day, points) for the days from ``first`` to ``last`` with points."""
+        self._loaded()
+        user_id = str(user_id)
+        return [(day, self.days[day][user_id]) for day in sorted(self.days)
+                if first <= day <= last and self.days[day].get(user_id)]
+
+
+score_ledger = ScoreLedger(storage)
+
+
+def award_points(user_id: str, task_id: str, points: int, description: str):
+    # Prevent duplicate point awards
+    score_ledger.award(user_id, task_id, points, description)
+
+
+@bot.event
+async def on_command_error(ctx, error):
+    if isinstance(error, commands.CommandNotFound):
+        await ctx.send(
+            f"❌ Command not found. Use `!help` for available commands.",
+            delete_after=10)
+    elif isinstance(error, commands.MissingRequiredArgument):
+        await ctx.send(f"❌ Missing required argument: {error.param.name}",
+                       delete_after=10)
+    elif isinstance(error, commands.BadArgument):
+        await ctx.send(f"❌ Invalid argument: {str(error)}", delete_after=10)
+    elif isinstance(error, commands.CheckFailure):
+        pass  # Silent check failures are ignored
+    else:
+        error_embed = discord.Embed(
+            title="❌ Command Error",
+            description=f"An error occurred: {str(error)}",
+            color=COLORS["error"])
+        await ctx.send(embed=error_embed)
+
+
+
+def get_user_lives(user_id):
+    return storage.get("lives", (user_id, ), 3)
+
+
+def load_lives():
+    return storage.load("lives")
+
+
+def save_lives(lives_data):
+    storage.replace("lives", lives_data)
+
+
+def set_user_lives(user_id, lives: int):
+    storage.put("lives", (user_id, ), lives)
+
+
+def load_scores() -> Dict[str, Dict[str, Dict]]:
+    score_ledger._loaded()
+    return score_ledger.awards
+
+
+def load_user_scores(user_id) -> Dict[str, Dict]:
+    return score_ledger.items(user_id)
+
+
+class LogCache:
+    """Daily logs split into per-user partitions that load on demand.
+
+    Only a small manifest (user id -> latest log date) is read at startup.
+    A user's partition is read from storage the first time it is needed,
+    so single-user commands cost time proportional to that user's logs.
+    The most recently used ``max_partitions`` partitions stay in memory
+    and older ones are dropped. Partitions never hold unsaved data, so
+    dropping one is free.
+
+    Writes go through the cache: the (user, date) rows they touch are
+    marked dirty and flushed straight away, so storage never lags behind
+    what commands see.
+
+    Dicts handed out by ``user``/``day`` are the cached objects themselves.
+    Treat them as read-only and change logs through the methods below so
+    the dirty rows get written.
+    """
+
+    def __init__(self, store: Storage, max_partitions: int = 64):
+        self.store = store
+        self.max_partitions = max_partitions
+        self.partitions: "OrderedDict[str, Dict[str, List[Dict]]]" = OrderedDict()
+        self.manifest: Optional[Dict[str, str]] = None
+        self.dirty: Set[tuple] = set()
+        self.search: Optional["SearchIndex"] = None
+        self.progress: Optional["ProgressTracker"] = None
+        self.activity: Optional["ActivityIndex"] = None
+        self.rollups: Optional["DailyRollups"] = None
+        self.badges: Optional["BadgeEngine"] = None
+
+    def load(self):
+        self.partitions.clear()
+        self.dirty.clear()
+        self.manifest = self.store.latest_inner_keys("logs")
+
+    def _manifest(self) -> Dict[str, str]:
+        if self.manifest is None:
+            self.load()
+        return self.manifest
+
+    def user_ids(self) -> List[str]:
+        return list(self._manifest())
+
+    def latest_date(self, user_id) -> Optional[str]:
+        return self._manifest().get(str(user_id))
+
+    def users_by_latest(self) -> List[str]:
+        """User ids, most recent logger first."""
+        manifest = self._manifest()
+        return sorted(manifest, key=manifest.get, reverse=True)
+
+    def user(self, user_id) -> Dict[str, List[Dict]]:
+        user_id = str(user_id)
+        partition = self.partitions.get(user_id)
+        if partition is None:
+            if user_id in self._manifest():
+                partition = self.store.load_partition("logs", user_id)
+            else:
+                partition = {}
+            self.partitions[user_id] = partition
+            while len(self.partitions) > self.max_partitions:
+                self.partitions.popitem(last=False)
+        self.partitions.move_to_end(user_id)
+        return partition
+
+    def all(self) -> Dict[str, Dict[str, List[Dict]]]:
+        """Every user's logs. Loads every partition, so keep it off hot paths."""
+        return {user_id: self.user(user_id) for user_id in self.user_ids()}
+
+    def day(self, user_id, date: str) -> Optional[List[Dict]]:
+        return self.user(user_id).get(date)
+
+    def mark_dirty(self, user_id, date: str):
+        self.dirty.add((str(user_id), date))
+
+    def flush(self):
+        """Write every dirty (user, date) row to storage."""
+        if not self.dirty:
+            return
+        manifest = self._manifest()
+        with self.store.transaction():
+            for user_id, date in self.dirty:
+                partition = self.user(user_id)
+                entries = partition.get(date)
+                if entries is None:
+                    self.store.delete("logs", (user_id, date))
+                else:
+                    self.store.put("logs", (user_id, date), entries)
+                if self.search is not None:
+                    self.search.index_log_day(user_id, date, entries or [])
+                if self.progress is not None and entries:
+                    self.progress.logged(user_id, date)
+                if self.activity is not None:
+                    self.activity.update(user_id, date, bool(entries))
+                if self.rollups is not None:
+                    self.rollups.logged(user_id, date, entries or [])
+                if self.badges is not None and entries:
+                    self.badges.event("log", user_id)
+                if partition:
+                    manifest[user_id] = max(partition)
+                else:
+                    manifest.pop(user_id, None)
+        self.dirty.clear()
+
+    def append(self, user_id, date: str, entry: Dict) -> List[Dict]:
+        entries = self.user(user_id).setdefault(date, [])
+        entries.append(entry)
+        self.mark_dirty(user_id, date)
+        self.flush()
+        return entries
+
+    def set_day(self, user_id, date: str, entries: List[Dict]):
+        self.user(user_id)[date] = entries
+        self.mark_dirty(user_id, date)
+        self.flush()
+
+    def delete_day(self, user_id, date: str) -> bool:
+        user_logs = self.user(user_id)
+        if date not in user_logs:
+            return False
+        del user_logs[date]
+        self.mark_dirty(user_id, date)
+        self.flush()
+        return True
+
+    def delete_user(self, user_id) -> int:
+        user_logs = self.user(user_id)
+        dates = list(user_logs)
+        user_logs.clear()
+        for date in dates:
+            self.mark_dirty(user_id, date)
+        self.flush()
+        return len(dates)
+
+    def delete_date(self, date: str) -> int:
+        if self.activity is not None:
+            user_ids = sorted(self.activity.users(date))
+        else:
+            user_ids = [
+                user_id
+                for user_id, _ in self.store.keys("logs", {"date": date})
+            ]
+        for user_id in user_ids:
+            self.delete_day(user_id, date)
+        return len(user_ids)
+
+    def replace_all(self, logs: Dict[str, Dict[str, List[Dict]]]):
+        self.store.replace("logs", logs)
+        self.load()
+        if self.search is not None:
+            self.search.load_logs()
+        if self.activity is not None:
+            self.activity.load()
+        if self.rollups is not None:
+            self.rollups.replace_logs(logs)
+
+
+log_cache = LogCache(storage)
+
+
+def load_logs():
+    return log_cache.all()
+
+
+def load_user_logs(user_id) -> Dict[str, List[Dict]]:
+    return log_cache.user(user_id)
+
+
+def save_logs(logs: Dict[str, Dict[str, List[Dict]]]):
+    log_cache.replace_all(logs)
+
+
+def append_log_entry(user_id: str, date: str, log_text: str) -> List[Dict]:
+    """Append one entry to a user's log for ``date``, touching only that row."""
+    return log_cache.append(user_id, date, {
+        "timestamp": datetime.now(EST).isoformat(),
+        "log": log_text
+    })
+
+
+class ActivityIndex:
+    """Who logged on each date: EST date -> set of user ids.
+
+    A date's set is read from the ``logs`` date index the first time it
+    is asked for, without decoding any entries, and ``LogCache.flush``
+    keeps it in step with every write after that. The ``max_dates`` most
+    recently used dates stay in memory, so today and yesterday are always
+    at hand for the reminder jobs and "who hasn't logged" is a set
+    difference against the member list.
+    """
+
+    def __init__(self, logs: LogCache, store: Storage, max_dates: int = 14):
+        self.store = store
+        self.max_dates = max_dates
+        self.days: "OrderedDict[str, Set[str]]" = OrderedDict()
+        logs.activity = self
+
+    def load(self):
+        self.days.clear()
+
+    def users(self, date: str) -> Set[str]:
+        """User ids with log entries on ``date``; treat as read-only."""
+        users = self.days.get(date)
+        if users is None:
+            users = {
+                user_id
+                for user_id, _ in self.store.keys("logs", {"date": date})
+            }
+            self.days[date] = users
+            while len(self.days) > self.max_dates:
+                self.days.popitem(last=False)
+        self.days.move_to_end(date)
+        return users
+
+    def update(self, user_id, date: str, logged: bool):
+        users = self.days.get(date)
+        if users is None:
+            return  # read fresh from storage when next needed
+        if logged:
+            users.add(str(user_id))
+        else:
+            users.discard(str(user_id))
+
+    def missing(self, members, date: str) -> list:
+        """Members (bots excluded) with nothing logged on ``date``."""
+        users = self.users(date)
+        return [
+            member for member in members
+            if not member.bot and str(member.id) not in users
+        ]
+
+
+activity_index = ActivityIndex(log_cache, storage)
+
+
+class Priority(Enum):
+    """Task priority, declared from most to least urgent."""
+
+    VERY_HIGH = "very high"
+    HIGH = "high"
+    NORMAL = "normal"
+    LOW = "low"
+    VERY_LOW = "very low"
+
+    @classmethod
+    def parse(cls, value: Any) -> "Priority":
+        text = str(value or "normal").strip().lower()
+        if text == "medium":
+            return cls.NORMAL
+        try:
+            return cls(text)
+        except ValueError:
+            return cls.NORMAL
+
+    @property
+    def label(self) -> str:
+        return self.value.title()
+
+    @property
+    def rank(self) -> int:
+        return PRIORITY_RANKS[self]
+
+
+PRIORITY_RANKS = {priority: rank for rank, priority in enumerate(Priority)}
+
+
+def parse_due(value: Optional[str]) -> Optional[datetime]:
+    """Parse a stored due date into an EST datetime (naive means EST)."""
+    if not value:
+        return None
+    try:
+        due = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    if due.tzinfo is None:
+        due = EST.localize(due)
+    return due.astimezone(EST)
+
+
+class Task:
+    """A task with its fields already parsed.
+
+    ``due`` is an aware EST datetime, ``priority`` a Priority and
+    ``reminded`` the frozenset of reminder kinds already sent. Keys the model
+    does not know about are kept in ``extra`` so they survive a save.
+    The stored dict shape only exists in ``from_dict``/``to_dict``.
+    """
+
+    __slots__ = ("task_id", "name", "description", "due", "priority",
+                 "importance", "points", "status", "created_at",
+                 "assigned_at", "assigned_by", "completed_at", "categories",
+                 "reminded", "extra")
+
+    KNOWN_KEYS = {
+        "name", "description", "due_date", "priority", "importance",
+        "points", "status", "created_at", "assigned_at", "assigned_by",
+        "completed_at", "categories"
+    }
+    REMINDER_KINDS = ("24h", "1h", "overdue")
+
+    def __init__(self, description: str = "", due: Optional[datetime] = None,
+                 priority: Priority = Priority.NORMAL, importance: int = 1,
+                 points: int = 10, status: str = "Pending",
+                 name: Optional[str] = None, created_at: Optional[str] = None,
+                 task_id: int = 0):
+        self.task_id = task_id
+        self.name = name
+        self.description = description
+        self.due = due
+        self.priority = priority
+        self.importance = importance
+        self.points = points
+        self.status = status
+        self.created_at = created_at or datetime.now(EST).isoformat()
+        self.assigned_at: Optional[str] = None
+        self.assigned_by: Optional[int] = None
+        self.completed_at: Optional[str] = None
+        self.categories: List[str] = []
+        self.reminded: FrozenSet[str] = frozenset()
+        self.extra: Dict[str, Any] = {}
+
+    @classmethod
+    def from_dict(cls, task_id: int, data: Dict[str, Any]) -> "Task":
+        try:
+            importance = int(data.get("importance", 1))
+        except (TypeError, ValueError):
+            importance = 1
+        try:
+            points = int(data.get("points", 10))
+        except (TypeError, ValueError):
+            points = 10
+        task = cls(description=data.get("description") or "",
+                   due=parse_due(data.get("due_date")),
+                   priority=Priority.parse(data.get("priority")),
+                   importance=importance,
+                   points=points,
+                   status=data.get("status") or "Pending",
+                   name=data.get("name"),
+                   task_id=int(task_id))
+        task.created_at = data.get("created_at")
+        task.assigned_at = data.get("assigned_at")
+        if data.get("assigned_by") is not None:
+            task.assigned_by = int(data["assigned_by"])
+        task.completed_at = data.get("completed_at")
+        task.categories = list(data.get("categories") or [])
+        task.reminded = frozenset(kind for kind in cls.REMINDER_KINDS
+                                  if data.get(f"reminded_{kind}"))
+        task.extra = {
+            key: value
+            for key, value in data.items()
+            if key not in cls.KNOWN_KEYS and not key.startswith("reminded_")
+        }
+        return task
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = dict(self.extra)
+        data.update({
+            "description": self.description,
+            "due_date": self.due.isoformat() if self.due else None,
+            "priority": self.priority.value,
+            "importance": self.importance,
+            "points": self.points,
+            "status": self.status,
+        })
+        for key in ("name", "created_at", "assigned_at", "assigned_by",
+                    "completed_at"):
+            value = getattr(self, key)
+            if value is not None:
+                data[key] = value
+        if self.categories:
+            data["categories"] = list(self.categories)
+        for kind in self.reminded:
+            data[f"reminded_{kind}"] = True
+        return data
+
+    def copy(self) -> "Task":
+        return Task.from_dict(self.task_id, self.to_dict())
+
+    @property
+    def completed(self) -> bool:
+        return self.status == "Completed"
+
+
+class TaskRegistry:
+    """Tasks indexed for constant-time lookups.
+
+    ``assignments`` is the per-assignee index (user id -> task id -> task),
+    ``by_id`` maps a task id to its assignees' copies and ``by_status``
+    maps a status to the (user id, task id) pairs in it. Tasks created but
+    not yet assigned are kept in ``created`` (task id -> (creator, task)),
+    in memory only as before.
+
+    Ids are ints everywhere; they only become strings in storage keys.
+    Changes go through the registry so the indexes stay in step, and each
+    one writes just the rows it touches.
+    """
+
+    def __init__(self, store: Storage):
+        self.store = store
+        self.assignments: Dict[int, Dict[int, Task]] = {}
+        self.by_id: Dict[int, Dict[int, Task]] = {}
+        self.by_status: Dict[str, Set[Tuple[int, int]]] = {}
+        self.created: Dict[int, Tuple[int, Task]] = {}
+        self.counter = 0
+        self.reminders: Optional["ReminderScheduler"] = None
+        self.renderer: Optional["TaskChannelRenderer"] = None
+        self.search: Optional["SearchIndex"] = None
+        self.progress: Optional["ProgressTracker"] = None
+        self.rollups: Optional["DailyRollups"] = None
+        self.badges: Optional["BadgeEngine"] = None
+        self.overdue: Optional["OverdueDigests"] = None
+
+    def load(self):
+        self.assignments, self.by_id, self.by_status = {}, {}, {}
+        for user_id, tasks in self.store.load("tasks").items():
+            for task_id, data in tasks.items():
+                self._index(int(user_id), int(task_id),
+                            Task.from_dict(task_id, data))
+        self.counter = max([self.counter, *self.by_id, *self.created])
+
+    def _index(self, user_id: int, task_id: int, task: Task):
+        self.assignments.setdefault(user_id, {})[task_id] = task
+        self.by_id.setdefault(task_id, {})[user_id] = task
+        self.by_status.setdefault(task.status, set()).add((user_id, task_id))
+
+    def _write(self, user_id: int, task_id: int, task: Task):
+        self.store.put("tasks", (user_id, task_id), task.to_dict())
+
+    def _changed(self, user_id: int, task_id: int, task: Optional[Task]):
+        if self.reminders is not None:
+            self.reminders.arm(user_id, task_id, task)
+        if self.renderer is not None:
+            self.renderer.mark(user_id)
+        if self.search is not None:
+            self.search.index_task(user_id, task_id, task)
+        if self.overdue is not None:
+            self.overdue.track(user_id, task_id, task)
+
+    def _unindex(self, user_id: int, task_id: int) -> Optional[Task]:
+        tasks = self.assignments.get(user_id, {})
+        task = tasks.pop(task_id, None)
+        if task is None:
+            return None
+        if not tasks:
+            del self.assignments[user_id]
+        assignees = self.by_id[task_id]
+        del assignees[user_id]
+        if not assignees:
+            del self.by_id[task_id]
+        self.by_status[task.status].discard((user_id, task_id))
+        return task
+
+    # Lookups
+    def get(self, user_id: int, task_id: int) -> Optional[Task]:
+        return self.assignments.get(int(user_id), {}).get(int(task_id))
+
+    def assigned(self, user_id: int) -> Dict[int, Task]:
+        """Task id -> task for one assignee. Treat it as read-only."""
+        return self.assignments.get(int(user_id), {})
+
+    def assignees(self, task_id: int) -> Dict[int, Task]:
+        """Assignee id -> that assignee's copy of the task."""
+        return self.by_id.get(int(task_id), {})
+
+    def template(self, task_id: int) -> Optional[Task]:
+        created = self.created.get(int(task_id))
+        return created[1] if created else None
+
+    def find(self, task_id: int) -> Optional[Tuple[int, Task]]:
+        """(owner, task) for a task id: its first assignee, else its creator."""
+        assignees = self.by_id.get(int(task_id))
+        if assignees:
+            return next(iter(assignees.items()))
+        return self.created.get(int(task_id))
+
+    def with_status(self, status: str) -> List[Tuple[int, int, Task]]:
+        return [(user_id, task_id, self.assignments[user_id][task_id])
+                for user_id, task_id in self.by_status.get(status, ())]
+
+    def count(self, status: str) -> int:
+        return len(self.by_status.get(status, ()))
+
+    def user_ids(self) -> List[int]:
+        return list(self.assignments)
+
+    # Changes
+    def create(self, creator_id: int, task: Task) -> int:
+        self.counter += 1
+        task.task_id = self.counter
+        self.created[self.counter] = (creator_id, task)
+        return self.counter
+
+    def put(self, user_id: int, task_id: int, task: Task):
+        """Add or replace one assignee's copy of a task."""
+        user_id, task_id = int(user_id), int(task_id)
+        task.task_id = task_id
+        self._unindex(user_id, task_id)
+        self._index(user_id, task_id, task)
+        self._write(user_id, task_id, task)
+        self._changed(user_id, task_id, task)
+
+    def save(self, user_id: int, task_id: int):
+        """Persist in-place changes to a task that leave its status alone."""
+        task = self.get(user_id, task_id)
+        if task is not None:
+            self._write(int(user_id), int(task_id), task)
+            if self.renderer is not None:
+                self.renderer.mark(user_id)
+                self.renderer.request()
+            if self.search is not None:
+                self.search.index_task(int(user_id), int(task_id), task)
+
+    def set_status(self, user_id: int, task_id: int, status: str,
+                   **fields) -> Task:
+        user_id, task_id = int(user_id), int(task_id)
+        task = self._unindex(user_id, task_id)
+        completed_now = status == "Completed" and not task.completed
+        task.status = status
+        for field, value in fields.items():
+            setattr(task, field, value)
+        self._index(user_id, task_id, task)
+        self._write(user_id, task_id, task)
+        self._changed(user_id, task_id, task)
+        if completed_now and self.progress is not None:
+            self.progress.completed(user_id)
+        if completed_now and self.rollups is not None:
+            self.rollups.add(user_id, datetime.now(EST).date().isoformat(),
+                             tasks=1)
+        if completed_now and self.badges is not None:
+            self.badges.event("task", user_id)
+        return task
+
+    def update(self, task_id: int, **fields) -> bool:
+        """Set ``fields`` on a task's template and every assigned copy.
+
+        Moving the due date clears the reminders already sent for it.
+        """
+        task_id = int(task_id)
+        template = self.template(task_id)
+        assignees = self.assignees(task_id)
+        if template is None and not assignees:
+            return False
+        copies = ([template] if template is not None else []) + list(
+            assignees.values())
+        for task in copies:
+            if "due" in fields and fields["due"] != task.due:
+                task.reminded = frozenset()
+            for field, value in fields.items():
+                setattr(task, field, value)
+        with self.store.transaction():
+            for user_id, task in assignees.items():
+                self._write(user_id, task_id, task)
+                self._changed(user_id, task_id, task)
+        return True
+
+    def remove(self, user_id: int, task_id: int) -> Optional[Task]:
+        user_id, task_id = int(user_id), int(task_id)
+        task = self._unindex(user_id, task_id)
+        if task is not None:
+            self.store.delete("tasks", (user_id, task_id))
+            self._changed(user_id, task_id, None)
+        return task
+
+    def remove_task(self, task_id: int) -> List[int]:
+        """Unassign a task from everyone; returns the former assignees."""
+        user_ids = list(self.assignees(task_id))
+        with self.store.transaction():
+            for user_id in user_ids:
+                self.remove(user_id, task_id)
+        return user_ids
+
+    def remove_user(self, user_id: int) -> int:
+        """Drop all of a user's assignments; returns how many there were."""
+        task_ids = list(self.assigned(user_id))
+        with self.store.transaction():
+            for task_id in task_ids:
+                self.remove(user_id, task_id)
+        return len(task_ids)
+
+
+task_registry = TaskRegistry(storage)
+
+
+# ========== Search Index ==========
+TOKEN_RE = re.compile(r"\w+")
+PREFIX_WEIGHT = 0.5  # a prefix hit counts half as much as an exact term
+MIN_PREFIX = 3  # shorter query terms only match whole words
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_RE.findall(text.casefold())
+
+
+class InvertedIndex:
+    """Term -> {document key: term frequency}, with prefix lookups.
+
+    ``vocab`` is kept sorted so a prefix expands to a contiguous slice
+    found by bisection. Queries AND their terms together; every term of
+    MIN_PREFIX characters or more also matches indexed words starting with
+    it, weighted below exact matches. Scores are tf-idf normalised by document length.
+    """
+
+    def __init__(self):
+        self.postings: Dict[str, Dict[Any, int]] = {}
+        self.docs: Dict[Any, Tuple[int, Tuple[str, ...]]] = {}  # length, terms
+        self.vocab: List[str] = []
+        self.total_length = 0
+
+    def __len__(self) -> int:
+        return len(self.docs)
+
+    def add(self, key, text: str):
+        self.remove(key)
+        terms = tokenize(text)
+        if not terms:
+            return
+        counts: Dict[str, int] = {}
+        for term in terms:
+            counts[term] = counts.get(term, 0) + 1
+        unique = []
+        for term, tf in counts.items():
+            posting = self.postings.get(term)
+            if posting is None:
+                term = sys.intern(term)
+                posting = self.postings[term] = {}
+                bisect.insort(self.vocab, term)
+            posting[key] = tf
+            unique.append(term)
+        self.docs[key] = (len(terms), tuple(unique))
+        self.total_length += len(terms)
+
+    def remove(self, key):
+        doc = self.docs.pop(key, None)
+        if doc is None:
+            return
+        length, terms = doc
+        self.total_length -= length
+        for term in terms:
+            posting = self.postings[term]
+            del posting[key]
+            if not posting:
+                del self.postings[term]
+                del self.vocab[bisect.bisect_left(self.vocab, term)]
+
+    def expand(self, prefix: str) -> List[str]:
+        if len(prefix) < MIN_PREFIX:
+            return [prefix] if prefix in self.postings else []
+        start = bisect.bisect_left(self.vocab, prefix)
+        end = bisect.bisect_left(self.vocab, prefix + "\U0010ffff")
+        return self.vocab[start:end]
+
+    def search(self, query: str, accept: Optional[Callable] = None) -> List[Tuple[Any, float]]:
+        """(key, score) for documents matching every query term, best first."""
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms or not self.docs:
+            return []
+        n_docs = len(self.docs)
+        average = self.total_length / n_docs
+        # Rarest term first, so later terms only probe its candidates
+        expanded = sorted(
+            ((term, self.expand(term)) for term in terms),
+            key=lambda item: sum(len(self.postings[word]) for word in item[1]))
+        scores: Optional[Dict[Any, float]] = None
+        for term, words in expanded:
+            matched: Dict[Any, float] = {}
+            for word in words:
+                posting = self.postings[word]
+                weight = 1.0 if word == term else PREFIX_WEIGHT
+                idf = math.log(1 + n_docs / len(posting))
+                probe = posting if scores is None or len(posting) < len(
+                    scores) else scores
+                for key in probe:
+                    tf = posting.get(key)
+                    if tf is None or (scores is not None and key not in scores):
+                        continue
+                    if accept is not None and not accept(key):
+                        continue
+                    norm = tf / (tf + 0.5 + self.docs[key][0] / average)
+                    matched[key] = matched.get(key, 0.0) + weight * idf * norm
+            if scores is None:
+                scores = matched
+            else:
+                scores = {key: scores[key] + value
+                          for key, value in matched.items()}
+            if not scores:
+                return []
+        return sorted(scores.items(), key=lambda item: item[1], reverse=True)
+
+
+class SearchIndex:
+    """Full-text search over assigned tasks and daily log entries.
+
+    Tasks are indexed per (user id, task id) from their name, description,
+    categories and comments; log entries per (user id, date, position).
+    The task registry and log cache call back here on every write, so each
+    index is only built from storage once. Tasks are indexed at startup;
+    logs are indexed on the first log search, one user partition at a
+    time, so startup never decodes log history.
+    """
+
+    def __init__(self, registry: TaskRegistry, logs: "LogCache", store: Storage):
+        self.registry = registry
+        self.log_cache = logs
+        self.store = store
+        self.tasks = InvertedIndex()
+        self.logs = InvertedIndex()
+        self.log_rows: Dict[Tuple[str, str], int] = {}  # entries indexed per day
+        self.logs_built = False
+        registry.search = self
+        logs.search = self
+
+    def load(self):
+        self.load_tasks()
+        self.load_logs()
+
+    def load_tasks(self):
+        self.tasks = InvertedIndex()
+        comments = {
+            int(task_id): entries
+            for task_id, entries in self.store.load("comments").items()
+        }
+        for user_id, tasks in self.registry.assignments.items():
+            for task_id, task in tasks.items():
+                self.tasks.add((user_id, task_id),
+                               self.task_text(task, comments.get(task_id, [])))
+
+    def load_logs(self):
+        """Drop the log index; it is rebuilt on the next log search."""
+        self.logs, self.log_rows = InvertedIndex(), {}
+        self.logs_built = False
+
+    def _build_logs(self):
+        if self.logs_built:
+            return
+        self.logs_built = True
+        for user_id in self.log_cache.user_ids():
+            # Straight from storage so the cache keeps its partitions
+            for date, entries in self.store.load_partition("logs",
+                                                           user_id).items():
+                self.index_log_day(user_id, date, entries)
+
+    @staticmethod
+    def task_text(task: Task, comments: List[Dict]) -> str:
+        return "\n".join([task.name or "", task.description, *task.categories,
+                          *(comment["comment"] for comment in comments)])
+
+    def index_task(self, user_id: int, task_id: int, task: Optional[Task]):
+        if task is None:
+            self.tasks.remove((user_id, task_id))
+        else:
+            comments = self.store.get("comments", (task_id, ), [])
+            self.tasks.add((user_id, task_id), self.task_text(task, comments))
+
+    def index_comments(self, task_id: int):
+        for user_id, task in self.registry.assignees(task_id).items():
+            self.index_task(user_id, int(task_id), task)
+
+    def index_log_day(self, user_id, date: str, entries: List[Dict]):
+        if not self.logs_built:
+            return  # picked up from storage when the index is built
+        user_id = str(user_id)
+        for position in range(self.log_rows.pop((user_id, date), 0)):
+            self.logs.remove((user_id, date, position))
+        for position, entry in enumerate(entries):
+            self.logs.add((user_id, date, position), str(entry.get("log", "")))
+        if entries:
+            self.log_rows[(user_id, date)] = len(entries)
+
+    def search_tasks(self, query: str,
+                     user_id: Optional[int] = None) -> List[Tuple[int, int, Task]]:
+        """(user id, task id, task) for matching tasks, best match first."""
+        accept = None if user_id is None else (lambda key: key[0] == user_id)
+        hits = []
+        for (owner, task_id), _ in self.tasks.search(query, accept):
+            task = self.registry.get(owner, task_id)
+            if task is not None:
+                hits.append((owner, task_id, task))
+        return hits
+
+    def search_logs(self, query: str,
+                    user_id: Optional[str] = None) -> List[Tuple[str, str, int]]:
+        """(user id, date, position) for matching log entries.
+
+        Best match first; equal scores list the most recent day first.
+        """
+        self._build_logs()
+        accept = None if user_id is None else (lambda key: key[0] == user_id)
+        hits = self.logs.search(query, accept)
+        hits.sort(key=lambda hit: (hit[1], hit[0][1]), reverse=True)
+        return [key for key, _ in hits]
+
+    def log_entry(self, user_id: str, date: str, position: int) -> Optional[Dict]:
+        entries = self.log_cache.day(user_id, date) or []
+        return entries[position] if position < len(entries) else None
+
+
+search_index = SearchIndex(task_registry, log_cache, storage)
+
+
+# ========== Streaks & Challenges ==========
+weekly_challenges = {
+    "task_master": {
+        "goal": 5,
+        "reward": 50,
+        "desc": "Complete 5 tasks this week",
+        "metric": "tasks_done"
+    },
+    "log_king": {
+        "goal": 7,
+        "reward": 70,
+        "desc": "Log work 7 days in a row",
+        "metric": "week_streak"
+    }
+}
+
+
+def week_start(day) -> str:
+    """ISO date of the Monday starting ``day``'s EST week."""
+    return (day - timedelta(days=day.weekday())).isoformat()
+
+
+class ProgressTracker:
+    """Log streaks and weekly challenge progress, updated per event.
+
+    One ``progress`` row per user holds the current streak, the last day
+    logged, the best streak, and for the current week (keyed by its
+    Monday) the tasks completed, the streak within the week and the
+    challenges already rewarded. A log for the day after ``last_log``
+    extends the streak and any later day restarts it; logs backfilled
+    for earlier days are ignored, except one from a past week that still
+    extends the streak. Weekly fields reset the first time a row is
+    touched in a new week, and a streak whose last log is older than
+    yesterday reads as 0. Nothing scans log history.
+
+    Meeting a challenge goal awards its points once per week through the
+    score ledger.
+    """
 
-    # First pass - convert all keys to strings and merge duplicates
-    for user_id, tasks in bot.task_assignments.items():
-        str_id = str(user_id)
-        if str_id not in merged_assignments:
-            merged_assignments[str_id] = {}
+    def __init__(self, registry: TaskRegistry, logs: LogCache, store: Storage):
+        self.store = store
+        self.records: Dict[str, Dict] = {}
+        registry.progress = self
+        logs.progress = self
+
+    def load(self):
+        self.records = self.store.load("progress")
+
+    @staticmethod
+    def blank() -> Dict:
+        return {
+            "streak": 0,
+            "best_streak": 0,
+            "last_log": None,
+            "week": None,
+            "tasks_done": 0,
+            "week_streak": 0,
+            "rewarded": []
+        }
 
-        # Convert task IDs to strings if needed
-        for task_id, task in tasks.items():
-            merged_assignments[str_id][str(task_id)] = task
+    @classmethod
+    def seed(cls, dates: List[str]) -> Dict:
+        """A record for someone who logged on ``dates`` (sorted ISO days)."""
+        record = cls.blank()
+        for date in dates:
+            cls._log_day(record, datetime.strptime(date, "%Y-%m-%d").date())
+        return record
+
+    def record(self, user_id, today=None) -> Dict:
+        """A user's record, rolled over to the current week."""
+        today = today or datetime.now(EST).date()
+        record = self.records.get(str(user_id)) or self.blank()
+        if record["week"] != week_start(today):
+            record = {**record, "week": week_start(today), "tasks_done": 0,
+                      "week_streak": 0, "rewarded": []}
+        return record
+
+    def streak(self, user_id, today=None) -> int:
+        today = today or datetime.now(EST).date()
+        record = self.records.get(str(user_id))
+        if not record or not record["last_log"]:
+            return 0
+        last = datetime.strptime(record["last_log"], "%Y-%m-%d").date()
+        return record["streak"] if (today - last).days <= 1 else 0
+
+    def progress(self, user_id, name: str, today=None) -> int:
+        challenge = weekly_challenges[name]
+        record = self.record(user_id, today)
+        if challenge["metric"] == "week_streak" and self.streak(user_id,
+                                                               today) == 0:
+            return 0
+        return min(record[challenge["metric"]], challenge["goal"])
+
+    @staticmethod
+    def _log_day(record: Dict, day) -> bool:
+        last = (datetime.strptime(record["last_log"], "%Y-%m-%d").date()
+                if record["last_log"] else None)
+        if last is not None and day <= last:
+            return False
+        if last is not None and (day - last).days == 1:
+            record["streak"] += 1
+        else:
+            record["streak"] = 1
+        if record["week"] == week_start(day) and record["streak"] > 1:
+            record["week_streak"] += 1
+        else:
+            record["week_streak"] = 1
+        record["week"] = week_start(day)
+        record["last_log"] = day.isoformat()
+        record["best_streak"] = max(record["best_streak"], record["streak"])
+        return True
 
-    # Second pass - verify user existence
-    valid_assignments = {}
-    for user_id, tasks in merged_assignments.items():
+    def logged(self, user_id, date: str):
         try:
-            user = await bot.fetch_user(int(user_id))
-            valid_assignments[user_id] = tasks
-        except discord.NotFound:
-            continue
+            day = datetime.strptime(date, "%Y-%m-%d").date()
+        except ValueError:
+            return
+        today = datetime.now(EST).date()
+        if day > today:
+            return
+        record = self.record(user_id, today)
+        if week_start(day) != record["week"]:
+            # An earlier week's log only counts if it extends the streak,
+            # e.g. Sunday's log entered after midnight
+            last = (datetime.strptime(record["last_log"], "%Y-%m-%d").date()
+                    if record["last_log"] else None)
+            if last is not None and (day - last).days == 1:
+                record["streak"] += 1
+                record["best_streak"] = max(record["best_streak"],
+                                            record["streak"])
+                record["last_log"] = day.isoformat()
+                self._save(user_id, record)
+            return
+        if self._log_day(record, day):
+            self._save(user_id, record)
+
+    def completed(self, user_id):
+        record = self.record(user_id)
+        record["tasks_done"] += 1
+        self._save(user_id, record)
+
+    def _save(self, user_id, record: Dict):
+        user_id = str(user_id)
+        for name, challenge in weekly_challenges.items():
+            if (name not in record["rewarded"]
+                    and record[challenge["metric"]] >= challenge["goal"]):
+                record["rewarded"] = record["rewarded"] + [name]
+                award_points(user_id, f"challenge_{name}_{record['week']}",
+                             challenge["reward"],
+                             f"Weekly challenge: {challenge['desc']}")
+        self.records[user_id] = record
+        self.store.put("progress", (user_id, ), record)
+
+
+progress_tracker = ProgressTracker(task_registry, log_cache, storage)
+
+
+# ========== Daily Rollups ==========
+class DailyRollups:
+    """Per-user, per-day activity counters kept up to date at write time.
+
+    One ``rollups`` row per (user, EST date) holds the counters below.
+    Log counters are recomputed from the day's entries whenever that day
+    is flushed, so edits and resets stay exact; the rest are incremented
+    as tasks are completed, points recorded and work sessions ended.
+    Weekly and monthly figures are sums over a user's days in range and
+    never touch the logs, tasks or score ledger themselves.
+    """
 
-    bot.task_assignments = valid_assignments
-    save_tasks(bot.task_assignments)
+    COUNTERS = ("entries", "chars", "tasks", "points", "minutes")
 
+    def __init__(self, registry: TaskRegistry, logs: LogCache,
+                 ledger: ScoreLedger, store: Storage):
+        self.store = store
+        self.loaded = False
+        self.days: Dict[str, Dict[str, Dict[str, int]]] = {}
+        registry.rollups = self
+        logs.rollups = self
+        ledger.rollups = self
 
-def award_points(user_id: str, task_id: str, points: int, description: str):
-    try:
-        with open("scores.json", "r") as f:
-            scores = json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError):
-        scores = {}
+    @classmethod
+    def blank(cls) -> Dict[str, int]:
+        return dict.fromkeys(cls.COUNTERS, 0)
+
+    def load(self):
+        self.days = self.store.load("rollups")
+        self.loaded = True
+
+    def _loaded(self):
+        if not self.loaded:
+            self.load()
+
+    def _row(self, user_id, date: str) -> Dict[str, int]:
+        self._loaded()
+        user_days = self.days.setdefault(str(user_id), {})
+        return user_days.setdefault(date, self.blank())
+
+    def _save(self, user_id, date: str):
+        self.store.put("rollups", (str(user_id), date),
+                       self.days[str(user_id)][date])
+
+    def add(self, user_id, date: str, **amounts: int):
+        row = self._row(user_id, date)
+        for counter, amount in amounts.items():
+            row[counter] += amount
+        self._save(user_id, date)
+
+    def logged(self, user_id, date: str, entries: List[Dict]):
+        """Reset a day's log counters to match its current ``entries``."""
+        row = self._row(user_id, date)
+        row["entries"] = len(entries)
+        row["chars"] = sum(len(entry.get("log", "")) for entry in entries)
+        self._save(user_id, date)
+
+    def replace_logs(self, logs: Dict[str, Dict[str, List[Dict]]]):
+        self._loaded()
+        with self.store.transaction():
+            for user_id, user_days in self.days.items():
+                for date, row in user_days.items():
+                    if row["entries"] or row["chars"]:
+                        row["entries"] = row["chars"] = 0
+                        self._save(user_id, date)
+            for user_id, user_days in logs.items():
+                for date, entries in user_days.items():
+                    self.logged(user_id, date, entries)
+
+    def totals(self, user_id, first: str, last: str) -> Dict[str, int]:
+        """One user's counters summed over ``first``..``last`` (ISO dates)."""
+        self._loaded()
+        result = self.blank()
+        for date, row in self.days.get(str(user_id), {}).items():
+            if first <= date <= last:
+                for counter in self.COUNTERS:
+                    result[counter] += row.get(counter, 0)
+        return result
+
+    def period(self, first: str, last: str) -> Dict[str, Dict[str, int]]:
+        """User id -> counters summed over the range, for active users only."""
+        self._loaded()
+        result = {}
+        for user_id in self.days:
+            totals = self.totals(user_id, first, last)
+            if any(totals.values()):
+                result[user_id] = totals
+        return result
+
+
+def this_week(today=None) -> Tuple[str, str]:
+    today = today or datetime.now(EST).date()
+    return week_start(today), today.isoformat()
+
+
+def this_month(today=None) -> Tuple[str, str]:
+    today = today or datetime.now(EST).date()
+    return today.replace(day=1).isoformat(), today.isoformat()
+
+
+rollups = DailyRollups(task_registry, log_cache, score_ledger, storage)
 
-    if user_id not in scores:
-        scores[user_id] = {}
 
-    # Prevent duplicate point awards
-    if task_id not in scores[user_id]:
-        scores[user_id][task_id] = {
-            "points": points,
-            "description": description
-        }
+def load_comments() -> Dict[str, List[Dict]]:
+    return storage.load("comments")
 
-        with open("scores.json", "w") as f:
-            json.dump(scores, f, indent=4)
 
+def save_comments(comments: Dict[str, List[Dict]]):
+    storage.replace("comments", comments)
 
-@bot.event
-async def on_command_error(ctx, error):
-    if isinstance(error, commands.CommandNotFound):
-        await ctx.send(
-            f"❌ Command not found. Use `!help` for available commands.",
-            delete_after=10)
-    elif isinstance(error, commands.MissingRequiredArgument):
-        await ctx.send(f"❌ Missing required argument: {error.param.name}",
-                       delete_after=10)
-    elif isinstance(error, commands.BadArgument):
-        await ctx.send(f"❌ Invalid argument: {str(error)}", delete_after=10)
-    elif isinstance(error, commands.CheckFailure):
-        pass  # Silent check failures are ignored
-    else:
-        error_embed = discord.Embed(
-            title="❌ Command Error",
-            description=f"An error occurred: {str(error)}",
-            color=COLORS["error"])
-        await ctx.send(embed=error_embed)
 
+def load_task_comments(task_id) -> List[Dict]:
+    return storage.get("comments", (task_id, ), [])
 
 
-def save_created_tasks(data):
-    with open("created_tasks.json", "w") as f:
-        json.dump(data, f, indent=4)
+# ========== Log Export ==========
+EXPORT_FORMATS = ("txt", "csv", "jsonl")
+EXPORT_SPOOL_BYTES = 4 * 1024 * 1024  # kept in memory below this size
+EXPORT_GZIP_BYTES = 1024 * 1024  # single-user exports above this are gzipped
+EXPORT_CSV_HEADER = ("user_id", "user", "date", "time", "timestamp", "log")
 
 
-def get_user_lives(user_id):
-    lives = load_lives()
-    return lives.get(str(user_id), 3)
+def iter_export_rows(user_logs: Dict[str, List[Dict]]):
+    """Yield (date, timestamp, text) for every entry, newest day first."""
+    for date in sorted(user_logs, reverse=True):
+        for entry in user_logs[date]:
+            yield date, entry["timestamp"], entry["log"]
 
 
-def load_lives():
+def _export_date(date: str) -> str:
     try:
-        with open("lives.json", "r") as f:
-            return json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError):
-        return {}
+        return datetime.strptime(date, "%Y-%m-%d").strftime("%B %d, %Y")
+    except ValueError:
+        return date
 
 
-def save_lives(lives_data):
-    with open("lives.json", "w") as f:
-        json.dump(lives_data, f, indent=2)
+def _export_time(timestamp: str) -> str:
+    try:
+        return datetime.fromisoformat(timestamp).strftime("%H:%M")
+    except ValueError:
+        return "--:--"
+
+
+def write_log_export(out, fmt: str, user_id: str, display_name: str,
+                     user_logs: Dict[str, List[Dict]]):
+    """Stream one user's logs to the text stream ``out`` in ``fmt``."""
+    rows = iter_export_rows(user_logs)
+    if fmt == "txt":
+        out.write(f"Work Logs for {display_name}\n\n")
+        current = None
+        for date, timestamp, text in rows:
+            if date != current:
+                if current is not None:
+                    out.write("\n")
+                out.write(f"=== {_export_date(date)} ===\n")
+                current = date
+            out.write(f"[{_export_time(timestamp)}] {text}\n")
+        if current is not None:
+            out.write("\n")
+    elif fmt == "csv":
+        writer = csv.writer(out)
+        writer.writerow(EXPORT_CSV_HEADER)
+        for date, timestamp, text in rows:
+            writer.writerow((user_id, display_name, date,
+                             _export_time(timestamp), timestamp, text))
+    elif fmt == "jsonl":
+        for date, timestamp, text in rows:
+            out.write(json.dumps({
+                "user_id": user_id,
+                "user": display_name,
+                "date": date,
+                "timestamp": timestamp,
+                "log": text
+            }, ensure_ascii=False) + "\n")
+    else:
+        raise ValueError(f"Unknown export format: {fmt}")
 
 
-def load_logs():
-    try:
-        with open(LOG_FILE, "r") as f:
-            logs = json.load(f)
-
-        # Normalize all logs into list-of-dicts format
-        for user_id in logs:
-            for date in logs[user_id]:
-                entry = logs[user_id][date]
-                if isinstance(entry, str):
-                    logs[user_id][date] = [{
-                        "timestamp": "converted",
-                        "log": entry
-                    }]
-                elif isinstance(entry, dict) and "log" in entry:
-                    logs[user_id][date] = [entry]
-                elif isinstance(entry, list):
-                    new_entries = []
-                    for e in entry:
-                        if isinstance(e, str):
-                            new_entries.append({
-                                "timestamp": "converted",
-                                "log": e
-                            })
-                        elif isinstance(e, dict):
-                            new_entries.append(e)
-                    logs[user_id][date] = new_entries
-
-        return logs
-    except (FileNotFoundError, json.JSONDecodeError):
-        return {}
-
-
-def migrate_logs():
-    logs = load_logs()
-    for user_id, user_logs in logs.items():
-        for date, entry in user_logs.items():
-            if isinstance(entry, dict):
-                # Convert dictionary format to string
-                log_text = entry.get('log', '')
-                if isinstance(log_text, str) and log_text.startswith(
-                        '"') and log_text.endswith('"'):
-                    log_text = log_text[1:-1]
-                logs[user_id][date] = log_text
-            elif not isinstance(entry, str):
-                logs[user_id][date] = str(entry)
-    save_logs(logs)
-
-
-def save_logs(logs: Dict[str, Dict[str, str]]):
-    with open(LOG_FILE, "w") as f:
-        json.dump(logs, f, indent=2)
-
-
-def load_tasks() -> Dict[str, Any]:
-    try:
-        with open(TASKS_FILE, "r") as f:
-            return json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError):
-        return {}
+def _write_text(raw, fmt: str, user_id: str, display_name: str,
+                user_logs: Dict[str, List[Dict]]):
+    out = io.TextIOWrapper(raw, encoding="utf-8", newline="")
+    write_log_export(out, fmt, user_id, display_name, user_logs)
+    out.flush()
+    out.detach()  # leave the underlying stream open
 
 
-def save_tasks(tasks: Dict[str, Any]):
-    with open(TASKS_FILE, "w") as f:
-        json.dump(tasks, f, indent=2)
+def export_user_logs(user_id: str, display_name: str, fmt: str):
+    """Build one user's export; returns (file object, filename).
 
+    Runs off the event loop. The partition is read straight from storage,
+    so the export works on its own copy while commands keep logging.
+    Output spools in memory and only spills to disk when it gets large;
+    large exports are gzipped as they are written.
+    """
+    user_logs = storage.load_partition("logs", user_id)
+    size = sum(
+        len(entry["log"]) for entries in user_logs.values()
+        for entry in entries)
+    compress = size >= EXPORT_GZIP_BYTES
+
+    spool = tempfile.SpooledTemporaryFile(max_size=EXPORT_SPOOL_BYTES)
+    filename = f"logs_{user_id}.{fmt}"
+    if compress:
+        with gzip.GzipFile(filename=filename, mode="wb",
+                           fileobj=spool) as raw:
+            _write_text(raw, fmt, user_id, display_name, user_logs)
+        filename += ".gz"
+    else:
+        _write_text(spool, fmt, user_id, display_name, user_logs)
+    spool.seek(0)
+    return spool, filename
 
-def load_comments() -> Dict[str, List[Dict]]:
-    try:
-        with open(COMMENTS_FILE, "r") as f:
-            return json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError):
-        return {}
 
+def export_all_logs(users: Dict[str, str], fmt: str):
+    """Build a zip with one export per user; returns (file object, filename).
 
-def save_comments(comments: Dict[str, List[Dict]]):
-    with open(COMMENTS_FILE, "w") as f:
-        json.dump(comments, f, indent=2)
+    ``users`` maps user ids to display names. Partitions are read one at a
+    time and each member is deflated as it is written, so memory stays
+    bounded by a single user's logs.
+    """
+    spool = tempfile.SpooledTemporaryFile(max_size=EXPORT_SPOOL_BYTES)
+    with zipfile.ZipFile(spool, "w", zipfile.ZIP_DEFLATED) as archive:
+        for user_id, display_name in users.items():
+            user_logs = storage.load_partition("logs", user_id)
+            if not user_logs:
+                continue
+            with archive.open(f"logs_{user_id}.{fmt}", "w") as raw:
+                _write_text(raw, fmt, user_id, display_name, user_logs)
+    spool.seek(0)
+    stamp = datetime.now(EST).strftime("%Y%m%d_%H%M%S")
+    return spool, f"all_logs_{stamp}_{fmt}.zip"
 
 
 # ========== UI Components ==========
-async def update_task_channel():
-    channel = bot.get_channel(TASK_CHANNEL_ID)
-    if not channel:
-        print("❌ Task channel not found.")
-        return
+class TaskChannelRenderer:
+    """Keeps one task message per assignee in the task channel up to date.
+
+    The registry marks an assignee dirty whenever one of their tasks
+    changes. ``flush`` renders only dirty assignees, hashes each embed
+    (ignoring its timestamp) and edits the assignee's existing message only
+    when the hash differs; assignees left without tasks have their message
+    deleted. Message ids and hashes are kept in the ``task_messages`` table
+    so a restart goes on editing the same messages.
+
+    Commands flush after changing a task; changes made elsewhere (e.g.
+    reminders being sent) call ``request`` to flush in the background.
+    """
+
+    def __init__(self, registry: TaskRegistry, store: Storage):
+        self.registry = registry
+        self.store = store
+        self.messages: Dict[int, Dict] = {}  # user id -> message_id, hash
+        self.dirty: Set[int] = set()
+        self.lock = asyncio.Lock()
+        self.pending: Optional[asyncio.Task] = None
+        registry.renderer = self
+
+    def load(self):
+        self.messages = {
+            int(user_id): record
+            for user_id, record in self.store.load("task_messages").items()
+        }
+
+    def mark(self, user_id: int):
+        self.dirty.add(int(user_id))
+
+    def request(self):
+        """Flush the dirty assignees soon; does nothing outside the bot loop."""
+        if self.pending is not None and not self.pending.done():
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return  # e.g. migrations; on_ready does a full flush
+        self.pending = loop.create_task(self._flush_soon())
+
+    async def _flush_soon(self):
+        await asyncio.sleep(0)  # let the caller finish its other changes
+        self.pending = None  # marks made during the flush request another
+        await self.flush()
+
+    @staticmethod
+    def digest(embed: discord.Embed) -> str:
+        content = embed.to_dict()
+        content.pop("timestamp", None)
+        return hashlib.sha1(
+            json.dumps(content, sort_keys=True).encode("utf-8")).hexdigest()
+
+    async def flush(self, full: bool = False):
+        """Sync dirty assignees' messages; ``full`` checks every message.
+
+        A full pass also re-attaches the buttons of messages that are
+        already current, which a restart needs.
+        """
+        channel = bot.get_channel(TASK_CHANNEL_ID)
+        if not channel:
+            print("❌ Task channel not found.")
+            return
+
+        async with self.lock:
+            if full:
+                users = set(self.registry.assignments) | set(self.messages)
+                self.dirty.clear()
+            else:
+                users, self.dirty = self.dirty, set()
+            for user_id in sorted(users):
+                try:
+                    await self._sync(channel, user_id, full)
+                except discord.HTTPException as e:
+                    print(f"Error updating task message for user {user_id}: {e}")
+                    self.dirty.add(user_id)
+
+    async def _sync(self, channel, user_id: int, reattach: bool):
+        tasks = self.registry.assigned(user_id)
+        record = self.messages.get(user_id)
 
-    for user_id, tasks in bot.task_assignments.items():
         if not tasks:
-            continue
+            if record:
+                try:
+                    await outbox.delete(
+                        channel.get_partial_message(record["message_id"]))
+                except discord.NotFound:
+                    pass  # Already deleted
+                del self.messages[user_id]
+                self.store.delete("task_messages", (user_id, ))
+            return
+
+        view = TaskPaginatedView(tasks, user_id, label="All Tasks")
+        embed = view.create_embed()
+        digest = self.digest(embed)
+        if record and record["hash"] == digest:
+            if reattach:
+                bot.add_view(view, message_id=record["message_id"])
+            return
 
-        # Delete old message for that user if exists
-        old_message = bot.task_message_refs.get(user_id)
-        if old_message:
+        message_id = None
+        if record:
             try:
-                await old_message.delete()
+                await outbox.edit(
+                    channel.get_partial_message(record["message_id"]),
+                    embed=embed, view=view)
+                message_id = record["message_id"]
             except discord.NotFound:
-                pass  # Already deleted
-            except Exception as e:
-                print(f"Error deleting old message for user {user_id}: {e}")
+                pass  # Deleted by hand; send a new one
+        if message_id is None:
+            message_id = (await outbox.send(channel, embed=embed,
+                                            view=view)).id
+
+        self.messages[user_id] = {"message_id": message_id, "hash": digest}
+        self.store.put("task_messages", (user_id, ), self.messages[user_id])
+
+
+task_channel = TaskChannelRenderer(task_registry, storage)
 
-        # Create new paginated view for this user
-        view = TaskPaginatedView(tasks, user_id, label="All Tasks")
-        embed = view.create_embed()
-        try:
-            new_message = await channel.send(embed=embed, view=view)
-            bot.task_message_refs[user_id] = new_message
-        except Exception as e:
-            print(f"Error sending new task message for user {user_id}: {e}")
+
+async def update_task_channel():
+    await task_channel.flush()
 
 
 import discord
@@ -458,13 +3099,13 @@ class TaskPaginatedView(discord.ui.View):
 
     def create_embed(self) -> discord.Embed:
         task_id, task = self.tasks[self.current_page]
-        desc = task.get("description", "Untitled")
-        status = task.get("status", "Pending")
-        priority_raw = str(task.get("priority", "Normal")).lower()
-        priority_display = self.PRIORITY_EMOJIS.get(priority_raw,
-                                                    priority_raw.title())
-        color = self.PRIORITY_COLORS.get(priority_raw, discord.Color.blue())
-        importance = str(task.get("importance", "1")).title()
+        desc = task.description or "Untitled"
+        status = task.status
+        priority_display = self.PRIORITY_EMOJIS.get(task.priority.value,
+                                                    task.priority.label)
+        color = self.PRIORITY_COLORS.get(task.priority.value,
+                                         discord.Color.blue())
+        importance = str(task.importance)
 
         # Determine status icon
         icon_label = self.STATUS_ICONS.get(status, "❔") + f" {status}"
@@ -472,32 +3113,22 @@ class TaskPaginatedView(discord.ui.View):
         # Due date handling
         due_date_str = "No deadline"
         relative_due = None
-        due_date = None
-        if "due_date" in task and task["due_date"]:
-            try:
-                due_date = datetime.fromisoformat(task["due_date"])
-                due_date_str = due_date.strftime("%b %d, %Y %H:%M")
-                # Calculate relative due date
-                now = datetime.now(
-                    tz=due_date.tzinfo) if due_date.tzinfo else datetime.now()
-                diff = due_date - now
-                if diff.days >= 0:
-                    relative_due = f"Due in {diff.days} day{'s' if diff.days != 1 else ''}"
-                else:
-                    relative_due = f"Overdue by {-diff.days} day{'s' if diff.days != -1 else ''}"
-            except Exception:
-                pass
+        due_date = task.due
+        if due_date:
+            due_date_str = due_date.strftime("%b %d, %Y %H:%M")
+            # Calculate relative due date
+            diff = due_date - datetime.now(EST)
+            if diff.days >= 0:
+                relative_due = f"Due in {diff.days} day{'s' if diff.days != 1 else ''}"
+            else:
+                relative_due = f"Overdue by {-diff.days} day{'s' if diff.days != -1 else ''}"
 
         # User info
         user = None
         username = f"User ID {self.user_id}"
-        try:
-            # bot is a global variable; this assumes you have a global bot instance
-            user = bot.get_user(self.user_id)
-            if user:
-                username = user.name
-        except Exception:
-            pass
+        user = member_directory.get(self.user_id)
+        if user:
+            username = user.name
 
         embed = discord.Embed(title=f"Task #{task_id} — {icon_label}",
                               description=f"**{desc}**",
@@ -520,13 +3151,13 @@ class TaskPaginatedView(discord.ui.View):
                             inline=True)
 
         # Tags display (optional)
-        tags = task.get("tags", [])
+        tags = task.extra.get("tags", [])
         if tags:
             tags_str = " ".join(f"`#{tag}`" for tag in tags)
             embed.add_field(name="Tags", value=tags_str, inline=False)
 
         # Progress bar (optional)
-        progress = task.get("progress", None)
+        progress = task.extra.get("progress", None)
         if progress is not None:
             try:
                 progress = int(progress)
@@ -649,61 +3280,237 @@ class BadgeCreationModal(discord.ui.Modal, title="Create New Badge"):
 
 # Add these helper functions
 def load_badges():
-    try:
-        with open(BADGES_FILE, "r") as f:
-            return json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError):
-        return {}
+    return storage.load("badges")
 
 def save_badges(badges):
-    with open(BADGES_FILE, "w") as f:
-        json.dump(badges, f, indent=4)
+    storage.replace("badges", badges)
+    badge_engine.compile(badges)
 
 def load_work_sessions():
-    try:
-        with open(WORK_SESSIONS_FILE, "r") as f:
-            return json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError):
-        return {}
+    return storage.load("work_sessions")
 
 def save_work_sessions(sessions):
-    with open(WORK_SESSIONS_FILE, "w") as f:
-        json.dump(sessions, f, indent=4)
+    storage.replace("work_sessions", sessions)
 
 def load_user_badges():
-    try:
-        with open("user_badges.json", "r") as f:
-            return json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError):
-        return {}
+    return storage.load("user_badges")
 
 def save_user_badges(user_badges):
-    with open("user_badges.json", "w") as f:
-        json.dump(user_badges, f, indent=4)
+    storage.replace("user_badges", user_badges)
 
 def award_badge(user_id: int, badge_id: str):
-    badges = load_badges()
-    user_badges = load_user_badges()
-    
-    if badge_id not in badges:
+    badge = storage.get("badges", (badge_id, ))
+    if badge is None:
         return False
-    
-    if str(user_id) not in user_badges:
-        user_badges[str(user_id)] = []
-    
-    if badge_id not in user_badges[str(user_id)]:
-        user_badges[str(user_id)].append(badge_id)
-        save_user_badges(user_badges)
+
+    owned = storage.get("user_badges", (user_id, ), [])
+    if badge_id not in owned:
+        owned.append(badge_id)
+        storage.put("user_badges", (user_id, ), owned)
+        badge_engine.owned.setdefault(str(user_id), set()).add(badge_id)
         
         # Award points if badge has them
-        if badges[badge_id].get("points", 0) > 0:
+        if badge.get("points", 0) > 0:
             award_points(str(user_id), f"badge_{badge_id}", 
-                         badges[badge_id]["points"],
-                         f"Earned badge: {badges[badge_id]['name']}")
+                         badge["points"],
+                         f"Earned badge: {badge['name']}")
         
         return True
     return False
 
+
+# ========== Badge Rules ==========
+BADGE_METRICS = {
+    # metric: (event that can change it, what it counts)
+    "session_minutes": ("session", "minutes in one work session"),
+    "sessions": ("session", "work sessions completed"),
+    "streak": ("log", "days logged in a row"),
+    "tasks_completed": ("task", "tasks completed"),
+    "points": ("points", "points in total"),
+}
+
+
+def parse_criteria(text: str) -> Optional[Dict]:
+    """``"sessions 5"`` -> criteria dict; ``"skip"`` or nothing -> None."""
+    parts = text.lower().split()
+    if not parts or parts == ["skip"]:
+        return None
+    if (len(parts) != 2 or parts[0] not in BADGE_METRICS
+            or not parts[1].isdigit() or int(parts[1]) < 1):
+        raise ValueError("Use `<metric> <number>` with a metric from: " +
+                         ", ".join(BADGE_METRICS))
+    return {"metric": parts[0], "at_least": int(parts[1])}
+
+
+def describe_criteria(criteria: Dict) -> str:
+    return f"{criteria['at_least']}+ {BADGE_METRICS[criteria['metric']][1]}"
+
+
+class BadgeEngine:
+    """Awards badges automatically as their ``criteria`` are met.
+
+    A badge's criteria name one of BADGE_METRICS and a threshold
+    (``{"metric": "sessions", "at_least": 5}``). ``compile`` groups the
+    rules by the event that can move their metric and keeps each
+    metric's thresholds sorted, so an event reads one value per metric
+    it touches and walks only the rules whose threshold that value has
+    reached. Values come from the event (session length), the per-user
+    ``badge_counters`` row (sessions, tasks completed), the progress
+    tracker (streak) or the score ledger (points).
+    """
+
+    def __init__(self, registry: TaskRegistry, logs: LogCache,
+                 ledger: ScoreLedger, progress: ProgressTracker,
+                 store: Storage):
+        self.ledger = ledger
+        self.progress = progress
+        self.store = store
+        self.loaded = False
+        self.badges: Dict[str, Dict] = {}
+        # event -> metric -> (sorted thresholds, badge ids in the same order)
+        self.rules: Dict[str, Dict[str, Tuple[List[int], List[str]]]] = {}
+        self.owned: Dict[str, Set[str]] = {}
+        registry.badges = self
+        logs.badges = self
+        ledger.badges = self
+
+    @staticmethod
+    def blank() -> Dict[str, int]:
+        return {"sessions": 0, "tasks_completed": 0}
+
+    def load(self):
+        self.owned = {
+            user_id: set(badge_ids)
+            for user_id, badge_ids in self.store.load("user_badges").items()
+        }
+        self.compile(self.store.load("badges"))
+        self.loaded = True
+
+    def _loaded(self):
+        if not self.loaded:
+            self.load()
+
+    def compile(self, badges: Dict[str, Dict]):
+        self.badges = badges
+        grouped: Dict[str, Dict[str, List[Tuple[int, str]]]] = {}
+        for badge_id, badge in badges.items():
+            criteria = badge.get("criteria")
+            if not criteria or criteria.get("metric") not in BADGE_METRICS:
+                continue
+            event = BADGE_METRICS[criteria["metric"]][0]
+            grouped.setdefault(event, {}).setdefault(
+                criteria["metric"], []).append(
+                    (int(criteria["at_least"]), badge_id))
+        self.rules = {
+            event: {
+                metric: ([t for t, _ in sorted(rules)],
+                         [b for _, b in sorted(rules)])
+                for metric, rules in metrics.items()
+            }
+            for event, metrics in grouped.items()
+        }
+
+    def counters(self, user_id) -> Dict[str, int]:
+        return self.store.get("badge_counters", (str(user_id), ),
+                              self.blank())
+
+    def _count(self, user_id, counter: str):
+        counters = self.counters(user_id)
+        counters[counter] += 1
+        self.store.put("badge_counters", (str(user_id), ), counters)
+
+    def value(self, metric: str, user_id: str, payload: Dict) -> int:
+        if metric == "session_minutes":
+            return payload.get("minutes", 0)
+        if metric == "streak":
+            return self.progress.streak(user_id)
+        if metric == "points":
+            return self.ledger.total(user_id)
+        return self.counters(user_id)[metric]
+
+    def event(self, kind: str, user_id, notify: bool = True,
+              **payload) -> List[str]:
+        """Record an event and award what it earns; returns new badge ids.
+
+        ``kind`` is "log", "task", "session" (with ``minutes``) or
+        "points". Unless ``notify`` is False the member gets a DM.
+        """
+        self._loaded()
+        user_id = str(user_id)
+        if kind == "session":
+            self._count(user_id, "sessions")
+        elif kind == "task":
+            self._count(user_id, "tasks_completed")
+
+        earned = []
+        for metric, (thresholds, badge_ids) in self.rules.get(kind,
+                                                              {}).items():
+            reached = bisect.bisect_right(thresholds,
+                                          self.value(metric, user_id, payload))
+            for badge_id in badge_ids[:reached]:
+                if (badge_id not in self.owned.get(user_id, ())
+                        and award_badge(user_id, badge_id)):
+                    earned.append(badge_id)
+        if earned and notify:
+            self.notify(user_id, earned)
+        return earned
+
+    async def backfill(self, badge_id: str,
+                       dry_run: bool = False) -> List[Tuple[str, int]]:
+        """Grant a criteria badge to everyone whose history already meets it.
+
+        History is scanned by badge_scan.py in a child process (so the
+        bot's own setup is not re-run there) after queued writes are
+        flushed; all grants (and their badge points) are then written in
+        one transaction, and each member granted it gets the usual DM.
+        Returns (user id, value) for each member who qualifies and does
+        not own the badge yet, highest value first. With ``dry_run``
+        nothing is written or sent.
+        """
+        self._loaded()
+        criteria = self.badges[badge_id]["criteria"]
+        await asyncio.to_thread(persistence.flush)
+        scan = await asyncio.create_subprocess_exec(
+            sys.executable, badge_scan.__file__,
+            os.path.abspath(self.store.path), criteria["metric"],
+            stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE)
+        output, errors = await scan.communicate()
+        if scan.returncode:
+            raise RuntimeError(
+                f"Badge scan failed: {errors.decode(errors='replace').strip()}")
+        values = json.loads(output)
+
+        qualified = sorted(
+            ((user_id, value) for user_id, value in values.items()
+             if value >= criteria["at_least"]
+             and badge_id not in self.owned.get(user_id, ())),
+            key=lambda item: (-item[1], item[0]))
+        if not dry_run and qualified:
+            granted = []
+            with self.store.transaction():
+                for user_id, _ in qualified:
+                    if award_badge(user_id, badge_id):
+                        granted.append(user_id)
+            for user_id in granted:
+                self.notify(user_id, [badge_id])
+        return qualified
+
+    def notify(self, user_id: str, badge_ids: List[str]):
+        user = bot.get_user(int(user_id))
+        if user is None:
+            return
+        names = ", ".join(f"**{self.badges[badge_id]['name']}**"
+                          for badge_id in badge_ids)
+        outbox.send(user,
+                    embed=create_success_embed("🏆 New Badge Earned!",
+                                               f"You earned {names}!"),
+                    lane=Lane.BULK)
+
+
+badge_engine = BadgeEngine(task_registry, log_cache, score_ledger,
+                           progress_tracker, storage)
+
+
 @bot.command(name="createbadge", help="Create a new badge")
 @is_admin()  # Your admin check here
 async def createbadge(ctx):
@@ -736,6 +3543,20 @@ async def createbadge(ctx):
         points_msg = await bot.wait_for("message", timeout=60, check=check)
         points = int(points_msg.content.strip()) if points_msg.content.strip().isdigit() else 0
 
+        # Ask for an automatic award rule
+        await ctx.send(
+            "📏 Award it automatically? Type `<metric> <number>` "
+            "(e.g. `sessions 5`) or `skip`.\nMetrics: " +
+            ", ".join(f"`{metric}` ({description})"
+                      for metric, (_, description) in BADGE_METRICS.items()))
+        while True:
+            criteria_msg = await bot.wait_for("message", timeout=60, check=check)
+            try:
+                criteria = parse_criteria(criteria_msg.content)
+                break
+            except ValueError as e:
+                await ctx.send(f"❌ {e}")
+
         # Build the badge embed
         embed = discord.Embed(
             title="🛡️ New Badge Created",
@@ -750,6 +3571,10 @@ async def createbadge(ctx):
                 embed.add_field(name="Emoji", value=image_url, inline=True)
         if points > 0:
             embed.add_field(name="Points", value=str(points), inline=True)
+        if criteria:
+            embed.add_field(name="Awarded For",
+                            value=describe_criteria(criteria),
+                            inline=True)
 
         await ctx.send(embed=embed)
 
@@ -761,10 +3586,15 @@ async def createbadge(ctx):
             "description": description,
             "image": image_url,
             "points": points,
+            "criteria": criteria,
             "created_by": ctx.author.id,
             "created_at": datetime.now(EST).isoformat()
         }
         save_badges(badges)
+        if criteria:
+            await ctx.send(
+                f"ℹ️ Members who already qualify don't get it automatically. "
+                f"Use `!backfillbadge {badge_id} dryrun` to see who does.")
 
     except asyncio.TimeoutError:
         await ctx.send("⏰ You took too long. Please try again.")
@@ -800,6 +3630,48 @@ async def give_badge(ctx, member: discord.Member, badge_id: str):
     else:
         await ctx.send("❌ User already has this badge.")
 
+@bot.command(name="backfillbadge",
+             help="Grant a criteria badge to everyone who already qualifies (Admin only)")
+@is_admin()
+async def backfill_badge(ctx, badge_id: str, mode: str = None):
+    badge = badge_engine.badges.get(badge_id) or storage.get(
+        "badges", (badge_id, ))
+    if badge is None:
+        return await ctx.send("❌ Badge ID not found.")
+    if not badge.get("criteria"):
+        return await ctx.send(
+            "❌ That badge has no criteria; award it with `!givebadge`.")
+    dry_run = (mode or "").lower() in ("dry", "dryrun", "dry-run")
+
+    async with ctx.typing():
+        started = perf_counter()
+        qualified = await badge_engine.backfill(badge_id, dry_run=dry_run)
+        elapsed = perf_counter() - started
+
+    title = (f"🔍 Dry Run: {badge['name']}" if dry_run else
+             f"🏆 Backfilled: {badge['name']}")
+    verb = "would receive" if dry_run else "received"
+    embed = discord.Embed(
+        title=title,
+        description=(f"Criteria: {describe_criteria(badge['criteria'])}\n"
+                     f"**{len(qualified)}** member"
+                     f"{'s' if len(qualified) != 1 else ''} {verb} it."),
+        color=COLORS["info"] if dry_run else COLORS["success"])
+    if qualified:
+        lines = [f"<@{user_id}> — {value}" for user_id, value in qualified[:25]]
+        if len(qualified) > 25:
+            lines.append(f"...and {len(qualified) - 25} more")
+        embed.add_field(name="Members", value="\n".join(lines)[:1024],
+                        inline=False)
+    if badge.get("points", 0) > 0 and qualified:
+        embed.add_field(name="Points Each", value=str(badge["points"]),
+                        inline=True)
+    embed.set_footer(text=f"Scanned history in {elapsed:.1f}s")
+    await ctx.send(embed=embed)
+    if not dry_run and qualified and badge.get("points", 0) > 0:
+        await update_leaderboard_channel()
+
+
 @bot.command(name="badges", help="List all available badges")
 async def list_badges(ctx):
     """List all badges in the system"""
@@ -817,6 +3689,8 @@ async def list_badges(ctx):
         value = badge["description"]
         if badge.get("points", 0) > 0:
             value += f"\n🔹 Reward: {badge['points']} points"
+        if badge.get("criteria"):
+            value += f"\n🎯 Earned for: {describe_criteria(badge['criteria'])}"
         embed.add_field(
             name=f"{badge_id}. {badge['name']}",
             value=value,
@@ -828,18 +3702,16 @@ async def list_badges(ctx):
 @bot.command(name="startwork", help="Start a work session to earn points")
 async def start_work(ctx):
     """Start tracking a work session"""
-    sessions = load_work_sessions()
     user_id = str(ctx.author.id)
     
-    if user_id in sessions and "start_time" in sessions[user_id]:
+    if "start_time" in storage.get("work_sessions", (user_id, ), {}):
         return await ctx.send("❌ You already have an active work session!")
     
-    sessions[user_id] = {
+    storage.put("work_sessions", (user_id, ), {
         "start_time": datetime.now(EST).isoformat(),
         "proof_message_id": ctx.message.id,
         "proof_channel_id": ctx.channel.id
-    }
-    save_work_sessions(sessions)
+    })
     
     embed = discord.Embed(
         title="⏱️ Work Session Started",
@@ -884,6 +3756,7 @@ async def end_work(ctx, proof: Optional[str] = None):
     # Award points
     session_id = f"work_{start_time.strftime('%Y%m%d_%H%M%S')}"
     award_points(user_id, session_id, points, f"Work session: {minutes} minutes")
+    rollups.add(user_id, end_time.date().isoformat(), minutes=minutes)
     
     # Save session details
     sessions[user_id]["end_time"] = end_time.isoformat()
@@ -893,23 +3766,11 @@ async def end_work(ctx, proof: Optional[str] = None):
     save_work_sessions(sessions)
     
     # Check for badge eligibility
-    badges_earned = []
-    badges = load_badges()
-    
-    # Check for marathon badge (long session)
-    if minutes >= 120:  # 2+ hour session
-        for badge_id, badge in badges.items():
-            if "marathon" in badge["name"].lower():
-                if award_badge(ctx.author.id, badge_id):
-                    badges_earned.append(badge["name"])
-    
-    # Check for frequent worker badge (multiple sessions)
-    user_sessions = [s for s in sessions.values() if s.get("user_id") == user_id]
-    if len(user_sessions) >= 5:  # 5+ sessions
-        for badge_id, badge in badges.items():
-            if "dedicated" in badge["name"].lower():
-                if award_badge(ctx.author.id, badge_id):
-                    badges_earned.append(badge["name"])
+    badges_earned = [
+        badge_engine.badges[badge_id]["name"]
+        for badge_id in badge_engine.event("session", user_id, notify=False,
+                                           minutes=minutes)
+    ]
     
     # Prepare response
     embed = discord.Embed(
@@ -940,7 +3801,7 @@ class BadgeListView(View):
     def __init__(self, user_id):
         super().__init__(timeout=60)
         self.user_id = user_id
-        self.badges = load_user_badges().get(str(user_id), [])
+        self.badges = storage.get("user_badges", (user_id, ), [])
         self.all_badges = load_badges()
 
         if len(self.badges) > 0:
@@ -953,9 +3814,8 @@ async def user_profile(ctx, member: discord.Member = None):
     if member != ctx.author and ctx.author.id != ADMIN_ID:
         return await ctx.send(embed=create_error_embed("Permission Denied", "You can only view your own profile unless you're an admin"))
 
-    logs = load_logs()
-    user_logs = logs.get(str(member.id), {})
-    user_badges = load_user_badges().get(str(member.id), [])
+    week = rollups.totals(member.id, *this_week())
+    user_badges = storage.get("user_badges", (member.id, ), [])
     badges = load_badges()
 
     embed = discord.Embed(
@@ -968,12 +3828,12 @@ async def user_profile(ctx, member: discord.Member = None):
         embed.set_thumbnail(url=member.avatar.url)
 
     embed.add_field(name="Member Since", value=member.joined_at.strftime("%B %d, %Y"), inline=True)
-    embed.add_field(name="Log Entries", value=f"{len(user_logs)} this week", inline=True)
+    embed.add_field(name="Log Entries", value=f"{week['entries']} this week", inline=True)
 
-    assigned_tasks = len(bot.task_assignments.get(member.id, {}))
+    member_tasks = task_registry.assigned(member.id)
+    assigned_tasks = len(member_tasks)
     completed_tasks = sum(
-        1 for task in bot.task_assignments.get(member.id, {}).values()
-        if task.get("status") == "Completed"
+        1 for task in member_tasks.values() if task.completed
     )
     embed.add_field(
         name="Tasks",
@@ -981,6 +3841,22 @@ async def user_profile(ctx, member: discord.Member = None):
         inline=True
     )
 
+    progress = progress_tracker.record(member.id)
+    embed.add_field(
+        name="🔥 Streak",
+        value=(f"Current: {progress_tracker.streak(member.id)} days\n"
+               f"Best: {progress['best_streak']} days"),
+        inline=True
+    )
+    embed.add_field(
+        name="Weekly Challenges",
+        value="\n".join(
+            f"{'✅' if name in progress['rewarded'] else '▫️'} {challenge['desc']}: "
+            f"{progress_tracker.progress(member.id, name)}/{challenge['goal']}"
+            for name, challenge in weekly_challenges.items()),
+        inline=False
+    )
+
     if user_badges:
         badge_list = []
         for badge_id in user_badges[:5]:
@@ -1017,7 +3893,7 @@ async def user_profile(ctx, member: discord.Member = None):
 async def on_interaction(interaction: discord.Interaction):
     if interaction.data.get("custom_id", "").startswith("view_badges_"):
         user_id = interaction.data["custom_id"].split("_")[-1]
-        user_badges = load_user_badges().get(user_id, [])
+        user_badges = storage.get("user_badges", (user_id, ), [])
         all_badges = load_badges()
 
         if not user_badges:
@@ -1025,7 +3901,7 @@ async def on_interaction(interaction: discord.Interaction):
             return
 
         pages = []
-        user = await bot.fetch_user(int(user_id))
+        user = await member_directory.resolve(user_id)
         for badge_id in user_badges:
             if badge_id in all_badges:
                 badge = all_badges[badge_id]
@@ -1188,10 +4064,7 @@ class TaskCreationModal(discord.ui.Modal, title="Create New Task"):
             priority_part = priority_importance_str
             importance_part = "3"  # default importance
 
-        priority = priority_part.strip().lower()
-        valid_priorities = ["very low", "low", "normal", "high", "very high"]
-        if priority not in valid_priorities:
-            priority = "normal"
+        priority = Priority.parse(priority_part)
 
         try:
             importance = int(importance_part.strip())
@@ -1216,21 +4089,14 @@ class TaskCreationModal(discord.ui.Modal, title="Create New Task"):
                     ephemeral=True)
                 return
 
-        bot.task_counter += 1
-        task_id = bot.task_counter
-        task_info = {
-            "name": name,
-            "description": description,
-            "due_date": due_datetime.isoformat() if due_datetime else None,
-            "priority": priority,
-            "importance": importance,  # stored separately
-            "points": points,
-            "created_at": datetime.now(EST).isoformat(),
-            "status": "Pending"
-        }
+        task_info = Task(name=name,
+                         description=description,
+                         due=due_datetime,
+                         priority=priority,
+                         importance=importance,
+                         points=points)
 
-        bot.user_tasks_created.setdefault(interaction.user.id,
-                                          {})[task_id] = task_info
+        task_id = task_registry.create(interaction.user.id, task_info)
 
         embed = discord.Embed(title=f"📝 Task #{task_id} Added",
                               color=COLORS["success"])
@@ -1240,7 +4106,7 @@ class TaskCreationModal(discord.ui.Modal, title="Create New Task"):
                         value=due_datetime.strftime("%Y-%m-%d %H:%M")
                         if due_datetime else "Not specified",
                         inline=True)
-        embed.add_field(name="Priority", value=priority.title(), inline=True)
+        embed.add_field(name="Priority", value=priority.label, inline=True)
         embed.add_field(name="Importance", value=str(importance), inline=True)
         embed.add_field(name="Points", value=str(points), inline=True)
         embed.set_footer(text=f"Created by {interaction.user.display_name}")
@@ -1293,14 +4159,25 @@ class LogsPaginatedView(discord.ui.View):
 
 class LeaderboardView(discord.ui.View):
 
-    def __init__(self, leaderboard_data: List[tuple]):
+    def __init__(self, page: int = 0, window: str = "all"):
         super().__init__(timeout=None)
-        self.leaderboard_data = leaderboard_data  # (rank, user_id, total, tasks)
-        self.current_page = 0
+        # Pages are read straight from the ranking, one user per page
+        self.window = window
+        self.current_page = page
+        # One set of persistent ids per window; "all" keeps the original ids
+        prefix = "leaderboard" if window == "all" else f"leaderboard:{window}"
+        self.previous_page.custom_id = f"{prefix}:prev"
+        self.next_page.custom_id = f"{prefix}:next"
+
+    @property
+    def ranking(self) -> RankIndex:
+        # Looked up on every use: rolling a window replaces its ranking
+        return score_ledger.leaderboard(self.window)
 
     @classmethod
     async def create_persistent_views(cls):
-        bot.add_view(cls([]))  # empty dict instead of list
+        for window in ("all", *POINT_WINDOWS):
+            bot.add_view(cls(window=window))
 
     @discord.ui.button(label="◄",
                        style=discord.ButtonStyle.secondary,
@@ -1319,7 +4196,7 @@ class LeaderboardView(discord.ui.View):
                        custom_id="leaderboard:next")
     async def next_page(self, interaction: discord.Interaction,
                         button: discord.ui.Button):
-        if self.current_page < len(self.leaderboard_data) - 1:
+        if self.current_page < len(self.ranking) - 1:
             self.current_page += 1
             await interaction.response.edit_message(embed=self.create_embed(),
                                                     view=self)
@@ -1327,13 +4204,24 @@ class LeaderboardView(discord.ui.View):
             await interaction.response.defer()
 
     def create_embed(self) -> discord.Embed:
-        rank, user_id, total, tasks = self.leaderboard_data[self.current_page]
-        user = bot.get_user(user_id)
+        self.current_page = min(self.current_page, max(len(self.ranking) - 1, 0))
+        title = "🏆 Leaderboard"
+        if self.window != "all":
+            title += f" ({score_ledger.window(self.window).label})"
+        page = self.ranking.page(self.current_page, 1)
+        if not page:
+            return discord.Embed(title=title,
+                                 description="No scores yet!",
+                                 color=COLORS["highlight"])
+        rank, user_id, total = page[0]
+        user = member_directory.get(user_id)
         display_name = user.display_name if user else f"User {user_id}"
-        avatar_url = user.display_avatar.url if user else discord.Embed.Empty
+        avatar_url = user.display_avatar.url if user else None
 
-        embed = discord.Embed(title=f"🏅 Leaderboard — Rank #{rank}",
-                              color=COLORS["highlight"])
+        title = f"🏅 Leaderboard — Rank #{rank}"
+        if self.window != "all":
+            title += f" ({score_ledger.window(self.window).label})"
+        embed = discord.Embed(title=title, color=COLORS["highlight"])
 
         embed.add_field(name="👤 User",
                         value=f"**{display_name}** (`{user_id}`)",
@@ -1342,18 +4230,29 @@ class LeaderboardView(discord.ui.View):
                         value=f"`{total}` pts",
                         inline=False)
 
-        if tasks:
-            task_lines = "\n".join(
-                f"• `{task.get('description', tid)}` — **{task['points']} pts**"
-                for tid, task in tasks.items())
-        else:
-            task_lines = "*No completed tasks yet.*"
+        if self.window == "all":
+            tasks = score_ledger.items(user_id)
+            if tasks:
+                task_lines = "\n".join(
+                    f"• `{task.get('description', tid)}` — **{task['points']} pts**"
+                    for tid, task in tasks.items())
+            else:
+                task_lines = "*No completed tasks yet.*"
 
-        embed.add_field(name="📋 Completed Tasks",
-                        value=task_lines,
-                        inline=False)
+            embed.add_field(name="📋 Completed Tasks",
+                            value=task_lines,
+                            inline=False)
+        else:
+            window = score_ledger.window(self.window)
+            days = score_ledger.daily(user_id, window.first,
+                                      datetime.now(EST).date())
+            embed.add_field(name="📅 Points by Day",
+                            value="\n".join(
+                                f"• {day.strftime('%a %b %d')} — **{points} pts**"
+                                for day, points in days) or "*No points yet.*",
+                            inline=False)
         embed.set_footer(
-            text=f"Page {self.current_page + 1} / {len(self.leaderboard_data)}"
+            text=f"Page {self.current_page + 1} / {len(self.ranking)}"
         )
         if avatar_url:
             embed.set_thumbnail(url=avatar_url)
@@ -1379,7 +4278,7 @@ class HealthLogsView(discord.ui.View):
             item.disabled = True
 
     def create_embed(self) -> discord.Embed:
-        member = bot.get_user(self.user_id)
+        member = member_directory.get(self.user_id)
         embed = discord.Embed(
             title=
             f"📊 Work Logs for {member.display_name if member else 'Unknown User'}",
@@ -1397,12 +4296,7 @@ class HealthLogsView(discord.ui.View):
             embed.description = f"📅 **{formatted_date}**\n"
 
             for entry in entries:
-                if isinstance(entry, dict):
-                    log_text = entry.get("log", "")
-                    timestamp = entry.get("timestamp", "")
-                    embed.description += f"\n```\n{log_text}\n```\n"
-                else:
-                    embed.description += f"\n```\n{entry}\n```\n"
+                embed.description += f"\n```\n{entry['log']}\n```\n"
 
         footer_date = date_obj.strftime('%m/%d/%Y')
         now = datetime.now().strftime('%I:%M %p')
@@ -1513,29 +4407,7 @@ class LogModal(discord.ui.Modal, title="Log Your Work"):
         log_entry = self.clean_input(self.children[0].value)
         user_id = str(interaction.user.id)
 
-        logs = load_logs()
-
-        if user_id not in logs:
-            logs[user_id] = {}
-
-        if today not in logs[user_id]:
-            logs[user_id][today] = []
-
-        # Normalize if old data
-        if isinstance(logs[user_id][today], str):
-            logs[user_id][today] = [{
-                "timestamp": "converted",
-                "log": logs[user_id][today]
-            }]
-        elif isinstance(logs[user_id][today], dict):
-            logs[user_id][today] = [logs[user_id][today]]
-
-        logs[user_id][today].append({
-            "timestamp": datetime.now(EST).isoformat(),
-            "log": log_entry
-        })
-
-        save_logs(logs)
+        append_log_entry(user_id, today, log_entry)
 
         await interaction.response.send_message(embed=discord.Embed(
             title="✅ Log Saved",
@@ -1566,13 +4438,12 @@ class HelpView(discord.ui.View):
 
 
 # ========== Helper functions ==========
-def format_task(task: Dict[str, Any], task_id: int) -> str:
-    desc = task.get("description", "No description")
-    due = task.get("due_date", None)
-    due_str = f" | Due: {due}" if due else ""
-    priority = task.get("priority", "Normal")
-    status = task.get("status", "Pending")
-    assigned_by = task.get("assigned_by_name", "Unknown")
+def format_task(task: Task, task_id: int) -> str:
+    desc = task.description or "No description"
+    due_str = f" | Due: {task.due.strftime('%Y-%m-%d %H:%M')}" if task.due else ""
+    priority = task.priority.label
+    status = task.status
+    assigned_by = task.extra.get("assigned_by_name", "Unknown")
     return f"ID: {task_id} | {desc} | Priority: {priority} | Status: {status}{due_str} | Assigned by: {assigned_by}"
 
 
@@ -1613,72 +4484,107 @@ def create_info_embed(title: str, description: str) -> discord.Embed:
                          color=COLORS["primary"])
 
 
-async def update_leaderboard_channel():
-    leaderboard_channel_id = 1376588983059873933  # Replace with your actual channel ID
-    channel = bot.get_channel(leaderboard_channel_id)
+class LeaderboardPublisher:
+    """Keeps one pinned leaderboard message current, at most once per window.
 
-    if channel is None:
-        print(
-            f"❌ Could not find leaderboard channel with ID {leaderboard_channel_id}"
-        )
-        return
+    ``request`` only schedules a refresh: the first request in a quiet
+    period starts a ``window``-second timer and later requests ride along,
+    so a burst of score changes becomes a single edit; a request made
+    while a refresh is already sending starts the next timer. The refresh
+    edits the pinned message in place (sending and pinning a new one only
+    if it is gone) and posts a congratulations message only when the set of
+    rank-1 users differs from the last one congratulated. The message ids
+    and that set survive restarts in the ``meta`` table.
+    """
 
-    # 🧹 Clear existing leaderboard messages
-    async for msg in channel.history(limit=10):
-        if msg.author == bot.user and (msg.embeds
-                                       or "Congratulations" in msg.content):
-            await msg.delete()
+    META_KEY = "leaderboard_message"
 
-    # 📥 Load scores
-    try:
-        with open("scores.json", "r") as f:
-            scores = json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError):
-        scores = {}
-
-    # 📊 Prepare leaderboard data with total scores
-    leaderboard_data = []
-    for user_id, tasks in scores.items():
-        total = sum(task.get("points", 0) for task in tasks.values())
-        leaderboard_data.append((int(user_id), total, tasks))
-
-    if not leaderboard_data:
-        embed = discord.Embed(title="🏆 Leaderboard",
-                              description="No scores yet!",
-                              color=COLORS["highlight"])
-        await channel.send(embed=embed)
-        return
+    def __init__(self, store: Storage, window: float):
+        self.store = store
+        self.window = window
+        self.pending: Optional[asyncio.Task] = None
+        self.lock = asyncio.Lock()
+        self.refreshes = 0
 
-    # 🔽 Sort and assign ranks with tie handling
-    leaderboard_data.sort(key=lambda x: x[1], reverse=True)
-
-    ranked_leaderboard = []
-    last_score = None
-    rank = 0
-    skip = 1
-    for i, (user_id, total, tasks) in enumerate(leaderboard_data):
-        if total != last_score:
-            rank += skip
-            skip = 1
-        else:
-            skip += 1
-        last_score = total
-        ranked_leaderboard.append((rank, user_id, total, tasks))
+    def state(self) -> Dict:
+        return self.store.get("meta", (self.META_KEY, ), {})
+
+    def request(self):
+        if self.pending is None or self.pending.done():
+            self.pending = asyncio.create_task(self._refresh_later())
+
+    async def _refresh_later(self):
+        await asyncio.sleep(self.window)
+        # From here on the refresh may miss newer changes, so let the next
+        # request schedule another one
+        self.pending = None
+        try:
+            await self.refresh()
+        except discord.HTTPException as e:
+            print(f"❌ Leaderboard refresh failed: {e}")
+
+    async def refresh(self):
+        channel = bot.get_channel(LEADERBOARD_CHANNEL_ID)
+        if channel is None:
+            print(
+                f"❌ Could not find leaderboard channel with ID {LEADERBOARD_CHANNEL_ID}"
+            )
+            return
+
+        async with self.lock:
+            self.refreshes += 1
+            state = dict(self.state())
+            ranking = score_ledger.leaderboard()
+            if len(ranking):
+                view = LeaderboardView()
+                embed = view.create_embed()
+            else:
+                view = None
+                embed = discord.Embed(title="🏆 Leaderboard",
+                                      description="No scores yet!",
+                                      color=COLORS["highlight"])
+
+            message_id = state.get("message_id")
+            if message_id:
+                try:
+                    await outbox.edit(channel.get_partial_message(message_id),
+                                      embed=embed,
+                                      view=view)
+                except discord.NotFound:
+                    message_id = None  # Deleted or unpinned by hand
+            if not message_id:
+                message = await outbox.send(channel, embed=embed, view=view)
+                message_id = message.id
+                outbox.submit(outbox.route_for(channel), message.pin,
+                              description=f"pin message {message_id}")
+            state["message_id"] = message_id
+
+            # 🎉 Congratulate all Top 1 users, once per change of leaders
+            leaders = sorted(ranking.leaders())
+            if leaders and leaders != state.get("leaders"):
+                if state.get("congrats_id"):
+                    outbox.delete(
+                        channel.get_partial_message(state["congrats_id"]))
+                users = await member_directory.resolve_many(leaders)
+                mentions = [
+                    f"**{user.display_name if user else f'User {uid}'}**"
+                    for uid, user in users.items()
+                ]
+                congrats = await outbox.send(
+                    channel,
+                    f"🎉 Congratulations to {', '.join(mentions)} for being **Top 1** on the leaderboard!"
+                )
+                state["congrats_id"] = congrats.id
+            state["leaders"] = leaders
+            self.store.put("meta", (self.META_KEY, ), state)
 
-    # 📤 Create and send paginated leaderboard view
-    view = LeaderboardView(ranked_leaderboard)
-    embed = view.create_embed()
-    await channel.send(embed=embed, view=view)
-
-    # 🎉 Congratulate all Top 1 users
-    top1_users = [uid for r, uid, _, _ in ranked_leaderboard if r == 1]
-    mentions = []
-    for uid in top1_users:
-        user = await bot.fetch_user(uid)
-        mentions.append(f"**{user.display_name}**")
-    await channel.send(
-        f"🎉 Congratulations to {', '.join(mentions)} for being **Top 1** on the leaderboard!"
-    )
+
+leaderboard_publisher = LeaderboardPublisher(storage,
+                                             LEADERBOARD_DEBOUNCE_SECONDS)
+
+
+async def update_leaderboard_channel():
+    leaderboard_publisher.request()
 
 
 # 3. Update LogModal to award points
@@ -1698,29 +4604,7 @@ class LogModal(discord.ui.Modal, title="Log Your Work"):
         log_entry = self.children[0].value
         user_id = str(interaction.user.id)
 
-        logs = load_logs()
-
-        if user_id not in logs:
-            logs[user_id] = {}
-
-        if today not in logs[user_id]:
-            logs[user_id][today] = []
-
-        # Normalize if old data
-        if isinstance(logs[user_id][today], str):
-            logs[user_id][today] = [{
-                "timestamp": "converted",
-                "log": logs[user_id][today]
-            }]
-        elif isinstance(logs[user_id][today], dict):
-            logs[user_id][today] = [logs[user_id][today]]
-
-        logs[user_id][today].append({
-            "timestamp": datetime.now(EST).isoformat(),
-            "log": log_entry
-        })
-
-        save_logs(logs)
+        append_log_entry(user_id, today, log_entry)
 
         # Award 2 points for daily logging
         award_points(user_id, f"daily_log_{today}", 2,
@@ -1736,160 +4620,447 @@ class LogModal(discord.ui.Modal, title="Log Your Work"):
                                                 ephemeral=True)
 
 
-# ========== Scheduled Tasks ==========
-@tasks.loop(minutes=1)
-async def daily_log_reminder():
-    now_est = datetime.now(EST)
+# ========== Scheduler ==========
+class CronSpec:
+    """A five-field cron expression: minute hour day-of-month month weekday.
 
-    # Check if it's 6:00 PM EST
-    if now_est.hour == 14 and now_est.minute == 00:
-        channel = bot.get_channel(CHANNEL_ID)
-        if channel is None:
-            return
+    Fields accept ``*``, numbers, ``a-b`` ranges, ``,`` lists and ``/step``;
+    weekday 0 and 7 are Sunday. As in cron, when both day fields are
+    restricted a day matching either one fires. Times are wall-clock
+    US/Eastern: a time skipped by the spring DST change does not fire
+    that day, and a repeated one fires once.
+    """
+
+    FIELDS = (("minute", 0, 59), ("hour", 0, 23), ("day", 1, 31),
+              ("month", 1, 12), ("weekday", 0, 7))
+
+    def __init__(self, expression: str):
+        self.expression = expression
+        parts = expression.split()
+        if len(parts) != 5:
+            raise ValueError(f"Expected 5 cron fields in {expression!r}")
+        values = [self._parse(part, low, high)
+                  for part, (_, low, high) in zip(parts, self.FIELDS)]
+        self.minutes, self.hours, self.days, self.months, weekdays = values
+        self.weekdays = {day % 7 for day in weekdays}
+        self.any_day = parts[2] == "*"
+        self.any_weekday = parts[4] == "*"
+
+    @staticmethod
+    def _parse(field: str, low: int, high: int) -> Set[int]:
+        values = set()
+        for part in field.split(","):
+            part, _, step = part.partition("/")
+            if part == "*":
+                start, end = low, high
+            elif "-" in part:
+                start, end = (int(value) for value in part.split("-", 1))
+            else:
+                start = end = int(part)
+                if step:
+                    end = high
+            if not low <= start <= end <= high:
+                raise ValueError(f"{field!r} is outside {low}-{high}")
+            values.update(range(start, end + 1, int(step or 1)))
+        return values
+
+    def _day_matches(self, day) -> bool:
+        in_month = day.day in self.days
+        on_weekday = (day.weekday() + 1) % 7 in self.weekdays
+        if self.any_day or self.any_weekday:
+            return in_month and on_weekday
+        return in_month or on_weekday
+
+    def next_after(self, moment: datetime) -> datetime:
+        """The first fire time strictly after ``moment`` (aware, EST)."""
+        local = moment.astimezone(EST).replace(tzinfo=None)
+        candidate = local.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = candidate + timedelta(days=366 * 5)
+        while candidate < limit:
+            if candidate.month not in self.months:
+                year = candidate.year + candidate.month // 12
+                candidate = datetime(year, candidate.month % 12 + 1, 1)
+            elif not self._day_matches(candidate):
+                candidate = datetime.combine(candidate.date() + timedelta(days=1),
+                                             time(0, 0))
+            elif candidate.hour not in self.hours:
+                candidate = candidate.replace(minute=0) + timedelta(hours=1)
+            elif candidate.minute not in self.minutes:
+                candidate += timedelta(minutes=1)
+            else:
+                try:
+                    fire = EST.localize(candidate, is_dst=None)
+                except pytz.NonExistentTimeError:
+                    candidate += timedelta(minutes=1)
+                    continue
+                except pytz.AmbiguousTimeError:
+                    fire = EST.localize(candidate, is_dst=True)
+                if fire > moment:
+                    return fire
+                candidate += timedelta(minutes=1)
+        raise ValueError(f"{self.expression!r} never fires")
+
+
+class ScheduledJob:
+    __slots__ = ("name", "spec", "func", "catch_up", "paused_until",
+                 "next_run", "runner")
+
+    def __init__(self, name: str, spec: CronSpec, func: Callable,
+                 catch_up: Optional[timedelta]):
+        self.name = name
+        self.spec = spec
+        self.func = func
+        self.catch_up = catch_up
+        self.paused_until: Optional[datetime] = None
+        self.next_run: Optional[datetime] = None
+        self.runner: Optional[asyncio.Task] = None
+
+
+class Scheduler:
+    """Runs coroutines at cron times in US/Eastern.
+
+    Each job sleeps until its exact next fire time (waking at least
+    hourly to re-check the clock) and is called with that fire time. The
+    last fire time that ran is stored per job in the ``schedule`` table.
+    On start, a job that missed one or more fire times while the bot was
+    down runs once to catch up, unless the most recent missed time is
+    older than its ``catch_up`` window (None means always catch up).
+    """
 
-        today = str(now_est.date())
-        user_logs = load_logs()
-        guild = channel.guild
-        members = [m for m in guild.members if not m.bot]
+    MAX_SLEEP = 3600
 
-        slackers = [
-            m.mention for m in members
-            if str(m.id) not in user_logs or today not in user_logs[str(m.id)]
-        ]
+    def __init__(self, store: Storage):
+        self.store = store
+        self.jobs: Dict[str, ScheduledJob] = {}
 
-        if slackers:
-            embed = discord.Embed(
-                title="🔔 Daily Log Reminder",
-                description=
-                f"These users haven't logged yet: {', '.join(slackers)}",
-                color=COLORS["warning"])
-            embed.add_field(
-                name="How to Log",
-                value=
-                "Click the button below or use `!log` to log your work. And remember, who ever doesn't log, he's getting touched by me 😈",
-                inline=False)
-            embed.set_thumbnail(url="https://i.imgur.com/7W0MJXP.png")
-            await channel.send(embed=embed, view=LogButton())
-
-
-@tasks.loop(minutes=1)
-async def send_summary_to_admin():
-    await bot.wait_until_ready()
-    now_est = datetime.now(EST)
-    if now_est.time().hour == 0 and now_est.time().minute == 0:
-        logs = load_logs()
-        admin = bot.get_user(ADMIN_ID)
-        if admin is None:
-            return
+    def job(self, expression: str, catch_up: Optional[timedelta] = None):
+        """Decorator declaring ``func(fire_time)`` as a scheduled job."""
 
-        if not logs:
-            embed = discord.Embed(title="📊 Daily Summary",
-                                  description="No logs recorded today",
-                                  color=COLORS["info"])
-            await admin.send(embed=embed)
-            return
+        def decorator(func):
+            self.jobs[func.__name__] = ScheduledJob(func.__name__,
+                                                    CronSpec(expression), func,
+                                                    catch_up)
+            return func
+
+        return decorator
+
+    def last_run(self, name: str) -> Optional[datetime]:
+        value = self.store.get("schedule", (name, ))
+        return datetime.fromisoformat(value) if value else None
+
+    def start(self):
+        for job in self.jobs.values():
+            if job.runner is None or job.runner.done():
+                job.runner = asyncio.create_task(self._run(job))
+
+    def pause(self, name: str, until: datetime):
+        """Skip a job's fire times until ``until``."""
+        self.jobs[name].paused_until = until
+
+    async def _fire(self, job: ScheduledJob, fire_time: datetime):
+        if job.paused_until is None or fire_time >= job.paused_until:
+            try:
+                await job.func(fire_time)
+            except Exception as e:
+                print(f"❌ Scheduled job {job.name} failed: {e}")
+        self.store.put("schedule", (job.name, ), fire_time.isoformat())
+
+    async def _run(self, job: ScheduledJob):
+        now = datetime.now(EST)
+        last = self.last_run(job.name)
+        if last is None:
+            self.store.put("schedule", (job.name, ), now.isoformat())
+            last = now
+        missed = None
+        moment = job.spec.next_after(last)
+        while moment <= now:
+            missed, moment = moment, job.spec.next_after(moment)
+        if missed is not None and (job.catch_up is None
+                                   or now - missed <= job.catch_up):
+            print(f"⏰ Catching up {job.name} missed at {missed:%Y-%m-%d %H:%M}")
+            await self._fire(job, missed)
+
+        while True:
+            job.next_run = job.spec.next_after(max(now, last))
+            delay = (job.next_run - datetime.now(EST)).total_seconds()
+            if delay > 0:
+                await asyncio.sleep(min(delay, self.MAX_SLEEP))
+                now = datetime.now(EST)
+                if now < job.next_run:
+                    continue
+            await self._fire(job, job.next_run)
+            last = now = job.next_run
+
+    def upcoming(self) -> List[Tuple[datetime, str, str, Optional[datetime]]]:
+        """(next run, job name, cron expression, last run), soonest first."""
+        now = datetime.now(EST)
+        rows = [(job.next_run or job.spec.next_after(now), job.name,
+                 job.spec.expression, self.last_run(job.name))
+                for job in self.jobs.values()]
+        return sorted(rows, key=lambda row: row[0])
+
+
+scheduler = Scheduler(storage)
+
+
+# ========== Scheduled Tasks ==========
+@scheduler.job("0 14 * * *", catch_up=timedelta(hours=4))
+async def daily_log_reminder(fire_time: datetime):
+    channel = bot.get_channel(CHANNEL_ID)
+    if channel is None:
+        return
+
+    slackers = [
+        m.mention for m in activity_index.missing(channel.guild.members,
+                                                  str(fire_time.date()))
+    ]
+
+    if slackers:
+        embed = discord.Embed(
+            title="🔔 Daily Log Reminder",
+            description=
+            f"These users haven't logged yet: {', '.join(slackers)}",
+            color=COLORS["warning"])
+        embed.add_field(
+            name="How to Log",
+            value=
+            "Click the button below or use `!log` to log your work. And remember, who ever doesn't log, he's getting touched by me 😈",
+            inline=False)
+        embed.set_thumbnail(url="https://i.imgur.com/7W0MJXP.png")
+        outbox.send(channel, embed=embed, view=LogButton(), lane=Lane.BULK)
+
+
+@scheduler.job("0 0 * * *")
+async def send_summary_to_admin(fire_time: datetime):
+    # Runs at midnight, so it reports the day that just ended
+    day = (fire_time - timedelta(days=1)).date().isoformat()
+    logged = sorted(activity_index.users(day))
+    admins = [admin for admin in
+              (await member_directory.resolve_many(ADMIN_ID)).values() if admin]
+    if not admins:
+        return
 
-        for user_id, user_logs in logs.items():
-            user = bot.get_user(int(user_id))
+    if not logged:
+        embeds = [discord.Embed(title="📊 Daily Summary",
+                                description=f"No logs recorded on {day}",
+                                color=COLORS["info"])]
+    else:
+        embeds = []
+        users = await member_directory.resolve_many(logged)
+        for user_id in logged:
+            user = users.get(int(user_id))
             if not user:
                 continue
 
+            entries = log_cache.day(user_id, day)
+            if not entries:
+                continue
+
             embed = discord.Embed(title=f"📝 Daily Logs - {user.display_name}",
                                   color=COLORS["primary"],
-                                  timestamp=now_est)
-
-            today = datetime.now(EST).date().isoformat()
-            if today in user_logs:
-                entries = user_logs[today]
-                if isinstance(entries, str):
-                    entries = [{"log": entries}]
-                elif isinstance(entries, dict):
-                    entries = [entries]
-
-                log_text = ""
-                for entry in entries:
-                    if isinstance(entry, dict):
-                        timestamp = entry.get("timestamp", "")
-                        log = entry.get("log", "")
-                        log_text += f"**{timestamp}**\n{log}\n\n"
-                    else:
-                        log_text += f"{entry}\n\n"
-
-                if log_text:
-                    embed.add_field(name=f"📅 {today}",
-                                    value=log_text,
-                                    inline=False)
-
-                embed.set_footer(text="End of summary")
-                await admin.send(embed=embed)
-
-
-@tasks.loop(minutes=60)  # Runs every hour
-async def evening_ping_task():
-    now = datetime.now(EST)
-    current_time = now.time()
-    today = now.date()
+                                  timestamp=fire_time)
+            embed.add_field(name=f"📅 {day}",
+                            value="".join(
+                                f"**{entry['timestamp']}**\n{entry['log']}\n\n"
+                                for entry in entries),
+                            inline=False)
+            embed.set_footer(text="End of summary")
+            embeds.append(embed)
 
-    # Only run between 4 PM and 11:59 PM
-    if not (time(16, 0) <= current_time <= time(23, 59, 59)):
-        return
+    for admin in admins:
+        for embed in embeds:
+            outbox.send(admin, embed=embed, lane=Lane.BULK)
 
+
+@scheduler.job("0 16-23 * * *", catch_up=timedelta(minutes=30))
+async def evening_ping_task(fire_time: datetime):
     channel = bot.get_channel(CHANNEL_ID)
-    user_logs = load_logs()
-    members = [m for m in channel.guild.members if not m.bot]
+    if channel is None:
+        return
 
     slackers = [
-        m.mention for m in members
-        if str(m.id) not in user_logs or str(today) not in user_logs[str(m.id)]
+        m.mention for m in activity_index.missing(channel.guild.members,
+                                                  str(fire_time.date()))
     ]
 
     if slackers:
-        await channel.send(embed=discord.Embed(
-            title="⚠️ Reminder: Log Your Work",
-            description=
-            f"These users haven't logged today: {', '.join(slackers)}. Log in now or I'm coming to touch you'll.",
-            color=COLORS["warning"]))
+        outbox.send(channel,
+                    embed=discord.Embed(
+                        title="⚠️ Reminder: Log Your Work",
+                        description=
+                        f"These users haven't logged today: {', '.join(slackers)}. Log in now or I'm coming to touch you'll.",
+                        color=COLORS["warning"]),
+                    lane=Lane.BULK)
+
+
+class OverdueDigests:
+    """One DM per member listing all of their overdue tasks.
+
+    A member is sent a digest when their set of overdue task ids differs
+    from the one last sent, or when ``renag`` has passed since then. The
+    last digest per member (task ids and time sent) is kept in the
+    ``overdue_digests`` table and dropped once nothing is overdue, so
+    the next overdue task is reported straight away. Only the in-memory
+    task registry is read.
+
+    Like ReminderScheduler, open tasks due in the future wait in a
+    min-heap of due instants and the registry re-tracks a task whenever
+    it changes, so a run only pops the tasks that have come due since
+    the last one and walks the members' tasks already overdue.
+    """
+
+    EMBEDS_PER_MESSAGE = 10  # Discord's limit
+
+    def __init__(self, registry: TaskRegistry, store: Storage,
+                 renag: timedelta):
+        self.registry = registry
+        self.store = store
+        self.renag = renag
+        self.sent: Dict[int, Dict] = {}  # user id -> task_ids, sent_at
+        self.heap: List[Tuple[float, int, int, int]] = []
+        self.armed: Dict[Tuple[int, int], int] = {}
+        self.arm_seq = 0
+        self.due_now: Dict[int, Set[int]] = {}  # user id -> overdue task ids
+        registry.overdue = self
+
+    def load(self):
+        self.sent = {
+            int(user_id): record
+            for user_id, record in self.store.load("overdue_digests").items()
+        }
+        self.rebuild()
+
+    def rebuild(self):
+        """Track every assigned task from scratch, e.g. after loading."""
+        self.heap, self.armed, self.due_now = [], {}, {}
+        for user_id, tasks in self.registry.assignments.items():
+            for task_id, task in tasks.items():
+                self.track(user_id, task_id, task)
+
+    def track(self, user_id: int, task_id: int, task: Optional[Task]):
+        """(Re)track a task after it changed; None forgets it."""
+        key = (user_id, task_id)
+        self.armed.pop(key, None)
+        self.due_now.get(user_id, set()).discard(task_id)
+        if task is None or task.completed or task.due is None:
+            return
+        self.arm_seq += 1
+        self.armed[key] = self.arm_seq
+        heapq.heappush(self.heap,
+                       (task.due.timestamp(), self.arm_seq, user_id, task_id))
+        if len(self.heap) > 4 * len(self.armed) + 64:
+            self.heap = [entry for entry in self.heap
+                         if self.armed.get((entry[2], entry[3])) == entry[1]]
+            heapq.heapify(self.heap)
+
+    def overdue(self, now: datetime) -> Dict[int, List[Tuple[int, Task]]]:
+        """User id -> that member's overdue (task id, task), oldest first."""
+        while self.heap and self.heap[0][0] <= now.timestamp():
+            _, arm_id, user_id, task_id = heapq.heappop(self.heap)
+            if self.armed.get((user_id, task_id)) == arm_id:
+                self.due_now.setdefault(user_id, set()).add(task_id)
+
+        members: Dict[int, List[Tuple[int, Task]]] = {}
+        for user_id, task_ids in self.due_now.items():
+            for task_id in task_ids:
+                task = self.registry.get(user_id, task_id)
+                if task is not None and not task.completed:
+                    members.setdefault(user_id, []).append((task_id, task))
+        for tasks in members.values():
+            tasks.sort(key=lambda item: item[1].due)
+        return members
+
+    def changed(self, now: datetime) -> Dict[int, List[Tuple[int, Task]]]:
+        """Members owed a digest; forgets members with nothing overdue."""
+        overdue = self.overdue(now)
+        for user_id in set(self.sent) - set(overdue):
+            del self.sent[user_id]
+            self.store.delete("overdue_digests", (user_id, ))
+
+        owed = {}
+        for user_id, tasks in overdue.items():
+            record = self.sent.get(user_id)
+            if (record is None
+                    or record["task_ids"] != sorted(tid for tid, _ in tasks)
+                    or now - datetime.fromisoformat(record["sent_at"]) >=
+                    self.renag):
+                owed[user_id] = tasks
+        return owed
+
+    def embeds(self, tasks: List[Tuple[int, Task]],
+               now: datetime) -> List[discord.Embed]:
+        embeds = []
+        for task_id, task in tasks:
+            embed = discord.Embed(title=f"Task #{task_id}",
+                                  description=task.description or task.name,
+                                  color=COLORS["error"])
+            days = (now - task.due).days
+            embed.add_field(
+                name="Due",
+                value=task.due.strftime("%b %d, %Y %H:%M") +
+                (f" ({days} day{'s' if days != 1 else ''} ago)" if days else ""),
+                inline=True)
+            embed.add_field(name="Priority",
+                            value=task.priority.label,
+                            inline=True)
+            embed.add_field(name="Points", value=str(task.points), inline=True)
+            embeds.append(embed)
+        return embeds
+
+    async def run(self) -> int:
+        """Send every digest that is owed; returns how many members got one."""
+        now = datetime.now(EST)
+        owed = self.changed(now)
+        if not owed:
+            return 0
+        members = await member_directory.resolve_many(owed)
+
+        deliveries = {}
+        for user_id, tasks in owed.items():
+            member = members.get(user_id)
+            if member is None:
+                continue
+            embeds = self.embeds(tasks, now)
+            chunks = [
+                embeds[i:i + self.EMBEDS_PER_MESSAGE]
+                for i in range(0, len(embeds), self.EMBEDS_PER_MESSAGE)
+            ]
+            deliveries[user_id] = [
+                outbox.send(member,
+                            f"⚠️ You have **{len(tasks)}** overdue task"
+                            f"{'s' if len(tasks) != 1 else ''}:" if i == 0
+                            else None,
+                            embeds=chunk,
+                            lane=Lane.BULK) for i, chunk in enumerate(chunks)
+            ]
+
+        sent = 0
+        for user_id, futures in deliveries.items():
+            results = await asyncio.gather(*futures, return_exceptions=True)
+            if any(isinstance(result, Exception) for result in results):
+                continue  # reported by the outbox; retried next run
+            self.sent[user_id] = {
+                "task_ids": sorted(tid for tid, _ in owed[user_id]),
+                "sent_at": now.isoformat()
+            }
+            self.store.put("overdue_digests", (user_id, ),
+                           self.sent[user_id])
+            sent += 1
+        return sent
 
 
-@tasks.loop(hours=1)
-async def check_overdue_tasks():
-    await bot.wait_until_ready()
-    tasks_data = load_tasks()
-    now = datetime.now(EST).date()
-    channel = bot.get_channel(TASK_CHANNEL_ID)
-    if channel is None:
-        return
+overdue_digests = OverdueDigests(task_registry, storage,
+                                 timedelta(hours=OVERDUE_RENAG_HOURS))
 
-    for member_id_str, member_tasks in tasks_data.items():
-        for task_id_str, task in member_tasks.items():
-            if task.get("status") != "Completed" and task.get("due_date"):
-                due_date = datetime.fromisoformat(task["due_date"]).date()
-
-                if due_date < now:
-                    member = channel.guild.get_member(int(member_id_str))
-                    if member:
-                        embed = discord.Embed(
-                            title="⚠️ Overdue Task",
-                            description=
-                            f"You have an overdue task:\n{format_task(task, int(task_id_str))}",
-                            color=COLORS["error"])
-                        try:
-                            await member.send(embed=embed)
-                        except:
-                            pass
-
-
-@tasks.loop(hours=24)
-async def daily_reset_responders():
-    bot.daily_responders.clear()
 
+@scheduler.job("0 * * * *")
+async def check_overdue_tasks(fire_time: datetime):
+    await overdue_digests.run()
 
-@daily_reset_responders.before_loop
-async def before_reset():
-    now = datetime.now(EST)
-    next_midnight = datetime.combine(now + timedelta(days=1), time(0, 0))
-    wait_seconds = (next_midnight - now).total_seconds()
-    await asyncio.sleep(wait_seconds)
+
+@scheduler.job("0 0 * * *")
+async def daily_reset_responders(fire_time: datetime):
+    bot.daily_responders.clear()
 
 
 # ========== Events ==========
@@ -1900,6 +5071,21 @@ async def on_message(message):
     await bot.process_commands(message)
 
 
+@bot.event
+async def on_member_update(before, after):
+    member_directory.invalidate(after.id)
+
+
+@bot.event
+async def on_user_update(before, after):
+    member_directory.invalidate(after.id)
+
+
+@bot.event
+async def on_member_remove(member):
+    member_directory.invalidate(member.id)
+
+
 class SilentCheckFailure(commands.CheckFailure):
     """Special exception that gets silently ignored"""
     pass
@@ -1915,67 +5101,44 @@ async def on_ready():
     await bot.tree.sync(guild=guild)
     
     # --- Load Data ---
-    try:
-        with open("scores.json", "r") as f:
-            bot.user_scores = json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError):
-        bot.user_scores = {}
+    log_cache.load()
+    score_ledger.load()
 
-    migrate_logs()  # Legacy migration (if needed)
     bot.user_lives = load_lives()
     bot.add_view(LogButton())  # Persistent buttons
     await TaskPaginatedView.create_persistent_views()
     await LeaderboardView.create_persistent_views()  # Dummy data
 
     # --- Task Initialization ---
-    bot.task_assignments = load_tasks()
-    bot.user_tasks_created = {}
+    task_registry.load()
+    reminders.rebuild()
+    task_channel.load()
+    search_index.load()
+    overdue_digests.load()
+    progress_tracker.load()
+    rollups.load()
+    badge_engine.load()
     bot.comments = load_comments()
 
     # Debug: Print loaded tasks to verify due dates
     print(
-        f"\n[Task Debug] Loaded {len(bot.task_assignments)} users with tasks:")
-    for user_id, tasks in bot.task_assignments.items():
+        f"\n[Task Debug] Loaded {len(task_registry.assignments)} users with tasks:")
+    for user_id, tasks in task_registry.assignments.items():
         print(f"  User {user_id}: {len(tasks)} tasks")
         for task_id, task in tasks.items():
-            if "due_date" in task:
-                print(f"    Task {task_id} → Due: {task['due_date']}")
-
-    # Set task counter
-    if bot.task_assignments:
-        bot.task_counter = max(
-            max(map(int, user_tasks.keys()))
-            for user_tasks in bot.task_assignments.values() if user_tasks)
+            if task.due:
+                print(f"    Task {task_id} → Due: {task.due.isoformat()}")
 
     # --- START LOOPS FIRST (to prevent missing reminders) ---
-    background_tasks = [
-        daily_log_reminder,
-        send_summary_to_admin,
-        evening_ping_task,
-        check_overdue_tasks,
-        daily_reset_responders,
-        check_due_dates,  # MOST CRITICAL FOR REMINDERS
-        weekly_summary
-    ]
-
-    for task in background_tasks:
-        if not task.is_running():
-            task.start()
-            print(f"Started loop: {task}"
-                  )  # if you just want to confirm it started
+    outbox.start()  # everything below sends through it
+    scheduler.start()
+    print(f"Scheduled jobs: {', '.join(scheduler.jobs)}")
+    reminders.start()  # MOST CRITICAL FOR REMINDERS
 
     # --- THEN Cleanup/Update ---
     await cleanup_task_assignments()
-    await update_task_channel()
-
-    # --- Normalize Task Storage ---
-    print("\nNormalizing task storage...")
-    bot.task_assignments = {
-        str(user_id): tasks
-        for user_id, tasks in bot.task_assignments.items()
-    }
-    save_tasks(bot.task_assignments)
-    print(f"Normalized {len(bot.task_assignments)} users' tasks")
+    await task_channel.flush(full=True)
+    leaderboard_publisher.request()
 
     print("\nBot fully initialized! ✅")
 
@@ -1991,31 +5154,27 @@ async def on_raw_reaction_add(payload):
     if user is None or user.bot:
         return
 
-    user_logs = load_logs()
     today = str(datetime.now(EST).date())
     user_id_str = str(user.id)
 
-    if user_id_str not in user_logs:
-        user_logs[user_id_str] = {}
-    user_logs[user_id_str][today] = "✅ Quick log via reaction"
-    save_logs(user_logs)
+    log_cache.set_day(user_id_str, today, [{
+        "timestamp": datetime.now(EST).isoformat(),
+        "log": "✅ Quick log via reaction"
+    }])
 
     embed = create_success_embed("Quick Log",
                                  "Your quick log has been recorded! Thanks!")
-    try:
-        await user.send(embed=embed)
-    except:
-        pass
+    outbox.send(user, embed=embed, lane=Lane.INTERACTIVE)
 
 
 @bot.command(name="myscore", help="View your total score and task breakdown")
 async def myscore(ctx):
     user_id = str(ctx.author.id)
-    if not hasattr(bot, 'user_scores') or user_id not in bot.user_scores:
+    tasks = score_ledger.items(user_id)
+    if not tasks:
         return await ctx.send("❌ You have no recorded tasks or points.")
 
-    tasks = bot.user_scores[user_id]
-    total_points = sum(task["points"] for task in tasks.values())
+    total_points = score_ledger.total(user_id)
     breakdown = "\n".join(
         f"• {task['description'] or task_id}: {task['points']} pts"
         for task_id, task in tasks.items())
@@ -2047,10 +5206,30 @@ async def custom_help(ctx, command_name: str = None):
             "description": "Ping users who haven't logged today",
             "syntax": "!forework"
         },
+        "outbox": {
+            "description": "Show the outbound message queue and recent failures",
+            "syntax": "!outbox"
+        },
+        "schedule": {
+            "description": "Show when each scheduled job runs next (US/Eastern)",
+            "syntax": "!schedule"
+        },
+        "backfillbadge": {
+            "description": "Grant a criteria badge to everyone who already qualifies",
+            "syntax": "!backfillbadge <badge_id> [dryrun]"
+        },
         "backup": {
             "description": "Create a backup of all data",
             "syntax": "!backup"
         },
+        "exportalllogs": {
+            "description": "Export every user's logs as one zip archive",
+            "syntax": "!exportalllogs [txt|csv|jsonl]"
+        },
+        "searchalllogs": {
+            "description": "Search every user's logs",
+            "syntax": "!searchalllogs <keywords>"
+        },
         "alltasks": {
             "description": "View all tasks in the system",
             "syntax": "!alltasks"
@@ -2105,7 +5284,11 @@ async def custom_help(ctx, command_name: str = None):
         },
         "exportlogs": {
             "description": "Export your logs as a file",
-            "syntax": "!exportlogs"
+            "syntax": "!exportlogs [txt|csv|jsonl]"
+        },
+        "searchlogs": {
+            "description": "Search your logs (all words must match; prefixes work)",
+            "syntax": "!searchlogs <keywords>"
         },
         "createtask": {
             "description": "Create a new task (form)",
@@ -2148,8 +5331,8 @@ async def custom_help(ctx, command_name: str = None):
             "syntax": "!viewcomments <task_id>"
         },
         "searchtasks": {
-            "description": "Search your tasks",
-            "syntax": "!searchtasks <keyword>"
+            "description": "Search your tasks by name, description, category or comment",
+            "syntax": "!searchtasks <keywords>"
         },
         "addcategory": {
             "description": "Add a category to task",
@@ -2160,13 +5343,17 @@ async def custom_help(ctx, command_name: str = None):
             "syntax": "!taskchart"
         },
         "leaderboard": {
-            "description": "Show top contributors",
-            "syntax": "!leaderboard"
+            "description": "Show top contributors, all-time or for a period",
+            "syntax": "!leaderboard [week|month|7d|30d|all]"
         },
         "profile": {
             "description": "View your profile",
             "syntax": "!profile [@user]"
         },
+        "stats": {
+            "description": "Your log entries, tasks, points and work time this week and month",
+            "syntax": "!stats [@user]"
+        },
         "checklives": {
             "description": "Check your remaining lives",
             "syntax": "!checklives [@user]"
@@ -2246,7 +5433,10 @@ async def custom_help(ctx, command_name: str = None):
         name="📝 Logging Commands",
         value="\n".join([
             f"`{cmd}`"
-            for cmd in ["log", "viewlogs", "editlog", "health", "exportlogs"]
+            for cmd in [
+                "log", "viewlogs", "editlog", "health", "exportlogs",
+                "searchlogs"
+            ]
         ]),
         inline=False)
 
@@ -2309,26 +5499,46 @@ async def show_progress(ctx):
     await ctx.send(embed=embed)
 
 
-weekly_challenges = {
-    "task_master": {
-        "goal": 5,
-        "reward": 50,
-        "desc": "Complete 5 tasks this week"
-    },
-    "log_king": {
-        "goal": 7,
-        "reward": 70,
-        "desc": "Log work 7 days in a row"
-    }
-}
-
 @bot.command(name="challenges")
 async def show_challenges(ctx):
     embed = discord.Embed(title="Weekly Challenges", color=COLORS["highlight"])
+    record = progress_tracker.record(ctx.author.id)
     for name, challenge in weekly_challenges.items():
+        done = progress_tracker.progress(ctx.author.id, name)
+        filled = int(10 * done / challenge["goal"])
+        status = "✅ Completed" if name in record["rewarded"] else (
+            f"{'█' * filled}{'░' * (10 - filled)} {done}/{challenge['goal']}")
         embed.add_field(name=challenge["desc"],
-                       value=f"Reward: {challenge['reward']} XP",
+                       value=f"{status}\nReward: {challenge['reward']} pts",
                        inline=False)
+    embed.set_footer(
+        text=f"🔥 Current streak: {progress_tracker.streak(ctx.author.id)} days")
+    await ctx.send(embed=embed)
+
+
+@bot.command(name="stats", help="Your activity this week and this month")
+async def show_stats(ctx, member: discord.Member = None):
+    member = member or ctx.author
+    if member != ctx.author and ctx.author.id not in ADMIN_ID:
+        return await ctx.send(embed=create_error_embed(
+            "Permission Denied",
+            "You can only view your own stats unless you're an admin"))
+
+    embed = discord.Embed(title=f"📈 {member.display_name}'s Stats",
+                          color=COLORS["primary"],
+                          timestamp=datetime.now(EST))
+    for label, (first, last) in (("This Week", this_week()),
+                                 ("This Month", this_month())):
+        totals = rollups.totals(member.id, first, last)
+        hours, minutes = divmod(totals["minutes"], 60)
+        embed.add_field(
+            name=f"{label} (since {first})",
+            value=(f"📝 Log entries: {totals['entries']} "
+                   f"({totals['chars']:,} chars)\n"
+                   f"✅ Tasks completed: {totals['tasks']}\n"
+                   f"⭐ Points earned: {totals['points']}\n"
+                   f"⏱️ Work time: {hours}h {minutes}m"),
+            inline=False)
     await ctx.send(embed=embed)
 
 @bot.command(name="tasks", help="Show your tasks (admins can check others)")
@@ -2371,7 +5581,8 @@ async def show_user_tasks(ctx, member: discord.Member = None, *args):
         return
 
     user_id = target_member.id
-    if user_id not in bot.task_assignments or not bot.task_assignments[user_id]:
+    user_tasks = task_registry.assigned(user_id)
+    if not user_tasks:
         await ctx.send(f"{target_member.mention} has no tasks.")
         return
 
@@ -2380,15 +5591,9 @@ async def show_user_tasks(ctx, member: discord.Member = None, *args):
     # Collect filtered tasks in dict format {task_id: task}
     filtered_tasks = {}
 
-    for task_id, task in bot.task_assignments[user_id].items():
-        status = task.get("status", "Pending")
-        due_date = None
-        if "due_date" in task and task["due_date"]:
-            try:
-                due_date = datetime.fromisoformat(
-                    task["due_date"]).astimezone(EST)
-            except ValueError:
-                due_date = None
+    for task_id, task in user_tasks.items():
+        status = task.status
+        due_date = task.due
 
         # Apply filter_arg
         if filter_arg in (None, "all"):
@@ -2414,18 +5619,11 @@ async def show_user_tasks(ctx, member: discord.Member = None, *args):
     # Sort filtered tasks by your sort_arg
     def sort_key_due(item):
         tid, t = item
-        due = None
-        if "due_date" in t and t["due_date"]:
-            try:
-                due = datetime.fromisoformat(t["due_date"]).astimezone(EST)
-            except ValueError:
-                pass
-        return due or datetime.max
+        return t.due.timestamp() if t.due else float("inf")
 
     def sort_key_priority(item):
         tid, t = item
-        priority_order = {"high": 0, "normal": 1, "low": 2}
-        return priority_order.get(t.get("priority", "normal").lower(), 1)
+        return t.priority.rank
 
     items = list(filtered_tasks.items())
     if sort_arg == "due":
@@ -2457,8 +5655,7 @@ async def view_logs(ctx, member: discord.Member = None):
             color=COLORS["error"])
         return await ctx.send(embed=embed, delete_after=10)
 
-    logs = load_logs()
-    user_logs = logs.get(str(target_member.id), {})
+    user_logs = load_user_logs(target_member.id)
 
     if not user_logs:
         embed = discord.Embed(
@@ -2478,46 +5675,31 @@ async def view_logs(ctx, member: discord.Member = None):
 @is_admin()
 async def testreminder(ctx, task_id: int):
     """Force a reminder for testing"""
-    task = None
-    for user_tasks in bot.task_assignments.values():
-        if task_id in user_tasks:
-            task = user_tasks[task_id]
-            break
-
-    if not task:
+    found = task_registry.find(task_id)
+    if not found:
         return await ctx.send("Task not found")
+    _, task = found
 
     # Force a reminder
     embed = discord.Embed(
         title="🔔 TEST REMINDER",
-        description=f"Test reminder for task {task_id}: {task['description']}",
+        description=f"Test reminder for task {task_id}: {task.description}",
         color=COLORS["info"])
     await ctx.send(embed=embed)
 
 
-@bot.command(name="leaderboard")
-async def leaderboard(ctx):
-    try:
-        with open("scores.json", "r") as f:
-            scores = json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError):
-        return await ctx.send("❌ No scores available yet.")
-
-    leaderboard_data = []
-    for user_id, tasks in scores.items():
-        total = sum(task.get("points", 0) for task in tasks.values())
-        leaderboard_data.append((int(user_id), total, tasks))  # 3-tuple
-
-    if not leaderboard_data:
-        return await ctx.send("❌ No participants yet.")
-
-    # Sort descending by total points
-    leaderboard_data.sort(key=lambda x: x[1], reverse=True)
-
-    # Insert rank as the first element
-    ranked_data = [(rank + 1, user_id, total, tasks) for rank, (user_id, total, tasks) in enumerate(leaderboard_data)]
+@bot.command(name="leaderboard",
+             help="Show the leaderboard: !leaderboard [week|month|7d|30d|all]")
+async def leaderboard(ctx, window: str = "all"):
+    window = window.lower()
+    if window != "all" and window not in POINT_WINDOWS:
+        return await ctx.send(
+            f"❌ Unknown period. Use one of: {', '.join([*POINT_WINDOWS, 'all'])}."
+        )
+    if not len(score_ledger.leaderboard(window)):
+        return await ctx.send("❌ No scores available for that period yet.")
 
-    view = LeaderboardView(ranked_data)
+    view = LeaderboardView(window=window)
     embed = view.create_embed()
     await ctx.send(embed=embed, view=view)
 
@@ -2547,17 +5729,8 @@ async def adjust_points(ctx, member: discord.Member, action: str, amount: int,
         )
 
     # Load scores
-    try:
-        with open("scores.json", "r") as f:
-            scores = json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError):
-        scores = {}
-
     user_id_str = str(member.id)
-    if user_id_str not in scores:
-        scores[user_id_str] = {}
-
-    user_tasks = scores[user_id_str]
+    user_tasks = load_user_scores(user_id_str)
 
     task_id = None
     description = ""
@@ -2596,50 +5769,21 @@ async def adjust_points(ctx, member: discord.Member, action: str, amount: int,
         if len(args) >= 2:
             note = args[1]
 
-    current_task = user_tasks.get(task_id, {
-        "points": 0,
-        "description": description,
-        "notes": []
-    })
-    current_points = current_task.get("points", 0)
+    current_points = user_tasks.get(task_id, {}).get("points", 0)
 
     new_points = max(
         0, current_points + amount if action == "add" else current_points -
         amount)
     action_word = "added to" if action == "add" else "removed from"
 
-    # Append note if present
-    if note:
-        current_task.setdefault("notes", []).append(note)
-
-    # Update description (only when adding)
-    if action == "add":
-        current_task["description"] = description
-
-    # Save or delete task
-    if new_points == 0:
-        user_tasks.pop(task_id, None)
-    else:
-        current_task["points"] = new_points
-        user_tasks[task_id] = current_task
-
-    # Save to file
-    with open("scores.json", "w") as f:
-        json.dump(scores, f, indent=2)
-
-    # Update cache if using
-    if hasattr(bot, 'user_scores'):
-        if new_points == 0:
-            if user_id_str in bot.user_scores:
-                bot.user_scores[user_id_str].pop(task_id, None)
-                if not bot.user_scores[user_id_str]:
-                    bot.user_scores.pop(user_id_str, None)
-        else:
-            if user_id_str not in bot.user_scores:
-                bot.user_scores[user_id_str] = {}
-            bot.user_scores[user_id_str][task_id] = current_task
+    # Record the change; the description only updates when adding
+    score_ledger.adjust(user_id_str,
+                        task_id,
+                        new_points - current_points,
+                        description=description if action == "add" else None,
+                        note=note or None)
 
-    total_points = sum(task["points"] for task in user_tasks.values())
+    total_points = score_ledger.total(user_id_str)
 
     # Respond
     embed = discord.Embed(
@@ -2662,16 +5806,8 @@ async def adjust_points(ctx, member: discord.Member, action: str, amount: int,
              help="Ping everyone who hasn't logged work today (Admin only)")
 @is_admin()
 async def forcework(ctx):
-    # Load all logs
-    logs = load_logs()
     today = str(datetime.now(EST).date())
 
-    # Get all member IDs who have logged today
-    logged_today = set()
-    for user_id, dates in logs.items():
-        if today in dates and dates[today]:
-            logged_today.add(user_id)
-
     # Get all members in the guild (server)
     guild = ctx.guild
     if guild is None:
@@ -2679,12 +5815,7 @@ async def forcework(ctx):
         return
 
     # Find members who have not logged today
-    not_logged_members = []
-    for member in guild.members:
-        if member.bot:
-            continue  # skip bots
-        if str(member.id) not in logged_today:
-            not_logged_members.append(member)
+    not_logged_members = activity_index.missing(guild.members, today)
 
     if not not_logged_members:
         await ctx.send("✅ Everyone has logged work today!")
@@ -2739,7 +5870,6 @@ async def touch_member(ctx, member: discord.Member):
 @is_admin()
 async def alllogs(ctx):
     """Admin command to view all logs in a paginated format"""
-    logs = load_logs()
     guild = ctx.guild
     if guild is None:
         await ctx.send("⚠️ This command can only be used in a server.")
@@ -2751,16 +5881,12 @@ async def alllogs(ctx):
     except discord.Forbidden:
         pass
 
-    if not logs:
+    # User ids sorted by most recent log date; logs load per page
+    sorted_users = log_cache.users_by_latest()
+    if not sorted_users:
         await ctx.author.send("📭 No logs found.")
         return
 
-    # Create a list of (user_id, user_logs) tuples sorted by most recent log date
-    sorted_users = sorted([(uid, user_logs)
-                           for uid, user_logs in logs.items()],
-                          key=lambda x: max(x[1].keys()) if x[1] else "",
-                          reverse=True)
-
     # Create paginated view
     view = AllLogsPaginatedView(ctx.author, sorted_users, guild)
     embed = view.create_embed()
@@ -2769,11 +5895,11 @@ async def alllogs(ctx):
 
 class AllLogsPaginatedView(discord.ui.View):
 
-    def __init__(self, requester: discord.Member, user_logs: List[tuple],
+    def __init__(self, requester: discord.Member, user_ids: List[str],
                  guild: discord.Guild):
         super().__init__(timeout=None)
         self.requester = requester
-        self.user_logs = user_logs
+        self.user_ids = user_ids
         self.guild = guild
         self.current_page = 0
         self.current_log_page = 0
@@ -2790,9 +5916,9 @@ class AllLogsPaginatedView(discord.ui.View):
             pass
 
     def create_embed(self) -> discord.Embed:
-        user_id, logs = self.user_logs[self.current_page]
-        member = self.guild.get_member(int(user_id))
-        display_name = member.display_name if member else f"User ID {user_id}"
+        user_id = self.user_ids[self.current_page]
+        logs = load_user_logs(user_id)
+        display_name = member_directory.display_name(user_id)
 
         embed = discord.Embed(title=f"📚 Logs for {display_name}",
                               color=COLORS["primary"],
@@ -2813,26 +5939,16 @@ class AllLogsPaginatedView(discord.ui.View):
             except ValueError:
                 formatted_date = date
 
-            if isinstance(entries, str):
-                entries = [{"log": entries}]
-            elif isinstance(entries, dict):
-                entries = [entries]
-
-            log_text = ""
-            for entry in entries:
-                if isinstance(entry, dict):
-                    timestamp = entry.get("timestamp", "")
-                    log = entry.get("log", "")
-                    log_text += f"**{timestamp}**\n{log}\n\n"
-                else:
-                    log_text += f"{entry}\n\n"
+            log_text = "".join(
+                f"**{entry['timestamp']}**\n{entry['log']}\n\n"
+                for entry in entries)
 
             embed.add_field(name=f"📅 {formatted_date}",
                             value=log_text or "No log content",
                             inline=False)
 
         embed.set_footer(text=(
-            f"User ID: {user_id} • User Page {self.current_page + 1}/{len(self.user_logs)} • "
+            f"User ID: {user_id} • User Page {self.current_page + 1}/{len(self.user_ids)} • "
             f"Log Page {self.current_log_page + 1}/{total_pages}"))
         return embed
 
@@ -2849,7 +5965,7 @@ class AllLogsPaginatedView(discord.ui.View):
     @discord.ui.button(label="Logs ➡", style=discord.ButtonStyle.secondary)
     async def next_logs(self, interaction: discord.Interaction,
                         button: discord.ui.Button):
-        _, logs = self.user_logs[self.current_page]
+        logs = load_user_logs(self.user_ids[self.current_page])
         total_pages = (len(logs) + self.logs_per_page -
                        1) // self.logs_per_page
         if self.current_log_page < total_pages - 1:
@@ -2875,7 +5991,7 @@ class AllLogsPaginatedView(discord.ui.View):
                        style=discord.ButtonStyle.secondary)
     async def next_user(self, interaction: discord.Interaction,
                         button: discord.ui.Button):
-        if self.current_page < len(self.user_logs) - 1:
+        if self.current_page < len(self.user_ids) - 1:
             self.current_page += 1
             self.current_log_page = 0
             await interaction.response.edit_message(embed=self.create_embed(),
@@ -2887,9 +6003,8 @@ class AllLogsPaginatedView(discord.ui.View):
     async def jump_to_user(self, interaction: discord.Interaction,
                            button: discord.ui.Button):
         options = []
-        for i, (user_id, _) in enumerate(self.user_logs):
-            member = self.guild.get_member(int(user_id))
-            label = member.display_name if member else f"User {user_id}"
+        for i, user_id in enumerate(self.user_ids):
+            label = member_directory.display_name(user_id, f"User {user_id}")
             options.append(
                 discord.SelectOption(label=label[:25],
                                      value=str(i),
@@ -2915,7 +6030,7 @@ class AllLogsPaginatedView(discord.ui.View):
     async def jump_to_date(self, interaction: discord.Interaction,
                            button: discord.ui.Button):
         try:
-            _, logs = self.user_logs[self.current_page]
+            logs = load_user_logs(self.user_ids[self.current_page])
             sorted_dates = sorted(logs.items(),
                                   key=lambda x: x[0],
                                   reverse=True)
@@ -2966,7 +6081,6 @@ class AllLogsPaginatedView(discord.ui.View):
 
 @bot.command(name="editlog", help="Edit your last log from a specific date")
 async def edit_log(ctx, date: str, *, new_desc: str):
-    user_logs = load_logs()
     user_id = str(ctx.author.id)
 
     # Parse date using natural language
@@ -2978,17 +6092,18 @@ async def edit_log(ctx, date: str, *, new_desc: str):
 
     date_str = str(parsed_date.date())
 
-    if user_id not in user_logs or date_str not in user_logs[user_id]:
+    entries = log_cache.day(user_id, date_str)
+    if entries is None:
         return await ctx.send(f"❌ No logs found for `{date_str}`.")
 
-    if not user_logs[user_id][date_str]:
+    if not entries:
         return await ctx.send("❌ No logs to edit on that date.")
 
     # Edit the last log entry for that date
-    user_logs[user_id][date_str][-1]["log"] = new_desc
-    user_logs[user_id][date_str][-1]["timestamp"] = datetime.now(
-        EST).isoformat()
-    save_logs(user_logs)
+    entries[-1]["log"] = new_desc
+    entries[-1]["timestamp"] = datetime.now(EST).isoformat()
+    log_cache.mark_dirty(user_id, date_str)
+    log_cache.flush()
 
     await ctx.send(f"✅ Updated your last log on `{date_str}` to:\n`{new_desc}`"
                    )
@@ -3009,13 +6124,13 @@ async def snooze(ctx, minutes: int):
             "Please provide a snooze time between 1 and 180 minutes.")
         return await ctx.send(embed=embed)
 
-    daily_log_reminder.cancel()
+    scheduler.pause("daily_log_reminder",
+                    datetime.now(EST) + timedelta(minutes=minutes))
     embed = create_info_embed("Snooze Active",
                               f"Reminders snoozed for {minutes} minutes.")
     await ctx.send(embed=embed)
 
     await asyncio.sleep(minutes * 60)
-    daily_log_reminder.start()
 
     embed = create_info_embed("Reminders Active",
                               "Daily reminders are now active again.")
@@ -3065,17 +6180,12 @@ async def add_task(ctx, *, args=None):
                 return await ctx.send(
                     "❌ Invalid date format! Use `YYYY-MM-DD`.")
 
-    bot.task_counter += 1
-    task_id = bot.task_counter
-    task_info = {
-        "description": description,
-        "due_date": due_date.isoformat() if due_date else None,
-        "priority": priority,
-        "points": points,  # Add points to task
-        "created_at": str(datetime.now(EST)),
-    }
+    task_info = Task(description=description,
+                     due=EST.localize(due_date) if due_date else None,
+                     priority=Priority.parse(priority),
+                     points=points)
 
-    bot.user_tasks_created.setdefault(ctx.author.id, {})[task_id] = task_info
+    task_id = task_registry.create(ctx.author.id, task_info)
 
     embed = discord.Embed(title=f"📝 Task #{task_id} Added",
                           color=COLORS["success"])
@@ -3089,38 +6199,27 @@ async def add_task(ctx, *, args=None):
     embed.set_footer(text=f"Created by {ctx.author.display_name}")
 
     await ctx.send(embed=embed)
-    await update_task_channel()  # Update task channel
 
 
 @bot.command(name="assign", help="Assign task to member")
 @is_admin()
 async def assign_task(ctx, member: discord.Member, task_id: int):
     try:
-        # Find the task without deleting it from the creator's list
-        task_found = None
-        for creator_id, tasks in bot.user_tasks_created.items():
-            if task_id in tasks:
-                task_found = tasks[task_id]
-                break  # Do not delete the original task
-
+        # The creator's copy stays in place as the template
+        task_found = task_registry.template(task_id)
         if not task_found:
             return await ctx.send("❌ Task not found.")
 
-        if task_id in bot.task_assignments.get(member.id, {}):
+        if task_registry.get(member.id, task_id):
             return await ctx.send(
                 "⚠️ This task is already assigned to that user.")
 
-        # Add to assignee's task list
-        if member.id not in bot.task_assignments:
-            bot.task_assignments[member.id] = {}
-
-        bot.task_assignments[member.id][task_id] = {
-            **task_found, "status": "Pending",
-            "assigned_at": datetime.now(EST).isoformat(),
-            "assigned_by": ctx.author.id
-        }
+        task = task_found.copy()
+        task.status = "Pending"
+        task.assigned_at = datetime.now(EST).isoformat()
+        task.assigned_by = ctx.author.id
+        task_registry.put(member.id, task_id, task)
 
-        save_tasks(bot.task_assignments)
         await ctx.send(f"✅ Task #{task_id} assigned to {member.mention}")
         await update_task_channel()
 
@@ -3130,21 +6229,20 @@ async def assign_task(ctx, member: discord.Member, task_id: int):
 
 @bot.command(name="completetask", help="Mark a task as completed")
 async def complete_task(ctx, task_id: int):
-    user_tasks = bot.task_assignments.get(ctx.author.id, {})
-    if task_id not in user_tasks:
+    task = task_registry.get(ctx.author.id, task_id)
+    if task is None:
         return await ctx.send("❌ Task not found in your assignments.")
 
-    task = user_tasks[task_id]
-    if task.get("status") == "Completed":
+    if task.completed:
         return await ctx.send("❌ Task already completed.")
 
-    task["status"] = "Completed"
-    task["completed_at"] = datetime.now(EST).isoformat()
-    points = task.get("points", 10)
+    task_registry.set_status(ctx.author.id, task_id, "Completed",
+                             completed_at=datetime.now(EST).isoformat())
+    points = task.points
 
     # Award points
     award_points(str(ctx.author.id), str(task_id), points,
-                 task.get("description", f"Task #{task_id}"))
+                 task.description or f"Task #{task_id}")
 
     # Update leaderboard
     await update_leaderboard_channel()
@@ -3183,9 +6281,8 @@ async def add_life(ctx, member: discord.Member):
     except discord.Forbidden:
         pass
 
-    lives = load_lives()
     # Default to 3 lives if user not found
-    current_lives = lives.get(str(member.id), 3)
+    current_lives = get_user_lives(member.id)
 
     if current_lives >= MAX_LIVES:
         embed = discord.Embed(
@@ -3196,8 +6293,7 @@ async def add_life(ctx, member: discord.Member):
             color=COLORS["success"])
         return await ctx.send(embed=embed, delete_after=30)
 
-    lives[str(member.id)] = current_lives + 1
-    save_lives(lives)
+    set_user_lives(member.id, current_lives + 1)
     bot.user_lives[member.id] = current_lives + 1
 
     embed = discord.Embed(
@@ -3217,9 +6313,8 @@ async def remove_life(ctx, member: discord.Member):
     except discord.Forbidden:
         pass
 
-    lives = load_lives()
     # Default to 3 lives if user not found
-    current_lives = lives.get(str(member.id), 3)
+    current_lives = get_user_lives(member.id)
 
     if current_lives <= 0:
         embed = discord.Embed(
@@ -3232,8 +6327,7 @@ async def remove_life(ctx, member: discord.Member):
             color=COLORS["error"])
         return await ctx.send(embed=embed, delete_after=30)
 
-    lives[str(member.id)] = current_lives - 1
-    save_lives(lives)
+    set_user_lives(member.id, current_lives - 1)
     bot.user_lives[member.id] = current_lives - 1
 
     remaining = current_lives - 1
@@ -3273,8 +6367,7 @@ async def check_lives(ctx, member: discord.Member = None):
 
 @bot.command(name="mytasks")
 async def my_tasks(ctx):
-    user_id = ctx.author.id
-    tasks = bot.task_assignments.get(user_id, {})
+    tasks = task_registry.assigned(ctx.author.id)
 
     if not tasks:
         await ctx.send("ℹ️ No Tasks\nYou have no assigned tasks.")
@@ -3282,15 +6375,13 @@ async def my_tasks(ctx):
 
     embed = discord.Embed(title="🗂️ Your Tasks", color=discord.Color.blurple())
     for task_id, task in tasks.items():
-        due_date = (datetime.fromisoformat(task["due_date"]).astimezone(EST)
-                    if task.get("due_date") else None)
-        status = task.get("status", "Pending")
+        due_date = task.due
         task_line = (
-            f"`#{task_id}` **{task['description']}**\n"
-            f"▸ {status} | "
+            f"`#{task_id}` **{task.description}**\n"
+            f"▸ {task.status} | "
             f"⏰ {due_date.strftime('%b %d %H:%M') if due_date else 'No deadline'} | "
-            f"🔮 {task.get('priority', 'Normal').title()} | "
-            f"❗ {str(task.get('importance', '1'))} | "
+            f"🔮 {task.priority.label} | "
+            f"❗ {task.importance} | "
             f"💬 {0} comments")
         embed.add_field(name="\u200b", value=task_line, inline=False)
 
@@ -3303,15 +6394,13 @@ async def all_tasks(ctx):
     embed = discord.Embed(title="📋 All Assigned Tasks",
                           color=COLORS["primary"])
 
-    for member_id_str, tasks_dict in bot.task_assignments.items():
-        member = ctx.guild.get_member(int(member_id_str))
-        member_name = member.display_name if member else f"User ID {member_id_str}"
+    for member_id, tasks_dict in task_registry.assignments.items():
+        member_name = member_directory.display_name(member_id)
 
         task_list = []
         for tid, task in tasks_dict.items():
-            status = task.get("status", "Pending")
-            due = task.get("due_date", "No due date")
-            task_list.append(f"`#{tid}` {status} | Due: {due}")
+            due = task.due.isoformat() if task.due else "No due date"
+            task_list.append(f"`#{tid}` {task.status} | Due: {due}")
 
         if task_list:
             embed.add_field(name=f"👤 {member_name} ({len(tasks_dict)} tasks)",
@@ -3374,7 +6463,7 @@ async def update_task(ctx, *, args=None):
         return await ctx.send(embed=embed)
 
     # Handle due date/time
-    due_iso = None
+    due = None
     if date_word:
         try:
             if date_word.lower() == "today":
@@ -3385,8 +6474,7 @@ async def update_task(ctx, *, args=None):
                 base_date = datetime.strptime(date_word, "%Y-%m-%d").date()
 
             due_time = datetime.strptime(time_str or "00:00", "%H:%M").time()
-            due = datetime.combine(base_date, due_time)
-            due_iso = EST.localize(due).isoformat()
+            due = EST.localize(datetime.combine(base_date, due_time))
         except ValueError:
             embed = create_error_embed(
                 "Invalid Date/Time",
@@ -3394,60 +6482,20 @@ async def update_task(ctx, *, args=None):
             )
             return await ctx.send(embed=embed)
 
-    # Flag to track if updated
-    updated = False
-
-    # Update user-created tasks
-    for creator_id, tasks in bot.user_tasks_created.items():
-        if task_id in tasks:
-            tasks[task_id].update({
-                'description': new_desc,
-                'due_date': due_iso,
-                'priority': priority,
-                'importance': importance,
-                'points': points
-            })
-
-            # Also update in task_assignments if exists
-            for assignee_id, assigned_tasks in bot.task_assignments.items():
-                if task_id in assigned_tasks:
-                    assigned_tasks[task_id].update({
-                        'description': new_desc,
-                        'due_date': due_iso,
-                        'priority': priority,
-                        'importance': importance,
-                        'points': points
-                    })
-
-            # Save both dicts after update
-            save_tasks(bot.user_tasks_created)
-            save_tasks(bot.task_assignments)
-
-            updated = True
-            break  # stop searching after found
-
-    # If not found in user_tasks_created, try task_assignments directly
-    if not updated:
-        for assignee_id, tasks in bot.task_assignments.items():
-            if task_id in tasks:
-                tasks[task_id].update({
-                    'description': new_desc,
-                    'due_date': due_iso,
-                    'priority': priority,
-                    'importance': importance,
-                    'points': points
-                })
-
-                save_tasks(bot.task_assignments)
-                updated = True
-                break
+    # Updates the creator's template and every assigned copy
+    updated = task_registry.update(task_id,
+                                   description=new_desc,
+                                   due=due,
+                                   priority=Priority.parse(priority),
+                                   importance=importance,
+                                   points=points)
 
     if updated:
         embed = discord.Embed(title=f"✅ Task #{task_id} Updated",
                               color=COLORS["success"])
         embed.add_field(name="Description", value=new_desc, inline=False)
         embed.add_field(name="Due Date",
-                        value=due_iso or "Not specified",
+                        value=due.isoformat() if due else "Not specified",
                         inline=True)
         embed.add_field(name="Priority",
                         value=priority.capitalize(),
@@ -3465,30 +6513,24 @@ async def update_task(ctx, *, args=None):
 @bot.command(name="commenttask",
              help="Add comment to a task: !commenttask <task ID> <comment>")
 async def comment_task(ctx, task_id: int, *, comment: str):
-    # Check if task exists in any user's assignments
-    task_exists = any(task_id in tasks
-                      for tasks in bot.task_assignments.values())
-
-    if not task_exists:
+    if not task_registry.assignees(task_id):
         embed = create_error_embed("Not Found",
                                    "Task ID not found in the system.")
         return await ctx.send(embed=embed)
 
-    comments = load_comments()
-    task_comments = comments.get(str(task_id), [])
+    task_comments = load_task_comments(task_id)
     task_comments.append({
         "author_id": ctx.author.id,
         "author_name": ctx.author.display_name,
         "comment": comment,
         "timestamp": datetime.now(EST).isoformat()
     })
-    comments[str(task_id)] = task_comments
-    save_comments(comments)
+    storage.put("comments", (task_id, ), task_comments)
+    search_index.index_comments(task_id)
 
     embed = create_success_embed(
         "Comment Added", f"Your comment has been added to task #{task_id}.")
     await ctx.send(embed=embed)
-    await update_task_channel()
 
 
 @bot.command(name="health", help="View your daily logs in a beautiful format")
@@ -3503,8 +6545,7 @@ async def health(ctx, member: discord.Member = None):
             color=COLORS["error"])
         return await ctx.send(embed=embed, delete_after=10)
 
-    logs = load_logs()
-    user_logs = logs.get(str(member.id), {})
+    user_logs = load_user_logs(member.id)
 
     if not user_logs:
         embed = discord.Embed(
@@ -3532,27 +6573,7 @@ async def admin_log(ctx,
         log_date = parse_flexible_date(date) if date else str(
             datetime.now(EST).date())
 
-        logs = load_logs()
-
-        if user_id not in logs:
-            logs[user_id] = {}
-
-        if log_date not in logs[user_id]:
-            logs[user_id][log_date] = []
-        elif isinstance(logs[user_id][log_date], str):
-            logs[user_id][log_date] = [{
-                "timestamp": "converted",
-                "log": logs[user_id][log_date]
-            }]
-
-        logs[user_id][log_date].append({
-            "timestamp":
-            datetime.now(EST).isoformat(),
-            "log":
-            message
-        })
-
-        save_logs(logs)
+        append_log_entry(user_id, log_date, message)
 
         # Award 2 points for logging
         award_points(user_id, f"daily_log_{log_date}", 2,
@@ -3581,25 +6602,7 @@ async def log(ctx, *, message: str):
         user_id = str(ctx.author.id)
         today = str(datetime.now(EST).date())
 
-        logs = load_logs()
-
-        if user_id not in logs:
-            logs[user_id] = {}
-
-        if today not in logs[user_id]:
-            logs[user_id][today] = []
-        elif isinstance(logs[user_id][today], str):
-            logs[user_id][today] = [{
-                "timestamp": "converted",
-                "log": logs[user_id][today]
-            }]
-
-        logs[user_id][today].append({
-            "timestamp": datetime.now(EST).isoformat(),
-            "log": message
-        })
-
-        save_logs(logs)
+        append_log_entry(user_id, today, message)
 
         # Award 2 points for daily logging
         award_points(user_id, f"daily_log_{today}", 2,
@@ -3628,8 +6631,6 @@ Examples:
 @is_admin()
 async def reset_logs(ctx, *, args: str = None):
     """Reset logs for a specific user, date, or combination of both."""
-    logs = load_logs()
-
     # Validate input
     if not args:
         embed = discord.Embed(
@@ -3663,12 +6664,10 @@ async def reset_logs(ctx, *, args: str = None):
         # Case 1: Reset all logs for a specific user
         if member and not date_key:
             target_id = str(member.id)
-            if target_id not in logs or not logs[target_id]:
+            if not log_cache.delete_user(target_id):
                 await ctx.send(f"📭 No logs found for {member.display_name}.")
                 return
 
-            del logs[target_id]
-            save_logs(logs)
             await ctx.send(
                 f"✅ All logs for {member.display_name} have been reset.")
             return
@@ -3676,18 +6675,12 @@ async def reset_logs(ctx, *, args: str = None):
         # Case 2: Reset logs for specific user on specific date
         elif member and date_key:
             target_id = str(member.id)
-            if target_id not in logs:
-                await ctx.send(f"📭 No logs found for {member.display_name}.")
-                return
-
-            if date_key not in logs[target_id]:
+            if not log_cache.delete_day(target_id, date_key):
                 await ctx.send(
                     f"📭 No logs found for {member.display_name} on {date_key}."
                 )
                 return
 
-            del logs[target_id][date_key]
-            save_logs(logs)
             await ctx.send(
                 f"✅ Logs for {member.display_name} on {date_key} have been reset."
             )
@@ -3695,14 +6688,9 @@ async def reset_logs(ctx, *, args: str = None):
 
         # Case 3: Reset logs for all users on specific date
         elif date_key and not member:
-            removed_any = False
-            for user_id in list(logs.keys()):
-                if date_key in logs[user_id]:
-                    del logs[user_id][date_key]
-                    removed_any = True
+            removed_any = log_cache.delete_date(date_key) > 0
 
             if removed_any:
-                save_logs(logs)
                 await ctx.send(
                     f"✅ Logs on {date_key} have been reset for all users.")
             else:
@@ -3755,15 +6743,11 @@ async def remove_task(ctx, *, args: str = None):
 
         # Case 1: @user only
         if member and task_id is None:
-            target_id = str(member.id)
-            if target_id not in bot.task_assignments or not bot.task_assignments[
-                    target_id]:
+            count = task_registry.remove_user(member.id)
+            if not count:
                 await ctx.send(f"📭 No tasks found for {member.display_name}.")
                 return
 
-            count = len(bot.task_assignments[target_id])
-            del bot.task_assignments[target_id]
-            save_tasks(bot.task_assignments)
             await ctx.send(
                 f"✅ Removed all {count} tasks for {member.display_name}.")
             await update_task_channel()
@@ -3771,20 +6755,14 @@ async def remove_task(ctx, *, args: str = None):
 
         # Case 2: task ID only
         if task_id is not None and member is None:
-            found = False
-            for user_id, tasks in list(bot.task_assignments.items()):
-                if task_id in tasks:
-                    del tasks[task_id]
-                    member = await bot.fetch_user(int(user_id))
-                    if not tasks:
-                        del bot.task_assignments[user_id]
-                    found = True
-                    break
-
-            if found:
-                save_tasks(bot.task_assignments)
+            removed_from = task_registry.remove_task(task_id)
+            if removed_from:
+                names = [
+                    member_directory.display_name(user_id)
+                    for user_id in removed_from
+                ]
                 await ctx.send(
-                    f"✅ Removed task {task_id} (assigned to {member.display_name})."
+                    f"✅ Removed task {task_id} (assigned to {', '.join(names)})."
                 )
                 await update_task_channel()
             else:
@@ -3793,18 +6771,12 @@ async def remove_task(ctx, *, args: str = None):
 
         # Case 3: @user and task ID
         if member and task_id is not None:
-            target_id = member.id
-            if target_id not in bot.task_assignments or task_id not in bot.task_assignments[
-                    target_id]:
+            if task_registry.remove(member.id, task_id) is None:
                 await ctx.send(
                     f"📭 Task ID {task_id} not found for {member.display_name}."
                 )
                 return
 
-            del bot.task_assignments[target_id][task_id]
-            if not bot.task_assignments[target_id]:
-                del bot.task_assignments[target_id]
-            save_tasks(bot.task_assignments)
             await ctx.send(
                 f"✅ Removed task {task_id} for {member.display_name}.")
             await update_task_channel()
@@ -3820,17 +6792,17 @@ async def remove_task(ctx, *, args: str = None):
 
 
 @bot.command(name="searchtasks",
-             help="Search your tasks: !searchtasks <keyword>")
+             help="Search your tasks: !searchtasks <keywords>")
 async def search_tasks(ctx, *, keyword: str):
-    user_tasks = bot.task_assignments.get(ctx.author.id, {})
+    user_tasks = task_registry.assigned(ctx.author.id)
     if not user_tasks:
         embed = create_info_embed("No Tasks", "You have no assigned tasks.")
         return await ctx.send(embed=embed)
 
-    matching_tasks = []
-    for tid, task in user_tasks.items():
-        if keyword.lower() in task["description"].lower():
-            matching_tasks.append((tid, task))
+    matching_tasks = [
+        (tid, task)
+        for _, tid, task in search_index.search_tasks(keyword, ctx.author.id)
+    ][:25]
 
     if not matching_tasks:
         embed = create_info_embed("No Matches",
@@ -3843,14 +6815,91 @@ async def search_tasks(ctx, *, keyword: str):
         color=COLORS["primary"])
 
     for tid, task in matching_tasks:
-        status = task.get("status", "Pending")
-        due = task.get("due_date", "No due date")
-        embed.add_field(name=f"Task #{tid} - {status}",
-                        value=f"**{task['description']}**\nDue: {due}",
+        due = task.due.isoformat() if task.due else "No due date"
+        embed.add_field(name=f"Task #{tid} - {task.status}",
+                        value=f"**{task.description}**\nDue: {due}",
                         inline=False)
 
     await ctx.send(embed=embed)
-    await update_task_channel()
+
+
+class LogSearchView(discord.ui.View):
+    """Pages through log search hits, loading only the entries shown."""
+
+    def __init__(self, query: str, hits: List[Tuple[str, str, int]],
+                 show_user: bool = False):
+        super().__init__(timeout=120)
+        self.query = query
+        self.hits = hits
+        self.show_user = show_user
+        self.page = 0
+        self.hits_per_page = 5
+
+    def create_embed(self) -> discord.Embed:
+        total_pages = max(1, -(-len(self.hits) // self.hits_per_page))
+        embed = discord.Embed(
+            title=f"🔍 Log Search Results for '{self.query}'",
+            description=f"Found {len(self.hits)} matching entries",
+            color=COLORS["primary"])
+
+        start = self.page * self.hits_per_page
+        for user_id, date, position in self.hits[start:start +
+                                                 self.hits_per_page]:
+            entry = search_index.log_entry(user_id, date, position)
+            if entry is None:
+                continue
+            name = f"📅 {date} {_export_time(entry['timestamp'])}"
+            if self.show_user:
+                name = f"👤 {member_directory.display_name(int(user_id))} — {name}"
+            embed.add_field(name=name,
+                            value=str(entry["log"])[:1024],
+                            inline=False)
+
+        embed.set_footer(text=f"Page {self.page + 1}/{total_pages}")
+        return embed
+
+    @discord.ui.button(label="◄", style=discord.ButtonStyle.secondary)
+    async def previous_page(self, interaction: discord.Interaction,
+                            button: discord.ui.Button):
+        if self.page > 0:
+            self.page -= 1
+            await interaction.response.edit_message(embed=self.create_embed(),
+                                                    view=self)
+        else:
+            await interaction.response.defer()
+
+    @discord.ui.button(label="►", style=discord.ButtonStyle.secondary)
+    async def next_page(self, interaction: discord.Interaction,
+                        button: discord.ui.Button):
+        if (self.page + 1) * self.hits_per_page < len(self.hits):
+            self.page += 1
+            await interaction.response.edit_message(embed=self.create_embed(),
+                                                    view=self)
+        else:
+            await interaction.response.defer()
+
+
+async def send_log_search(ctx, query: str, user_id: Optional[str]):
+    hits = search_index.search_logs(query, user_id)
+    if not hits:
+        embed = create_info_embed("No Matches",
+                                  f"No log entries found containing '{query}'")
+        return await ctx.send(embed=embed)
+    view = LogSearchView(query, hits, show_user=user_id is None)
+    await ctx.send(embed=view.create_embed(), view=view)
+
+
+@bot.command(name="searchlogs",
+             help="Search your logs: !searchlogs <keywords>")
+async def search_logs(ctx, *, query: str):
+    await send_log_search(ctx, query, str(ctx.author.id))
+
+
+@bot.command(name="searchalllogs",
+             help="Search every user's logs (admin only)")
+@is_admin()
+async def search_all_logs(ctx, *, query: str):
+    await send_log_search(ctx, query, None)
 
 
 @bot.command(name="taskdebug")
@@ -3859,58 +6908,91 @@ async def task_debug(ctx):
     """Debug the task storage system"""
     embed = discord.Embed(title="Task System Debug", color=COLORS["primary"])
 
-    # Show how user IDs are stored
-    id_types = {}
-    for user_id in bot.task_assignments.keys():
-        id_type = type(user_id).__name__
-        id_types[id_type] = id_types.get(id_type, 0) + 1
-
-    embed.add_field(name="User ID Storage Types",
-                    value="\n".join(f"{k}: {v}" for k, v in id_types.items()),
-                    inline=False)
+    # Index sizes
+    embed.add_field(
+        name="Registry",
+        value=(f"Assignees: {len(task_registry.assignments)}\n"
+               f"Assigned task ids: {len(task_registry.by_id)}\n"
+               f"Unassigned created tasks: {len(task_registry.created)}\n" +
+               "\n".join(f"{status}: {len(pairs)}" for status, pairs in
+                         task_registry.by_status.items())),
+        inline=False)
 
     # Show specific tasks for the command author
-    str_id = str(ctx.author.id)
-    int_id = ctx.author.id
-    author_tasks = []
-
-    if str_id in bot.task_assignments:
-        author_tasks.extend(bot.task_assignments[str_id].items())
-    if int_id in bot.task_assignments:
-        author_tasks.extend(bot.task_assignments[int_id].items())
+    author_tasks = list(task_registry.assigned(ctx.author.id).items())
 
     if author_tasks:
-        task_list = "\n".join(f"ID {tid}: {task['description']}"
+        task_list = "\n".join(f"ID {tid}: {task.description}"
                               for tid, task in author_tasks)
         embed.add_field(name=f"Your Tasks ({len(author_tasks)})",
                         value=task_list,
                         inline=False)
     else:
         embed.add_field(name="Your Tasks",
-                        value="No tasks found under either ID type",
+                        value="No tasks assigned",
                         inline=False)
 
     await ctx.send(embed=embed)
 
 
+@bot.command(name="outbox")
+@is_admin()
+async def outbox_status(ctx):
+    """Show queued outbound requests and recent delivery failures"""
+    embed = discord.Embed(title="📮 Outbound Queue", color=COLORS["primary"])
+    embed.add_field(name="Queued",
+                    value="\n".join(f"{lane.name.title()}: {count}"
+                                    for lane, count in outbox.depth().items()),
+                    inline=True)
+    embed.add_field(name="Delivered",
+                    value=(f"Sent: {outbox.sent}\n"
+                           f"Edits merged: {outbox.coalesced}\n"
+                           f"Routes: {len(outbox.buckets)}"),
+                    inline=True)
+    failures = "\n".join(
+        f"`{when.strftime('%m-%d %H:%M')}` {description}: {error}"
+        for when, description, error in list(outbox.failures)[-10:])
+    embed.add_field(name="Recent Failures",
+                    value=failures[:1024] or "None",
+                    inline=False)
+    await ctx.send(embed=embed)
+
+
+@bot.command(name="schedule")
+@is_admin()
+async def schedule_status(ctx):
+    """Show the next and last run of every scheduled job"""
+    embed = discord.Embed(title="🗓️ Scheduled Jobs",
+                          description="All times are US/Eastern.",
+                          color=COLORS["primary"])
+    for next_run, name, expression, last_run in scheduler.upcoming():
+        paused = scheduler.jobs[name].paused_until
+        lines = [
+            f"Cron: `{expression}`",
+            f"Next: {next_run.strftime('%a %b %d %H:%M')}",
+            "Last: " + (last_run.astimezone(EST).strftime('%a %b %d %H:%M')
+                        if last_run else "never"),
+        ]
+        if paused and paused > datetime.now(EST):
+            lines.append(f"Paused until {paused.strftime('%H:%M')}")
+        embed.add_field(name=name, value="\n".join(lines), inline=True)
+    await ctx.send(embed=embed)
+
+
 # 4. Task Categories
 @bot.command(
     name="addcategory",
     help="Add a category to a task: !addcategory <task ID> <category>")
 async def add_category(ctx, task_id: int, *, category: str):
-    user_tasks = bot.task_assignments.get(ctx.author.id, {})
-    if task_id not in user_tasks:
+    task = task_registry.get(ctx.author.id, task_id)
+    if task is None:
         embed = create_error_embed("Not Found",
                                    "Task ID not found in your assignments.")
         return await ctx.send(embed=embed)
 
-    task = user_tasks[task_id]
-    if "categories" not in task:
-        task["categories"] = []
-
-    if category.lower() not in [c.lower() for c in task["categories"]]:
-        task["categories"].append(category)
-        save_tasks(bot.task_assignments)
+    if category.lower() not in [c.lower() for c in task.categories]:
+        task.categories.append(category)
+        task_registry.save(ctx.author.id, task_id)
         embed = create_success_embed(
             "Category Added",
             f"Added category '{category}' to task #{task_id}")
@@ -3920,55 +7002,150 @@ async def add_category(ctx, task_id: int, *, category: str):
             f"Task #{task_id} already has category '{category}'")
 
     await ctx.send(embed=embed)
-    await update_task_channel()
 
 
 from datetime import datetime, timedelta
 
 
-@tasks.loop(minutes=10)
-async def check_due_dates():
-    now = datetime.now(EST)
+class ReminderScheduler:
+    """Task reminders kept in a min-heap of the instants they are due.
 
-    for user_id, tasks in bot.task_assignments.items():
-        try:
-            member = await bot.fetch_user(int(user_id))
-        except discord.NotFound:
-            continue
+    Each open task with a due date owes up to three reminders: 24 hours
+    before, 1 hour before and at the deadline. Every reminder it still owes
+    sits in the heap as (instant, arm id, user id, task id, kind). The
+    runner sleeps until the earliest instant (or until a change wakes it),
+    so idle cost does not depend on how many tasks exist.
 
-        for task_id, task in tasks.items():
-            if task.get("status") == "Completed":
-                continue
+    The registry calls ``arm`` whenever a task is assigned, updated,
+    completed or removed. Re-arming gives the task a new arm id; entries
+    carrying an older id are dropped when they reach the top of the heap.
+    The 24h/1h reminders are skipped once their instant is more than
+    REMINDER_GRACE old, e.g. when the bot was offline through it. A
+    reminder whose send fails goes back on the heap RETRY_DELAY later.
+    """
+
+    OFFSETS = (("24h", timedelta(hours=24)), ("1h", timedelta(hours=1)),
+               ("overdue", timedelta(0)))
+    REMINDER_GRACE = timedelta(hours=1)
+    RETRY_DELAY = 60
+    MAX_SLEEP = 3600  # re-check the wall clock at least hourly
+
+    def __init__(self, registry: TaskRegistry):
+        self.registry = registry
+        self.heap: List[Tuple[float, int, int, int, str]] = []
+        self.armed: Dict[Tuple[int, int], int] = {}
+        self.arm_seq = 0
+        self.wakeup: Optional[asyncio.Event] = None
+        self.runner: Optional[asyncio.Task] = None
+        registry.reminders = self
+
+    def rebuild(self):
+        """Arm every assigned task from scratch, e.g. after loading."""
+        self.heap, self.armed = [], {}
+        for user_id, tasks in self.registry.assignments.items():
+            for task_id, task in tasks.items():
+                self.arm(user_id, task_id, task, wake=False)
+        heapq.heapify(self.heap)
+        self._wake()
+
+    def arm(self, user_id: int, task_id: int, task: Optional[Task],
+            wake: bool = True):
+        """(Re)schedule a task's outstanding reminders; None disarms it."""
+        key = (user_id, task_id)
+        self.armed.pop(key, None)
+        if task is None or task.completed:
+            return
+        due_date = task.due
+        if due_date is None:
+            return
 
-            if not task.get("due_date"):
+        self.arm_seq += 1
+        self.armed[key] = self.arm_seq
+        now = datetime.now(EST)
+        for kind, offset in self.OFFSETS:
+            if kind in task.reminded:
                 continue
+            instant = due_date - offset
+            if kind != "overdue" and instant + self.REMINDER_GRACE <= now:
+                continue
+            entry = (instant.timestamp(), self.arm_seq, user_id, task_id, kind)
+            if wake:
+                heapq.heappush(self.heap, entry)
+            else:
+                self.heap.append(entry)
+        if wake:
+            self._compact()
+            self._wake()
+
+    def _compact(self):
+        # Stale entries are only dropped lazily; rebuild if they pile up
+        if len(self.heap) > 4 * len(self.armed) + 64:
+            self.heap = [entry for entry in self.heap
+                         if self.armed.get((entry[2], entry[3])) == entry[1]]
+            heapq.heapify(self.heap)
+
+    def _wake(self):
+        if self.wakeup is not None:
+            self.wakeup.set()
+
+    def start(self):
+        if self.runner is None or self.runner.done():
+            self.wakeup = asyncio.Event()
+            self.runner = asyncio.create_task(self._run())
+
+    async def _run(self):
+        while True:
+            self.wakeup.clear()
+            delay = self.MAX_SLEEP
+            if self.heap:
+                delay = min(delay, self.heap[0][0] - datetime.now(EST).timestamp())
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(self.wakeup.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+            await self._fire_due()
 
+    async def _fire_due(self):
+        now = datetime.now(EST)
+        while self.heap and self.heap[0][0] <= now.timestamp():
+            entry = heapq.heappop(self.heap)
             try:
-                due_date = datetime.fromisoformat(task["due_date"])
-                if due_date.tzinfo is None:
-                    due_date = EST.localize(due_date)
-
-                time_left = due_date - now
-                if time_left.total_seconds() <= 0:
-                    # Overdue handling
-                    if not task.get("reminded_overdue"):
-                        await send_reminder(member, task_id, task, "overdue")
-                        task["reminded_overdue"] = True
-                else:
-                    # Future due date handling
-                    hours_left = time_left.total_seconds() / 3600
+                await self._fire(entry, now)
+            except Exception as e:
+                print(f"Error handling {entry[4]} reminder for task "
+                      f"{entry[3]}: {e}")
 
-                    if 24 <= hours_left < 25 and not task.get("reminded_24h"):
-                        await send_reminder(member, task_id, task, "24h")
-                        task["reminded_24h"] = True
-                    elif 1 <= hours_left < 2 and not task.get("reminded_1h"):
-                        await send_reminder(member, task_id, task, "1h")
-                        task["reminded_1h"] = True
+    async def _fire(self, entry: Tuple[float, int, int, int, str],
+                    now: datetime):
+        instant, arm_id, user_id, task_id, kind = entry
+        if self.armed.get((user_id, task_id)) != arm_id:
+            return
+        task = self.registry.get(user_id, task_id)
+        if task is None or task.completed or kind in task.reminded:
+            return
+        if (kind != "overdue" and now.timestamp() - instant >
+                self.REMINDER_GRACE.total_seconds()):
+            return
+        member = await member_directory.resolve(user_id)
+        if member is None:
+            return
+        try:
+            await send_reminder(member, task_id, task, kind)
+        except Exception as e:
+            print(f"Error sending {kind} reminder for task {task_id}, "
+                  f"retrying in {self.RETRY_DELAY}s: {e}")
+            # Retry at a later instant; the grace check above would
+            # otherwise drop a 24h/1h reminder retried too late
+            heapq.heappush(self.heap,
+                           (now.timestamp() + self.RETRY_DELAY, arm_id,
+                            user_id, task_id, kind))
+            return
+        task.reminded = task.reminded | {kind}
+        self.registry.save(user_id, task_id)
 
-            except Exception as e:
-                print(f"Error checking task {task_id}: {e}")
 
-    save_tasks(bot.task_assignments)
+reminders = ReminderScheduler(task_registry)
 
 
 async def send_reminder(member, task_id, task, reminder_type):
@@ -3983,60 +7160,65 @@ async def send_reminder(member, task_id, task, reminder_type):
     }
 
     embed = discord.Embed(title=messages[reminder_type],
-                          description=task["description"],
+                          description=task.description,
                           color=COLORS["error"]
                           if reminder_type == "overdue" else COLORS["warning"])
-    await channel.send(f"{member.mention}", embed=embed)
+    await outbox.send(channel, f"{member.mention}", embed=embed, lane=Lane.BULK)
 
 
 # 5. Weekly Summary
 
 
-@tasks.loop(minutes=1)
-async def weekly_summary():
-    await bot.wait_until_ready()
+@scheduler.job("0 18 * * 0")
+async def weekly_summary(fire_time: datetime):
+    now = fire_time
+    channel = bot.get_channel(CHANNEL_ID)
+    if channel is None:
+        return
 
-    now = datetime.now(EST)
-    if now.weekday() == 6 and now.hour == 18 and now.minute == 0:
-        channel = bot.get_channel(CHANNEL_ID)
-        if channel is None:
-            return
+    week = rollups.period(*this_week(now.date()))
+    if not week:
+        return
 
-        logs = load_logs()
-        if not logs:
-            return
+    embed = discord.Embed(title="📊 Weekly Summary",
+                          description="Here's the weekly activity report",
+                          color=COLORS["neutral"],
+                          timestamp=now)
 
-        embed = discord.Embed(title="📊 Weekly Summary",
-                              description="Here's the weekly activity report",
-                              color=COLORS["neutral"],
-                              timestamp=now)
+    sorted_users = sorted(((uid, totals["entries"])
+                           for uid, totals in week.items()
+                           if totals["entries"]),
+                          key=lambda x: x[1],
+                          reverse=True)
 
-        user_log_counts = {
-            uid: len(user_logs)
-            for uid, user_logs in logs.items()
-        }
-        sorted_users = sorted(user_log_counts.items(),
-                              key=lambda x: x[1],
-                              reverse=True)
+    if sorted_users:
+        embed.add_field(name="🏆 Top Contributors",
+                        value="\n".join(
+                            f"<@{uid}>: {count} logs"
+                            for uid, count in sorted_users[:3]),
+                        inline=False)
 
-        if sorted_users:
-            embed.add_field(name="🏆 Top Contributors",
-                            value="\n".join(
-                                f"<@{uid}>: {count} logs"
-                                for uid, count in sorted_users[:3]),
-                            inline=False)
+    # From the rollups, so a late catch-up run still reports fire_time's week
+    week_points = sorted(((uid, totals["points"])
+                          for uid, totals in week.items()
+                          if totals["points"] > 0),
+                         key=lambda x: x[1],
+                         reverse=True)[:3]
+    if week_points:
+        embed.add_field(name="⭐ Most Points This Week",
+                        value="\n".join(
+                            f"<@{uid}>: {total} pts"
+                            for uid, total in week_points),
+                        inline=False)
 
-        completed_tasks = sum(1
-                              for user_tasks in bot.task_assignments.values()
-                              for task in user_tasks.values()
-                              if task.get("status") == "Completed")
+    completed_tasks = sum(totals["tasks"] for totals in week.values())
 
-        embed.add_field(name="✅ Completed Tasks",
-                        value=f"{completed_tasks} tasks completed this week",
-                        inline=True)
+    embed.add_field(name="✅ Completed Tasks",
+                    value=f"{completed_tasks} tasks completed this week",
+                    inline=True)
 
-        embed.set_footer(text="Great work everyone! Keep it up!")
-        await channel.send(embed=embed)
+    embed.set_footer(text="Great work everyone! Keep it up!")
+    outbox.send(channel, embed=embed, lane=Lane.BULK)
 
 @bot.command(name="forework",
              help="Ping users who haven't logged today (admin only)")
@@ -4051,14 +7233,12 @@ async def forework(ctx):
             pass
         return
 
-    logs = load_logs()
     today = datetime.now(EST).strftime('%Y-%m-%d')
 
     # Get list of all guild members excluding bots
     missing_users = [
-        member.mention for member in ctx.guild.members
-        if not member.bot and str(member.id) not in logs
-        or today not in logs.get(str(member.id), {})
+        member.mention
+        for member in activity_index.missing(ctx.guild.members, today)
     ]
 
     if not missing_users:
@@ -4090,15 +7270,16 @@ async def create_backup(ctx):
     # Create timestamped backup
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     backup_file = os.path.join(backup_dir, f"backup_{timestamp}.zip")
+    snapshot_file = os.path.join(backup_dir, f"snapshot_{timestamp}.db")
 
-    # Files to include in backup
-    files_to_backup = [LOG_FILE, TASKS_FILE, COMMENTS_FILE]
+    # Snapshot the database once every queued write has landed
+    await asyncio.to_thread(storage.backup, snapshot_file)
+    files_to_backup = [DB_FILE]
 
     # Create zip archive
-    with zipfile.ZipFile(backup_file, 'w') as zipf:
-        for file in files_to_backup:
-            if os.path.exists(file):
-                zipf.write(file)
+    with zipfile.ZipFile(backup_file, 'w', zipfile.ZIP_DEFLATED) as zipf:
+        zipf.write(snapshot_file, arcname=DB_FILE)
+    os.remove(snapshot_file)
 
     # Send backup to admin
     embed = create_success_embed(
@@ -4110,73 +7291,73 @@ async def create_backup(ctx):
     os.remove(backup_file)
 
 
-@bot.command(name="exportlogs", help="Export your logs as a text file")
-async def export_logs(ctx):
-    logs = load_logs()
-    user_logs = logs.get(str(ctx.author.id), {})
+@bot.command(name="exportlogs",
+             help="Export your logs: !exportlogs [txt|csv|jsonl]")
+async def export_logs(ctx, fmt: str = "txt"):
+    fmt = fmt.lower()
+    if fmt not in EXPORT_FORMATS:
+        embed = create_error_embed(
+            "Invalid Format",
+            f"Choose one of: {', '.join(EXPORT_FORMATS)}")
+        return await ctx.send(embed=embed)
 
-    if not user_logs:
+    user_id = str(ctx.author.id)
+    if not log_cache.latest_date(user_id):
         embed = create_info_embed("No Logs", "You have no logs to export.")
         return await ctx.send(embed=embed)
 
-    export_content = f"Work Logs for {ctx.author.display_name}\n\n"
-    for date, entry in sorted(user_logs.items(), reverse=True):
-        formatted_date = datetime.strptime(date,
-                                           "%Y-%m-%d").strftime("%B %d, %Y")
-        export_content += f"=== {formatted_date} ===\n"
-
-        try:
-            # Step 1: Ensure it's not already a list
-            if isinstance(entry, str):
-                entry = ast.literal_eval(entry)
-
-            # Step 2: Entry might still be a list of strings with nested logs
-            for item in entry:
-                # If item itself is a dict with a 'log' key that is a stringified list
-                if isinstance(item, dict) and isinstance(item.get("log"), str):
-                    nested_logs = ast.literal_eval(item["log"])
-                else:
-                    nested_logs = entry
-
-                # Step 3: Now go through actual logs
-                for log_entry in nested_logs:
-                    timestamp = datetime.fromisoformat(log_entry["timestamp"])
-                    time_str = timestamp.strftime("%H:%M")
-                    log_text = log_entry["log"].strip('"')
-                    export_content += f"[{time_str}] {log_text}\n"
-                break  # we processed the nested logs; no need to loop again
+    fp, filename = await asyncio.to_thread(export_user_logs, user_id,
+                                           ctx.author.display_name, fmt)
+    with fp:
+        embed = create_success_embed(
+            "Export Ready", f"Your logs have been exported as `{filename}`.")
+        await ctx.author.send(embed=embed,
+                              file=discord.File(fp, filename=filename))
+    await ctx.message.add_reaction("✅")
 
-        except Exception as e:
-            export_content += f"[Invalid Entry] {entry}\n"
 
-        export_content += "\n"
+@bot.command(name="exportalllogs",
+             help="Export every user's logs as one archive (Admin only)")
+@is_admin()
+async def export_all_logs_command(ctx, fmt: str = "txt"):
+    fmt = fmt.lower()
+    if fmt not in EXPORT_FORMATS:
+        embed = create_error_embed(
+            "Invalid Format",
+            f"Choose one of: {', '.join(EXPORT_FORMATS)}")
+        return await ctx.send(embed=embed)
 
-    with open("temp_export.txt", "w", encoding="utf-8") as f:
-        f.write(export_content)
+    user_ids = log_cache.user_ids()
+    if not user_ids:
+        embed = create_info_embed("No Logs", "No logs have been recorded.")
+        return await ctx.send(embed=embed)
 
-    embed = create_success_embed(
-        "Export Ready", "Your logs have been exported as a text file.")
-    await ctx.author.send(embed=embed, file=discord.File("temp_export.txt"))
+    users = {
+        user_id: member_directory.display_name(user_id, f"User {user_id}")
+        for user_id in user_ids
+    }
 
-    os.remove("temp_export.txt")
+    async with ctx.typing():
+        fp, filename = await asyncio.to_thread(export_all_logs, users, fmt)
+    with fp:
+        embed = create_success_embed(
+            "Export Ready",
+            f"Exported logs for {len(users)} users as `{filename}`.")
+        await ctx.author.send(embed=embed,
+                              file=discord.File(fp, filename=filename))
     await ctx.message.add_reaction("✅")
 
 
 @bot.command(name="viewcomments",
              help="View comments on a task: !viewcomments <task ID>")
 async def view_comments(ctx, task_id: int):
-    # Check if task exists in the system
-    task_exists = any(task_id in tasks
-                      for tasks in bot.task_assignments.values())
-
-    if not task_exists:
+    if not task_registry.assignees(task_id):
         embed = create_error_embed("Not Found",
                                    "Task ID not found in the system.")
         return await ctx.send(embed=embed)
 
 # Load comments
-    comments = load_comments()
-    task_comments = comments.get(str(task_id), [])
+    task_comments = load_task_comments(task_id)
 
     if not task_comments:
         embed = create_info_embed("No Comments",
@@ -4213,16 +7394,15 @@ async def view_comments(ctx, task_id: int):
 # 9. Task Priority Visualization
 @bot.command(name="taskchart", help="Visualize your tasks by priority")
 async def task_chart(ctx):
-    user_tasks = bot.task_assignments.get(ctx.author.id, {})
+    user_tasks = task_registry.assigned(ctx.author.id)
     if not user_tasks:
         embed = create_info_embed("No Tasks", "You have no assigned tasks.")
         return await ctx.send(embed=embed)
 
     # Count tasks by priority
-    priority_counts = {"High": 0, "Normal": 0, "Low": 0}
+    priority_counts = {priority.label: 0 for priority in Priority}
     for task in user_tasks.values():
-        priority = task.get("priority", "Normal").capitalize()
-        priority_counts[priority] += 1
+        priority_counts[task.priority.label] += 1
 
     # Generate ASCII chart
     max_count = max(
@@ -4237,22 +7417,21 @@ async def task_chart(ctx):
                           color=COLORS["primary"])
     embed.set_footer(text=f"Total tasks: {len(user_tasks)}")
     await ctx.send(embed=embed)
-    await update_task_channel()
 
 
 @bot.command(name="removebadge", help="Remove a badge from a user (admin only)")
 @is_admin()
 async def remove_badge(ctx, member: discord.Member, badge_id: str):
-    user_badges = load_user_badges()
     user_id_str = str(member.id)
+    owned = storage.get("user_badges", (user_id_str, ), [])
     
-    if user_id_str not in user_badges or badge_id not in user_badges[user_id_str]:
+    if badge_id not in owned:
         return await ctx.send(f"❌ {member.display_name} does not have the badge with ID `{badge_id}`.")
     
-    user_badges[user_id_str].remove(badge_id)
+    owned.remove(badge_id)
     # Save changes
-    with open("user_badges.json", "w") as f:  # Adjust filename if needed
-        json.dump(user_badges, f, indent=4)
+    storage.put("user_badges", (user_id_str, ), owned)
+    badge_engine.owned.get(user_id_str, set()).discard(badge_id)
     
     await ctx.send(f"✅ Removed badge `{badge_id}` from {member.display_name}.")
 
@@ -4308,7 +7487,7 @@ class BadgePaginator(View):
 async def all_badges(ctx, member: discord.Member = None):
     member = member or ctx.author
 
-    user_badges = load_user_badges().get(str(member.id), [])
+    user_badges = storage.get("user_badges", (member.id, ), [])
     all_badges = load_badges()
 
     if not user_badges:
@@ -4390,18 +7569,28 @@ async def task_reminders(ctx, frequency: str = None):
                                    "Please use: off, daily, or weekly")
 
     await ctx.send(embed=embed)
-    await update_task_channel()
 
     # ========== Startup ==========
 
 
 if __name__ == "__main__":
-    # Load additional data
-    try:
-        with open("scores.json", "r") as f:
-            bot.user_scores = json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError):
-        bot.user_scores = {}
+    # Bring stored data up to the current schema before anything reads it
+    for version, description, rewritten in run_migrations():
+        print(f"Migration {version} ({description}): "
+              f"{rewritten} rows rewritten")
+    if sys.argv[1:] == ["migrate"]:
+        print(f"Schema is at version {schema_version()}")
+        sys.exit(0)
+    if sys.argv[1:] == ["codecs"]:
+        values = [
+            storage.decode(data) for table in Storage.TABLES
+            for data in storage._rows(table).values()
+        ]
+        print(f"{len(values)} rows")
+        for name, size, encode_rate, decode_rate in benchmark_codecs(values):
+            print(f"{name:<14} {size:>12,} bytes  "
+                  f"encode {encode_rate:7.1f} MB/s  decode {decode_rate:7.1f} MB/s")
+        sys.exit(0)
 
     try:
         keep_alive()
@@ -4410,3 +7599,5 @@ if __name__ == "__main__":
         print("\nBot shutting down...")
     except Exception as e:
         print(f"Error starting bot: {e}")
+    finally:
+        persistence.stop()
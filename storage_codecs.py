@@ -0,0 +1,99 @@
+"""Value codecs for the SQLite store.
+
+Kept free of the bot's setup code so worker processes can decode stored
+rows without importing main.py.
+"""
+import json
+import zlib
+from typing import Any
+
+try:
+    import msgpack
+except ImportError:  # optional, only needed for STORAGE_CODEC=msgpack
+    msgpack = None
+
+
+class JsonCodec:
+    """Un-indented UTF-8 JSON."""
+
+    tag = b"j"
+
+    def encode(self, value: Any) -> bytes:
+        return json.dumps(value, separators=(",", ":"),
+                          ensure_ascii=False).encode("utf-8")
+
+    def decode(self, payload: bytes) -> Any:
+        return json.loads(payload)
+
+
+class PrettyJsonCodec(JsonCodec):
+    """The indented JSON the old store files used; kept for comparisons."""
+
+    def encode(self, value: Any) -> bytes:
+        return json.dumps(value, indent=4).encode("utf-8")
+
+
+class ZlibCodec(JsonCodec):
+    """Compact JSON deflated with zlib; smallest, slowest to write."""
+
+    tag = b"z"
+    level = 6
+
+    def encode(self, value: Any) -> bytes:
+        return zlib.compress(super().encode(value), self.level)
+
+    def decode(self, payload: bytes) -> Any:
+        return json.loads(zlib.decompress(payload))
+
+
+class MsgpackCodec:
+    """MessagePack binary encoding.
+
+    Map keys are turned into strings the way JSON writes them, so values
+    read back with the same types whichever codec stored them.
+    """
+
+    tag = b"m"
+
+    def encode(self, value: Any) -> bytes:
+        return msgpack.packb(self._json_keys(value), use_bin_type=True)
+
+    @classmethod
+    def _json_keys(cls, value: Any) -> Any:
+        if isinstance(value, dict):
+            return {
+                key if isinstance(key, str) else json.dumps(key):
+                cls._json_keys(item)
+                for key, item in value.items()
+            }
+        if isinstance(value, (list, tuple)):
+            return [cls._json_keys(item) for item in value]
+        return value
+
+    def decode(self, payload: bytes) -> Any:
+        return msgpack.unpackb(payload, raw=False, strict_map_key=False)
+
+
+CODECS = {"json": JsonCodec(), "zlib": ZlibCodec()}
+if msgpack is not None:
+    CODECS["msgpack"] = MsgpackCodec()
+CODEC_MAGIC = b"\x00"  # no JSON text starts with a NUL byte
+CODECS_BY_TAG = {codec.tag: codec for codec in CODECS.values()}
+
+
+def decode(data) -> Any:
+    """Decode a stored value in whatever format it was written.
+
+    Rows without a header are the original JSON text. They are read
+    as is and pick up the current codec the next time they are written.
+    """
+    if isinstance(data, str):
+        return json.loads(data)
+    if data[:1] != CODEC_MAGIC:
+        return json.loads(data)
+    try:
+        codec = CODECS_BY_TAG[data[1:2]]
+    except KeyError:
+        raise ValueError(
+            f"Stored value uses unavailable codec {data[1:2]!r}") from None
+    return codec.decode(data[2:])